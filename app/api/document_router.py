@@ -1,9 +1,13 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+import logging
 from app.services.file_storage import save_pdf
-from app.services.pdf_reader import extract_raw_text_from_pdf
-from app.services.document_service import create_document
+from app.services.pdf_reader import extract_raw_text_from_pdf_async
+from app.services.document_service import create_document, get_document_metadata
+from app.schemas.document_schema import DocumentMetadataResponse
+from app.core.auth import get_current_user
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
+logger = logging.getLogger(__name__)
 
 
 # Upload Company PDF
@@ -11,8 +15,8 @@ router = APIRouter(prefix="/documents", tags=["Documents"])
 async def upload_company_pdf(file: UploadFile = File(...)):
 
     try:
-        file_path = save_pdf(file)
-        raw_text = extract_raw_text_from_pdf(file_path)
+        saved = await save_pdf(file)
+        raw_text = await extract_raw_text_from_pdf_async(saved.path)
 
         document_id = await create_document(
             document_type="company",
@@ -37,8 +41,8 @@ async def upload_company_pdf(file: UploadFile = File(...)):
 async def upload_bank_pdf(file: UploadFile = File(...)):
 
     try:
-        file_path = save_pdf(file)
-        raw_text = extract_raw_text_from_pdf(file_path)
+        saved = await save_pdf(file)
+        raw_text = await extract_raw_text_from_pdf_async(saved.path)
 
         document_id = await create_document(
             document_type="bank",
@@ -56,3 +60,35 @@ async def upload_bank_pdf(file: UploadFile = File(...)):
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{document_id}", response_model=DocumentMetadataResponse)
+async def get_document_info(
+    document_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get document metadata: type, status, file size, page count and timestamps.
+    
+    Text and extraction results are not read, so this stays cheap however
+    large the document is.
+    
+    Args:
+        document_id: Document ID
+        current_user: Current authenticated user
+        
+    Returns:
+        Document metadata
+    """
+    try:
+        document = await get_document_metadata(document_id, current_user["user_id"])
+        return DocumentMetadataResponse(**document)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Document metadata error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve document"
+        )
@@ -1,15 +1,106 @@
-from fastapi import APIRouter, HTTPException, Depends, status
-from app.services.document_service import get_document, update_document
-from app.services.ai_extractor import extract_company_cheques, extract_bank_cheques
-from app.services.tally_engine import tally_cheques
+from datetime import date, datetime, time
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from app.services.tally_service import run_tally
 from app.services.session_service import get_session_by_id
+from app.services.tally_results_service import query_tally_results
+from app.services.job_service import (
+    create_tally_job,
+    get_tally_job,
+    create_bulk_tally,
+    get_bulk_tally,
+    tally_worker_pool
+)
+from app.schemas.job_schema import (
+    TallyJobResponse,
+    BulkTallyRequest,
+    BulkTallyResponse,
+    BulkTallyStatusResponse,
+    TallyResultList,
+    TallyResultStatus
+)
 from app.core.auth import get_current_user
+import asyncio
+import json
 import logging
 
 router = APIRouter(prefix="/tally", tags=["Tally"])
 logger = logging.getLogger(__name__)
 
 
+# Registered before /{session_id} so "bulk" is not taken for a session ID
+@router.post("/bulk", response_model=BulkTallyResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_bulk_tally(
+    request: BulkTallyRequest,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Queue tallies for many sessions at once.
+    
+    Sessions are picked by ID, or by status (e.g. every "complete"
+    session). They run on the background worker pool smallest first,
+    sharing the LLM budget; each finished session is saved as it
+    completes.
+    
+    Args:
+        request: Session IDs or a status filter
+        current_user: Current authenticated user
+        
+    Returns:
+        Queued jobs in run order; poll GET /tally/bulk/{bulk_id} for progress
+    """
+    try:
+        bulk = await create_bulk_tally(
+            current_user["user_id"],
+            session_ids=request.session_ids,
+            statuses=request.status
+        )
+        for job in bulk["jobs"]:
+            await tally_worker_pool.submit(job["job_id"], job["priority"])
+        return BulkTallyResponse(**bulk)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk tally creation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue bulk tally"
+        )
+
+
+@router.get("/bulk/{bulk_id}", response_model=BulkTallyStatusResponse)
+async def get_bulk_tally_status(
+    bulk_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get progress of a bulk tally; results are read per job from
+    GET /tally/jobs/{job_id}.
+    
+    Args:
+        bulk_id: Bulk ID returned when the bulk tally was queued
+        current_user: Current authenticated user
+        
+    Returns:
+        Per-status counts, overall progress and per-session job status
+    """
+    try:
+        bulk = await get_bulk_tally(bulk_id, current_user["user_id"])
+        return BulkTallyStatusResponse(**bulk)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Bulk tally retrieval error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve bulk tally"
+        )
+
+
 @router.post("/{session_id}")
 async def full_tally(
     session_id: str,
@@ -26,60 +117,212 @@ async def full_tally(
         Tally results with structured data
     """
     try:
-        # Get and validate session
-        session = await get_session_by_id(session_id, current_user["user_id"])
-        
-        # Validate session has both documents
-        if not session.get("company_document_id") or not session.get("bank_document_id"):
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Session must have both company and bank documents uploaded"
-            )
+        return await run_tally(session_id, current_user["user_id"])
         
-        # Get documents
-        company_doc = await get_document(session["company_document_id"])
-        bank_doc = await get_document(session["bank_document_id"])
-        
-        if not company_doc or not bank_doc:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="One or both documents not found"
-            )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Tally error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to perform tally: {str(e)}"
+        )
+
+
+def _format_event(event: dict, stream_format: str) -> str:
+    payload = json.dumps(jsonable_encoder(event))
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+@router.post("/{session_id}/stream")
+async def stream_tally(
+    session_id: str,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Run a tally and stream progress events as it goes.
+    
+    Each event is {"event": stage, "progress": percent, ...}. Extraction
+    emits an "extraction_chunk" event per chunk with provisional
+    cashed/pending counts; the last event is "result", whose "data" is the
+    same payload POST /tally/{session_id} returns, or "error" with a
+    "detail". Disconnecting cancels the tally and its pending LLM calls.
+    
+    Args:
+        session_id: Session ID containing both company and bank documents
+        stream_format: "ndjson" (one JSON object per line) or "sse"
+        current_user: Current authenticated user
         
-        # Structure data using LLM
-        company_structured = extract_company_cheques(company_doc["raw_text"])
-        bank_structured = extract_bank_cheques(bank_doc["raw_text"])
+    Returns:
+        Streaming response of tally events
+    """
+    # Fail with a normal HTTP error before the stream starts
+    await get_session_by_id(session_id, current_user["user_id"])
+    
+    events: asyncio.Queue = asyncio.Queue()
+    
+    async def progress(stage: str, percent: int, data: Optional[dict] = None):
+        await events.put({"event": stage, "progress": percent, **(data or {})})
+    
+    async def run():
+        try:
+            result = await run_tally(session_id, current_user["user_id"], progress)
+            await events.put({"event": "result", "progress": 100, "data": result})
+        except HTTPException as e:
+            await events.put({"event": "error", "status_code": e.status_code, "detail": e.detail})
+        except Exception as e:
+            logger.error(f"Streaming tally error: {str(e)}")
+            await events.put({"event": "error", "status_code": 500, "detail": f"Failed to perform tally: {str(e)}"})
+    
+    async def event_stream():
+        task = asyncio.create_task(run())
+        finished = False
+        try:
+            while not finished:
+                event = await events.get()
+                finished = event["event"] in ("result", "error")
+                yield _format_event(event, stream_format)
+        finally:
+            # Client went away before the end: stop the tally and its LLM calls
+            if not finished:
+                task.cancel()
+                logger.info(f"Streaming tally for session {session_id} cancelled by client")
+    
+    media_type = "text/event-stream" if stream_format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        event_stream(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/{session_id}/jobs", response_model=TallyJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def enqueue_tally_job(
+    session_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Queue a tally for background processing.
+    
+    Args:
+        session_id: Session ID containing both company and bank documents
+        current_user: Current authenticated user
         
-        logger.info(f"Tally endpoint - Company cheques: {len(company_structured.cheques)}, Bank cheques: {len(bank_structured.cashed_cheques)}")
+    Returns:
+        Queued job; poll GET /tally/jobs/{job_id} for progress and result
+    """
+    try:
+        job = await create_tally_job(session_id, current_user["user_id"])
+        await tally_worker_pool.submit(job.job_id)
+        return TallyJobResponse(**job.model_dump())
         
-        # Apply tally engine
-        result = tally_cheques(company_structured, bank_structured)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Tally job creation error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to queue tally job"
+        )
+
+
+@router.get("/jobs/{job_id}", response_model=TallyJobResponse)
+async def get_tally_job_status(
+    job_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Get status, progress and (when finished) the result of a tally job.
+    
+    The result holds the tally summary and mode; the per-cheque outcomes
+    are read from GET /tally/results.
+    
+    Args:
+        job_id: Job ID returned when the job was queued
+        current_user: Current authenticated user
         
-        # Save structured + tally results in DB
-        await update_document(session["company_document_id"], {
-            "structured_data": company_structured.dict(),
-            "tally_result": result,
-            "status": "tallied"
-        })
+    Returns:
+        Tally job information
+    """
+    try:
+        job = await get_tally_job(job_id, current_user["user_id"])
+        return TallyJobResponse(**job)
         
-        await update_document(session["bank_document_id"], {
-            "structured_data": bank_structured.dict(),
-            "status": "structured"
-        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Tally job retrieval error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve tally job"
+        )
+
+
+def _day_start(value: Optional[date]) -> Optional[datetime]:
+    return datetime.combine(value, time.min) if value else None
+
+
+@router.get("/results", response_model=TallyResultList)
+async def list_tally_results(
+    session_id: Optional[List[str]] = Query(None, description="Only these sessions (repeat for several)"),
+    result_status: Optional[List[TallyResultStatus]] = Query(None, alias="status"),
+    cheque_number: Optional[str] = Query(None),
+    min_amount: Optional[float] = Query(None, ge=0),
+    max_amount: Optional[float] = Query(None, ge=0),
+    issued_from: Optional[date] = Query(None),
+    issued_to: Optional[date] = Query(None),
+    cleared_from: Optional[date] = Query(None),
+    cleared_to: Optional[date] = Query(None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Query cheque outcomes across the current user's tallied sessions,
+    largest amount first, one page at a time.
+    
+    Args:
+        session_id: Optional session filter
+        result_status: Optional outcome filter (repeat for several)
+        cheque_number: Optional cheque number
+        min_amount: Optional minimum amount
+        max_amount: Optional maximum amount
+        issued_from: Optional earliest issue date
+        issued_to: Optional latest issue date
+        cleared_from: Optional earliest clearing date
+        cleared_to: Optional latest clearing date
+        limit: Maximum rows per page
+        cursor: Cursor returned as next_cursor by the previous page
+        current_user: Current authenticated user
         
-        return {
-            "session_id": session_id,
-            "company_structured": company_structured.dict(),
-            "bank_structured": bank_structured.dict(),
-            "tally_result": result
-        }
+    Returns:
+        One page of outcomes, the total matching count and the next cursor
+    """
+    try:
+        page = await query_tally_results(
+            current_user["user_id"],
+            session_ids=session_id,
+            statuses=result_status,
+            cheque_number=cheque_number,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            issued_from=_day_start(issued_from),
+            issued_to=_day_start(issued_to),
+            cleared_from=_day_start(cleared_from),
+            cleared_to=_day_start(cleared_to),
+            limit=limit,
+            cursor=cursor
+        )
+        return TallyResultList(**page)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Tally error: {str(e)}")
+        logger.error(f"Tally result query error: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to perform tally: {str(e)}"
+            detail="Failed to query tally results"
         )
-
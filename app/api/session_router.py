@@ -1,16 +1,24 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException, Query, status
+from typing import List, Literal, Optional
 import logging
-from app.schemas.session_schema import SessionCreate, SessionResponse, SessionList, DocumentUploadResponse
+from app.schemas.session_schema import (
+    SessionCreate,
+    SessionResponse,
+    SessionList,
+    SessionStatus,
+    DocumentUploadResponse,
+    BatchUploadResponse
+)
 from app.services.session_service import (
     create_session,
-    get_user_sessions,
+    list_user_sessions,
     get_session_by_id,
     delete_session,
-    update_session_document
+    add_session_document
 )
 from app.services.file_storage import save_pdf
-from app.services.pdf_reader import extract_raw_text_from_pdf
-from app.services.document_service import create_document
+from app.services.pdf_reader import extract_raw_text_from_pdf_async
+from app.services.upload_service import ingest_batch
 from app.core.auth import get_current_user
 
 router = APIRouter(prefix="/sessions", tags=["Sessions"])
@@ -45,26 +53,40 @@ async def create_new_session(
 
 
 @router.get("", response_model=SessionList)
-async def list_sessions(current_user: dict = Depends(get_current_user)):
+async def list_sessions(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    session_status: Optional[List[SessionStatus]] = Query(None, alias="status"),
+    current_user: dict = Depends(get_current_user)
+):
     """
-    Get all sessions for the current user.
+    Get the current user's sessions, newest first, one page at a time.
     
     Args:
+        limit: Maximum sessions per page
+        cursor: Cursor returned as next_cursor by the previous page
+        session_status: Optional status filter (repeat for several)
         current_user: Current authenticated user
         
     Returns:
-        List of user's sessions
+        One page of sessions, the total matching count and the next cursor
     """
     try:
-        sessions = await get_user_sessions(current_user["user_id"])
-        
-        session_responses = [SessionResponse(**session) for session in sessions]
+        page = await list_user_sessions(
+            current_user["user_id"],
+            limit=limit,
+            cursor=cursor,
+            statuses=session_status
+        )
         
         return SessionList(
-            sessions=session_responses,
-            total=len(session_responses)
+            sessions=[SessionResponse(**session) for session in page["sessions"]],
+            total=page["total"],
+            next_cursor=page["next_cursor"]
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Session listing error: {str(e)}")
         raise HTTPException(
@@ -146,23 +168,17 @@ async def upload_company_document(
     """
     try:
         # Save PDF and extract text
-        file_path = save_pdf(file)
-        raw_text = extract_raw_text_from_pdf(file_path)
-        
-        # Create document
-        document_id = await create_document(
-            user_id=current_user["user_id"],
-            session_id=session_id,
-            document_type="company",
-            raw_text=raw_text
-        )
+        saved = await save_pdf(file)
+        raw_text = await extract_raw_text_from_pdf_async(saved.path)
         
-        # Update session
-        await update_session_document(
+        # Store the document and attach it to the session atomically
+        document_id, _ = await add_session_document(
             session_id=session_id,
             user_id=current_user["user_id"],
-            document_id=document_id,
-            document_type="company"
+            document_type="company",
+            raw_text=raw_text,
+            file_size=saved.size,
+            file_sha256=saved.sha256
         )
         
         return DocumentUploadResponse(
@@ -203,23 +219,17 @@ async def upload_bank_document(
     """
     try:
         # Save PDF and extract text
-        file_path = save_pdf(file)
-        raw_text = extract_raw_text_from_pdf(file_path)
+        saved = await save_pdf(file)
+        raw_text = await extract_raw_text_from_pdf_async(saved.path)
         
-        # Create document
-        document_id = await create_document(
-            user_id=current_user["user_id"],
-            session_id=session_id,
-            document_type="bank",
-            raw_text=raw_text
-        )
-        
-        # Update session
-        await update_session_document(
+        # Store the document and attach it to the session atomically
+        document_id, _ = await add_session_document(
             session_id=session_id,
             user_id=current_user["user_id"],
-            document_id=document_id,
-            document_type="bank"
+            document_type="bank",
+            raw_text=raw_text,
+            file_size=saved.size,
+            file_sha256=saved.sha256
         )
         
         return DocumentUploadResponse(
@@ -239,3 +249,47 @@ async def upload_bank_document(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to upload bank document"
         )
+
+
+@router.post("/{session_id}/upload-batch", response_model=BatchUploadResponse)
+async def upload_document_batch(
+    session_id: str,
+    files: List[UploadFile] = File(...),
+    document_types: List[Literal["company", "bank"]] = Form(...),
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Upload several documents to a session in one multipart request.
+    
+    Files are saved and their text extracted concurrently; each gets its
+    own result, so one bad file doesn't fail the batch.
+    
+    Args:
+        session_id: Session ID
+        files: PDF files to upload
+        document_types: Type of each file ("company" or "bank"), or one type for all
+        current_user: Current authenticated user
+        
+    Returns:
+        Updated session and per-file results
+    """
+    try:
+        batch = await ingest_batch(session_id, current_user["user_id"], files, document_types)
+        results = batch["results"]
+        uploaded = sum(1 for result in results if result["status"] == "uploaded")
+        
+        return BatchUploadResponse(
+            session=SessionResponse(**batch["session"]),
+            results=results,
+            uploaded=uploaded,
+            failed=len(results) - uploaded
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Batch upload error: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to upload documents"
+        )
@@ -1,18 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import asyncio
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from app.core.security import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+from app.core.security import (
+    SECRET_KEY,
+    ALGORITHM,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    BCRYPT_ROUNDS,
+    PASSWORD_HASH_WORKERS
+)
 from app.core.database import users_collection
+from app.core.user_cache import user_cache
 
 pwd_context = CryptContext(
     schemes=["bcrypt"],
     bcrypt__truncate_error=False,
+    bcrypt__rounds=BCRYPT_ROUNDS,
     deprecated="auto"
 )
 
+# bcrypt releases the GIL, so a small thread pool runs hashes in parallel
+# while the event loop keeps serving other requests
+_password_executor = ThreadPoolExecutor(
+    max_workers=max(1, PASSWORD_HASH_WORKERS),
+    thread_name_prefix="password-hash"
+)
+
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
@@ -26,6 +43,31 @@ def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt."""
     return pwd_context.hash(password)
 
+
+async def ahash_password(password: str) -> str:
+    """Hash a password on the password thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_password_executor, pwd_context.hash, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the password thread pool.
+    
+    Returns:
+        (valid, new_hash): new_hash is set when the password is valid but
+        the stored hash uses an outdated scheme or work factor and should
+        be replaced
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _password_executor,
+        pwd_context.verify_and_update,
+        plain_password,
+        hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -58,7 +100,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         credentials: HTTP Bearer token from Authorization header
         
     Returns:
-        User document from database
+        User document (from user_cache when fresh, otherwise the database)
         
     Raises:
         HTTPException: If token is invalid or user not found
@@ -80,11 +122,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
-    # Fetch user from database
-    user = await users_collection.find_one({"user_id": user_id})
+    # Fetch user from cache, falling back to the database
+    user = user_cache.get(user_id)
     
     if user is None:
-        raise credentials_exception
+        user = await users_collection.find_one({"user_id": user_id})
+        
+        if user is None:
+            raise credentials_exception
+        
+        user_cache.put(user_id, user)
     
     if not user.get("is_active", True):
         raise HTTPException(
@@ -12,3 +12,76 @@ os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
 DATABASE_NAME = "finance_data"
+
+# LLM extraction chunking
+EXTRACTION_PAGES_PER_CHUNK = int(os.getenv("EXTRACTION_PAGES_PER_CHUNK", "5"))
+EXTRACTION_MAX_CONCURRENCY = int(os.getenv("EXTRACTION_MAX_CONCURRENCY", "4"))
+
+# Extraction cache
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+EXTRACTION_CACHE_TTL_SECONDS = int(os.getenv("EXTRACTION_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv("EXTRACTION_CACHE_MAX_ENTRIES", "10000"))
+
+# Rule-based bank statement parser: pages below this confidence go to the LLM
+BANK_PARSER_MIN_CONFIDENCE = float(os.getenv("BANK_PARSER_MIN_CONFIDENCE", "0.9"))
+BANK_PARSER_ENABLED = os.getenv("BANK_PARSER_ENABLED", "true").lower() == "true"
+
+# Pre-filter: only lines scoring PREFILTER_MIN_SCORE or more are sent to the LLM
+PREFILTER_ENABLED = os.getenv("PREFILTER_ENABLED", "true").lower() == "true"
+PREFILTER_MIN_SCORE = int(os.getenv("PREFILTER_MIN_SCORE", "3"))
+PREFILTER_CONTEXT_LINES = int(os.getenv("PREFILTER_CONTEXT_LINES", "0"))
+PREFILTER_TABULAR = os.getenv("PREFILTER_TABULAR", "false").lower() == "true"
+
+# Tally matching
+TALLY_AMOUNT_TOLERANCE = float(os.getenv("TALLY_AMOUNT_TOLERANCE", "0.01"))
+TALLY_DATE_WINDOW_DAYS = int(os.getenv("TALLY_DATE_WINDOW_DAYS", "180"))  # 0 disables the date check
+TALLY_MAX_CANDIDATES = int(os.getenv("TALLY_MAX_CANDIDATES", "3"))
+TALLY_CANDIDATE_SCAN_LIMIT = int(os.getenv("TALLY_CANDIDATE_SCAN_LIMIT", "64"))  # bank rows scored per pending cheque
+
+# Outstanding-cheque ledger: pending cheques carried across sessions so a
+# later statement can clear them
+OUTSTANDING_LEDGER_ENABLED = os.getenv("OUTSTANDING_LEDGER_ENABLED", "true").lower() == "true"
+
+# Background tally jobs: number of tallies a node runs at once
+TALLY_WORKERS = int(os.getenv("TALLY_WORKERS", "2"))
+# Running jobs touch updated_at every heartbeat; a running job silent for
+# TALLY_JOB_STALE_SECONDS lost its runner and is re-queued by the sweep
+TALLY_JOB_HEARTBEAT_SECONDS = int(os.getenv("TALLY_JOB_HEARTBEAT_SECONDS", "30"))
+TALLY_JOB_STALE_SECONDS = int(os.getenv("TALLY_JOB_STALE_SECONDS", "180"))
+TALLY_JOB_SWEEP_SECONDS = int(os.getenv("TALLY_JOB_SWEEP_SECONDS", "60"))
+BULK_TALLY_MAX_SESSIONS = int(os.getenv("BULK_TALLY_MAX_SESSIONS", "500"))
+
+# Uploads
+MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(50 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))
+
+# Documents a session can hold per side (company registers / bank statements)
+SESSION_MAX_DOCUMENTS_PER_TYPE = int(os.getenv("SESSION_MAX_DOCUMENTS_PER_TYPE", "24"))
+
+# Batch uploads: files per request, and files saved/extracted at once
+BATCH_UPLOAD_MAX_FILES = int(os.getenv("BATCH_UPLOAD_MAX_FILES", "20"))
+BATCH_UPLOAD_CONCURRENCY = int(os.getenv("BATCH_UPLOAD_CONCURRENCY", "4"))
+
+# PDF text extraction process pool
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+
+# LLM provider: "groq", "openai_compatible", "replay" or "record"
+LLM_PROVIDER = os.getenv("LLM_PROVIDER", "groq")
+LLM_MODEL = os.getenv("LLM_MODEL", "openai/gpt-oss-120b")
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "4000"))
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "http://localhost:8001/v1")  # openai_compatible only
+LLM_RECORD_PROVIDER = os.getenv("LLM_RECORD_PROVIDER", "groq")  # provider wrapped by "record"
+LLM_REPLAY_DIR = os.getenv("LLM_REPLAY_DIR", os.path.join(BASE_DIR, "llm_recordings"))
+LLM_REPLAY_LATENCY_MS = float(os.getenv("LLM_REPLAY_LATENCY_MS", "0"))
+LLM_REPLAY_JITTER_MS = float(os.getenv("LLM_REPLAY_JITTER_MS", "0"))
+
+# LLM gateway (process-wide limits shared by all extractions)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "30"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "60000"))
+LLM_OUTPUT_TOKEN_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKEN_ESTIMATE", "1000"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30.0"))
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "20"))
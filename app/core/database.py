@@ -9,3 +9,8 @@ database = client[DATABASE_NAME]
 users_collection = database["users"]
 sessions_collection = database["sessions"]
 documents_collection = database["documents"]
+extraction_cache_collection = database["extraction_cache"]
+jobs_collection = database["tally_jobs"]
+document_pages_collection = database["document_pages"]
+outstanding_cheques_collection = database["outstanding_cheques"]
+tally_results_collection = database["tally_results"]
@@ -45,3 +45,21 @@ class UserAlreadyExistsError(HTTPException):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"User with this {field} already exists"
         )
+
+
+class JobNotFoundError(HTTPException):
+    """Raised when a background job doesn't exist."""
+    def __init__(self, job_id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job {job_id} not found"
+        )
+
+
+class DocumentNotFoundError(HTTPException):
+    """Raised when a document doesn't exist."""
+    def __init__(self, document_id: str):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Document {document_id} not found"
+        )
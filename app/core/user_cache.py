@@ -0,0 +1,83 @@
+"""
+Bounded TTL/LRU cache of user documents, keyed by user_id.
+
+get_current_user consults it before going to Mongo, so authenticated
+requests normally skip the users lookup. Entries expire after
+USER_CACHE_TTL_SECONDS and the least recently used entry is evicted once
+USER_CACHE_MAX_ENTRIES is reached. user_service invalidates an entry
+whenever it changes that user.
+"""
+from collections import OrderedDict
+from typing import Optional
+import time
+from app.core.security import USER_CACHE_ENABLED, USER_CACHE_TTL_SECONDS, USER_CACHE_MAX_ENTRIES
+
+
+class UserCache:
+    """In-process LRU cache with a per-entry time to live."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+            "invalidations": 0
+        }
+
+    def get(self, user_id: str) -> Optional[dict]:
+        """Return a copy of the cached user, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        entry = self._entries.get(user_id)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+
+        expires_at, user = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            self.stats["expired"] += 1
+            self.stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(user_id)
+        self.stats["hits"] += 1
+        return dict(user)
+
+    def put(self, user_id: str, user: dict):
+        """Cache a user document."""
+        if not self.enabled:
+            return
+
+        self._entries[user_id] = (time.monotonic() + self.ttl_seconds, dict(user))
+        self._entries.move_to_end(user_id)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    def invalidate(self, user_id: str):
+        """Drop a user so the next request reloads it from the database."""
+        if self._entries.pop(user_id, None) is not None:
+            self.stats["invalidations"] += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Counters plus current size and hit ratio, for the metrics endpoint."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "size": len(self._entries),
+            "hit_ratio": round(self.stats["hits"] / lookups, 4) if lookups else None
+        }
+
+
+user_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS, USER_CACHE_ENABLED)
@@ -1,18 +1,35 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.auth_router import router as auth_router
 from app.api.session_router import router as session_router
 from app.api.document_router import router as document_router
 from app.api.full_tally import router as tally_router
+from app.services.job_service import tally_worker_pool
+from app.services.pdf_reader import shutdown_pdf_pool
+from app.services.llm_service import llm_gateway
+from app.services.text_prefilter import prefilter_stats
+from app.core.user_cache import user_cache
 from app.core.logging_config import logger
 
 # Initialize logging
 logger.info("Starting AI Cheque Tally System")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop background workers with the application."""
+    await tally_worker_pool.start()
+    yield
+    await tally_worker_pool.stop()
+    shutdown_pdf_pool()
+
+
 app = FastAPI(
     title="AI Cheque Tally System",
     description="Production-ready financial reconciliation system with JWT authentication",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Include routers
@@ -47,3 +64,12 @@ async def root():
         "version": "2.0.0"
     }
 
+
+@app.get("/metrics")
+async def metrics():
+    """In-process counters for caches and the LLM gateway."""
+    return {
+        "user_cache": user_cache.snapshot(),
+        "llm_gateway": llm_gateway.stats,
+        "prefilter": prefilter_stats
+    }
@@ -10,7 +10,15 @@ class DocumentModel(BaseModel):
     session_id: str  # Session this document belongs to
     document_type: Literal["bank", "company"]
 
-    raw_text: str
+    # Text lives in document_pages; raw_text is only set on documents
+    # created before page-level storage
+    raw_text: Optional[str] = None
+    page_count: int = 0
+    char_count: int = 0
+
+    # Uploaded PDF
+    file_size: int = 0
+    file_sha256: Optional[str] = None
 
     structured_data: Optional[Dict[str, Any]] = None
     tally_result: Optional[Dict[str, Any]] = None
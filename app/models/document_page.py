@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+
+
+class DocumentPageModel(BaseModel):
+    """Extracted text of a single PDF page."""
+    document_id: str
+    user_id: str
+    session_id: str
+    page_number: int
+    text: str
+    char_count: int
+    has_cheque_content: bool
+    content_hash: str
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Literal, Dict, Any
+from datetime import datetime
+from uuid import uuid4
+
+
+class TallyJobModel(BaseModel):
+    """Background tally job database model."""
+    job_id: str = Field(default_factory=lambda: str(uuid4()))
+    user_id: str
+    session_id: str
+    bulk_id: Optional[str] = None  # set when queued as part of a bulk tally
+    priority: int = 0  # lower runs first; bulk jobs use the session's page count
+    status: Literal["queued", "running", "completed", "failed"] = "queued"
+    stage: str = "queued"
+    progress: int = 0  # percent
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Literal
+from typing import Optional, Literal, List, Dict, Any
 from datetime import datetime
 from uuid import uuid4
 
@@ -9,9 +9,18 @@ class SessionModel(BaseModel):
     session_id: str = Field(default_factory=lambda: str(uuid4()))
     user_id: str
     session_name: str
+    # All documents per side; the single-id fields hold the first one and
+    # are kept for clients and sessions that predate multi-document support
+    company_document_ids: List[str] = Field(default_factory=list)
+    bank_document_ids: List[str] = Field(default_factory=list)
     company_document_id: Optional[str] = None
     bank_document_id: Optional[str] = None
     status: Literal["created", "company_uploaded", "bank_uploaded", "complete", "tallied"] = "created"
+    # Summary of the latest tally and the documents it covered, for
+    # incremental re-tallies; the per-cheque outcomes live in tally_results
+    tally_summary: Optional[Dict[str, Any]] = None
+    tally_duplicates: List[Dict[str, Any]] = Field(default_factory=list)
+    tallied_document_ids: List[str] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -21,9 +30,14 @@ class SessionModel(BaseModel):
                 "session_id": "123e4567-e89b-12d3-a456-426614174001",
                 "user_id": "123e4567-e89b-12d3-a456-426614174000",
                 "session_name": "Q1 2024 Reconciliation",
+                "company_document_ids": ["doc-123"],
+                "bank_document_ids": ["doc-456", "doc-789"],
                 "company_document_id": "doc-123",
                 "bank_document_id": "doc-456",
                 "status": "complete",
+                "tally_summary": None,
+                "tally_duplicates": [],
+                "tallied_document_ids": [],
                 "created_at": "2024-01-01T00:00:00",
                 "updated_at": "2024-01-01T00:00:00"
             }
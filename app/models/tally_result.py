@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Literal
+from datetime import datetime
+from uuid import uuid4
+
+
+class TallyResultModel(BaseModel):
+    """One cheque outcome of a session's latest tally."""
+    row_id: str = Field(default_factory=lambda: str(uuid4()))
+    user_id: str
+    session_id: str
+    status: Literal["cashed", "pending", "mismatched", "cleared_late", "unmatched_bank"]
+    cheque_number: Optional[str] = None
+    cheque_key: str  # normalized cheque number
+    payee_name: Optional[str] = None
+    amount: float  # issued amount; the bank amount for unmatched_bank rows
+    bank_amount: Optional[float] = None
+    issue_date: Optional[str] = None  # as printed on the register
+    clearing_date: Optional[str] = None  # as printed on the statement
+    issued_on: Optional[datetime] = None  # parsed issue_date, for range queries
+    cleared_on: Optional[datetime] = None  # parsed clearing_date
+    cleared_session_id: Optional[str] = None  # session whose statement cleared a late cheque
+    tallied_at: datetime = Field(default_factory=datetime.utcnow)
@@ -17,6 +17,7 @@ class BankCheque(BaseModel):
     cheque_number: Optional[str] = Field(None, description="Cheque number")
     clearing_date: Optional[str] = Field(None, description="Date cheque was cleared")
     amount: Optional[float] = Field(None, description="Cleared amount")
+    confidence: Optional[float] = Field(None, description="Rule-based parser confidence (leave empty)")
 
 
 class BankChequeList(BaseModel):
@@ -0,0 +1,33 @@
+from pydantic import BaseModel
+from typing import Optional, Literal
+from datetime import datetime
+
+
+class DocumentMetadataResponse(BaseModel):
+    """Schema for document metadata (no text or extracted data)."""
+    document_id: str
+    session_id: str
+    document_type: Literal["bank", "company"]
+    status: Literal["uploaded", "structured", "tallied"]
+    file_size: int = 0
+    file_sha256: Optional[str] = None
+    page_count: int = 0
+    char_count: int = 0
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "document_id": "doc-123",
+                "session_id": "123e4567-e89b-12d3-a456-426614174001",
+                "document_type": "bank",
+                "status": "structured",
+                "file_size": 482133,
+                "file_sha256": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+                "page_count": 12,
+                "char_count": 38210,
+                "created_at": "2024-01-01T00:00:00",
+                "updated_at": "2024-01-01T00:05:00"
+            }
+        }
@@ -0,0 +1,179 @@
+from pydantic import BaseModel
+from typing import Optional, Literal, Dict, Any, List
+from datetime import datetime
+from app.schemas.session_schema import SessionStatus
+
+
+class TallyJobResponse(BaseModel):
+    """Schema for tally job response."""
+    job_id: str
+    session_id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    stage: str
+    progress: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "123e4567-e89b-12d3-a456-426614174002",
+                "session_id": "123e4567-e89b-12d3-a456-426614174001",
+                "status": "running",
+                "stage": "extracting",
+                "progress": 10,
+                "result": None,
+                "error": None,
+                "created_at": "2024-01-01T00:00:00",
+                "started_at": "2024-01-01T00:00:01",
+                "finished_at": None
+            }
+        }
+
+
+class BulkTallyRequest(BaseModel):
+    """Schema for a bulk tally request: explicit sessions, or a status filter."""
+    session_ids: Optional[List[str]] = None
+    status: Optional[List[SessionStatus]] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "session_ids": None,
+                "status": ["complete"]
+            }
+        }
+
+
+class BulkTallyJob(BaseModel):
+    """One session's job within a bulk tally."""
+    job_id: str
+    session_id: str
+    priority: int
+    status: Literal["queued", "running", "completed", "failed"] = "queued"
+    stage: str = "queued"
+    progress: int = 0
+    error: Optional[str] = None
+
+
+class BulkTallySkipped(BaseModel):
+    """A session left out of a bulk tally, and why."""
+    session_id: str
+    error: str
+
+
+class BulkTallyResponse(BaseModel):
+    """Schema for a queued bulk tally."""
+    bulk_id: str
+    jobs: List[BulkTallyJob]
+    skipped: List[BulkTallySkipped]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "bulk_id": "123e4567-e89b-12d3-a456-426614174003",
+                "jobs": [
+                    {
+                        "job_id": "123e4567-e89b-12d3-a456-426614174002",
+                        "session_id": "123e4567-e89b-12d3-a456-426614174001",
+                        "priority": 4,
+                        "status": "queued",
+                        "stage": "queued",
+                        "progress": 0,
+                        "error": None
+                    }
+                ],
+                "skipped": []
+            }
+        }
+
+
+class BulkTallyStatusResponse(BaseModel):
+    """Schema for bulk tally progress."""
+    bulk_id: str
+    total: int
+    queued: int
+    running: int
+    completed: int
+    failed: int
+    progress: int  # percent, weighted by page count
+    jobs: List[BulkTallyJob]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "bulk_id": "123e4567-e89b-12d3-a456-426614174003",
+                "total": 2,
+                "queued": 0,
+                "running": 1,
+                "completed": 1,
+                "failed": 0,
+                "progress": 64,
+                "jobs": [
+                    {
+                        "job_id": "123e4567-e89b-12d3-a456-426614174002",
+                        "session_id": "123e4567-e89b-12d3-a456-426614174001",
+                        "priority": 4,
+                        "status": "completed",
+                        "stage": "completed",
+                        "progress": 100,
+                        "error": None
+                    }
+                ]
+            }
+        }
+
+
+TallyResultStatus = Literal["cashed", "pending", "mismatched", "cleared_late", "unmatched_bank"]
+
+
+class TallyResultRow(BaseModel):
+    """Schema for one cheque outcome of a tally."""
+    row_id: str
+    session_id: str
+    status: TallyResultStatus
+    cheque_number: Optional[str] = None
+    payee_name: Optional[str] = None
+    amount: float
+    bank_amount: Optional[float] = None
+    issue_date: Optional[str] = None
+    clearing_date: Optional[str] = None
+    issued_on: Optional[datetime] = None
+    cleared_on: Optional[datetime] = None
+    cleared_session_id: Optional[str] = None
+    tallied_at: datetime
+
+
+class TallyResultList(BaseModel):
+    """Schema for one page of cheque outcomes."""
+    results: List[TallyResultRow]
+    total: int
+    next_cursor: Optional[str] = None
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "results": [
+                    {
+                        "row_id": "123e4567-e89b-12d3-a456-426614174004",
+                        "session_id": "123e4567-e89b-12d3-a456-426614174001",
+                        "status": "pending",
+                        "cheque_number": "000123",
+                        "payee_name": "ACME SUPPLIES",
+                        "amount": 75000.0,
+                        "bank_amount": None,
+                        "issue_date": "09/03/2024",
+                        "clearing_date": None,
+                        "issued_on": "2024-03-09T00:00:00",
+                        "cleared_on": None,
+                        "cleared_session_id": None,
+                        "tallied_at": "2024-04-01T00:00:00"
+                    }
+                ],
+                "total": 1,
+                "next_cursor": None
+            }
+        }
@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, Literal, List
 from datetime import datetime
 
+SessionStatus = Literal["created", "company_uploaded", "bank_uploaded", "complete", "tallied"]
+
 
 class SessionCreate(BaseModel):
     """Schema for creating a new session."""
@@ -20,9 +22,11 @@ class SessionResponse(BaseModel):
     session_id: str
     user_id: str
     session_name: str
+    company_document_ids: List[str] = []
+    bank_document_ids: List[str] = []
     company_document_id: Optional[str] = None
     bank_document_id: Optional[str] = None
-    status: Literal["created", "company_uploaded", "bank_uploaded", "complete", "tallied"]
+    status: SessionStatus
     created_at: datetime
     updated_at: datetime
     
@@ -32,6 +36,8 @@ class SessionResponse(BaseModel):
                 "session_id": "123e4567-e89b-12d3-a456-426614174001",
                 "user_id": "123e4567-e89b-12d3-a456-426614174000",
                 "session_name": "Q1 2024 Reconciliation",
+                "company_document_ids": ["doc-123"],
+                "bank_document_ids": ["doc-456"],
                 "company_document_id": "doc-123",
                 "bank_document_id": "doc-456",
                 "status": "complete",
@@ -42,9 +48,10 @@ class SessionResponse(BaseModel):
 
 
 class SessionList(BaseModel):
-    """Schema for list of sessions."""
+    """Schema for one page of sessions."""
     sessions: List[SessionResponse]
     total: int
+    next_cursor: Optional[str] = None
     
     class Config:
         json_schema_extra = {
@@ -54,6 +61,8 @@ class SessionList(BaseModel):
                         "session_id": "123e4567-e89b-12d3-a456-426614174001",
                         "user_id": "123e4567-e89b-12d3-a456-426614174000",
                         "session_name": "Q1 2024 Reconciliation",
+                        "company_document_ids": ["doc-123"],
+                        "bank_document_ids": ["doc-456"],
                         "company_document_id": "doc-123",
                         "bank_document_id": "doc-456",
                         "status": "complete",
@@ -61,7 +70,8 @@ class SessionList(BaseModel):
                         "updated_at": "2024-01-01T00:00:00"
                     }
                 ],
-                "total": 1
+                "total": 1,
+                "next_cursor": None
             }
         }
 
@@ -82,3 +92,59 @@ class DocumentUploadResponse(BaseModel):
                 "status": "uploaded_and_extracted"
             }
         }
+
+
+class BatchUploadResult(BaseModel):
+    """Outcome for one file of a batch upload."""
+    filename: str
+    document_type: Literal["bank", "company"]
+    status: Literal["uploaded", "failed"]
+    document_id: Optional[str] = None
+    page_count: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BatchUploadResponse(BaseModel):
+    """Schema for batch upload response."""
+    session: SessionResponse
+    results: List[BatchUploadResult]
+    uploaded: int
+    failed: int
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "session": {
+                    "session_id": "123e4567-e89b-12d3-a456-426614174001",
+                    "user_id": "123e4567-e89b-12d3-a456-426614174000",
+                    "session_name": "Q1 2024 Reconciliation",
+                    "company_document_ids": ["doc-123"],
+                    "bank_document_ids": ["doc-456"],
+                    "company_document_id": "doc-123",
+                    "bank_document_id": "doc-456",
+                    "status": "complete",
+                    "created_at": "2024-01-01T00:00:00",
+                    "updated_at": "2024-01-01T00:00:00"
+                },
+                "results": [
+                    {
+                        "filename": "register.pdf",
+                        "document_type": "company",
+                        "status": "uploaded",
+                        "document_id": "doc-123",
+                        "page_count": 4,
+                        "error": None
+                    },
+                    {
+                        "filename": "statement.pdf",
+                        "document_type": "bank",
+                        "status": "uploaded",
+                        "document_id": "doc-456",
+                        "page_count": 12,
+                        "error": None
+                    }
+                ],
+                "uploaded": 2,
+                "failed": 0
+            }
+        }
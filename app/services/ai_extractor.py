@@ -1,16 +1,42 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from app.services.llm_service import get_llm
+from app.services.llm_service import get_llm, llm_gateway, llm_identity
+from app.services.extraction_cache import (
+    build_cache_key,
+    get_cached_extraction,
+    store_cached_extraction
+)
+from app.services.pdf_reader import split_pages
+from app.services.bank_statement_parser import parse_bank_statement
+from app.services.text_prefilter import prefilter_text
+from app.core.config import (
+    EXTRACTION_PAGES_PER_CHUNK,
+    EXTRACTION_MAX_CONCURRENCY,
+    BANK_PARSER_ENABLED,
+    PREFILTER_ENABLED
+)
 from app.schemas.cheque_schema import (
     CompanyChequeList,
     BankChequeList
 )
+from typing import Awaitable, Callable, List, Optional, TypeVar
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Receives (cheques, completed_chunks, total_chunks) as extraction progresses
+ChunkCallback = Callable[[list, int, int], Awaitable[None]]
+
+# Bump whenever a prompt, the rule-based parser or the cleaning rules
+# change, so cached extractions made the old way are no longer reused.
+PROMPT_VERSION = "4"
 
-def extract_company_cheques(raw_text: str):
+
+def _build_company_chain():
+    """Build the prompt | llm | parser chain for company cheque registers."""
 
     parser = PydanticOutputParser(pydantic_object=CompanyChequeList)
 
@@ -27,32 +53,11 @@ def extract_company_cheques(raw_text: str):
         )
     ])
 
-    chain = prompt | get_llm() | parser
+    return prompt | get_llm() | parser, parser
 
-    result = chain.invoke({
-        "document": raw_text,
-        "format_instructions": parser.get_format_instructions()
-    })
 
-    logger.info(f"Company extraction - Raw result: {len(result.cheques)} cheques extracted")
-    logger.debug(f"Company raw cheques: {result.cheques}")
-    
-    # Filter incomplete cheques - only require critical fields
-    original_count = len(result.cheques)
-    result.cheques = [
-        c for c in result.cheques
-        if c.cheque_number and c.amount  # Only require cheque number and amount
-    ]
-    
-    filtered_count = original_count - len(result.cheques)
-    if filtered_count > 0:
-        logger.warning(f"Company extraction - Filtered out {filtered_count} incomplete cheques")
-    logger.info(f"Company extraction - Final result: {len(result.cheques)} valid cheques")
-
-    return result
-
-
-def extract_bank_cheques(raw_text: str):
+def _build_bank_chain():
+    """Build the prompt | llm | parser chain for bank statements."""
 
     parser = PydanticOutputParser(pydantic_object=BankChequeList)
 
@@ -73,26 +78,253 @@ def extract_bank_cheques(raw_text: str):
         )
     ])
 
-    chain = prompt | get_llm() | parser
+    return prompt | get_llm() | parser, parser
 
-    result = chain.invoke({
-        "document": raw_text,
-        "format_instructions": parser.get_format_instructions()
-    })
 
+def _clean_company_result(result: CompanyChequeList) -> CompanyChequeList:
+    logger.info(f"Company extraction - Raw result: {len(result.cheques)} cheques extracted")
+    logger.debug(f"Company raw cheques: {result.cheques}")
+
+    # Filter incomplete cheques - only require critical fields
+    original_count = len(result.cheques)
+    result.cheques = [
+        c for c in result.cheques
+        if c.cheque_number and c.amount  # Only require cheque number and amount
+    ]
+
+    filtered_count = original_count - len(result.cheques)
+    if filtered_count > 0:
+        logger.warning(f"Company extraction - Filtered out {filtered_count} incomplete cheques")
+    logger.info(f"Company extraction - Final result: {len(result.cheques)} valid cheques")
+
+    return result
+
+
+def _clean_bank_result(result: BankChequeList) -> BankChequeList:
     logger.info(f"Bank extraction - Raw result: {len(result.cashed_cheques)} cheques extracted")
     logger.debug(f"Bank raw cheques: {result.cashed_cheques}")
-    
+
     # Filter incomplete bank cheques
     original_count = len(result.cashed_cheques)
     result.cashed_cheques = [
         c for c in result.cashed_cheques
         if c.cheque_number and c.clearing_date and c.amount
     ]
-    
+
     filtered_count = original_count - len(result.cashed_cheques)
     if filtered_count > 0:
         logger.warning(f"Bank extraction - Filtered out {filtered_count} incomplete cheques")
     logger.info(f"Bank extraction - Final result: {len(result.cashed_cheques)} valid cheques")
 
-    return result
\ No newline at end of file
+    return result
+
+
+def chunk_raw_text(raw_text: str, pages_per_chunk: int = EXTRACTION_PAGES_PER_CHUNK) -> List[str]:
+    """
+    Split document text into prompt-sized chunks on its page markers.
+
+    Each chunk keeps the original "--- Page N ---" headers so the model
+    still sees page boundaries.
+    """
+    pages = split_pages(raw_text)
+    if not pages:
+        return [raw_text]
+
+    pages_per_chunk = max(1, pages_per_chunk)
+    chunks = []
+    for start in range(0, len(pages), pages_per_chunk):
+        chunks.append("\n".join(
+            f"--- Page {page_number} ---\n{text}"
+            for page_number, text in pages[start:start + pages_per_chunk]
+        ))
+
+    return chunks
+
+
+async def _extract_chunks(
+    chunks: List[str],
+    extract_chunk: Callable[[str], Awaitable[T]],
+    on_result: Optional[Callable[[T], Awaitable[None]]] = None
+) -> List[T]:
+    """
+    Run extract_chunk over every chunk, at most EXTRACTION_MAX_CONCURRENCY at a time.
+
+    on_result, if given, is awaited with each chunk's result as soon as it
+    lands (in completion order); the returned list keeps chunk order.
+    """
+    semaphore = asyncio.Semaphore(max(1, EXTRACTION_MAX_CONCURRENCY))
+
+    async def run(chunk: str) -> T:
+        async with semaphore:
+            result = await extract_chunk(chunk)
+        if on_result is not None:
+            await on_result(result)
+        return result
+
+    return await asyncio.gather(*(run(chunk) for chunk in chunks))
+
+
+def _concat_chunks(chunk_results: List[list]) -> list:
+    """
+    Concatenate per-chunk cheque lists in chunk order.
+
+    Chunks are split on page boundaries, so no row can appear in two
+    chunks: a cheque number that repeats across chunks is a genuine
+    duplicate or a re-presented cheque, and is kept for the tally to
+    report.
+    """
+    return [cheque for cheques in chunk_results for cheque in cheques]
+
+
+def _prefilter(raw_text: str, document_type: str) -> str:
+    """Trim text to cheque-relevant lines before it is sent to the LLM."""
+    if not PREFILTER_ENABLED:
+        return raw_text
+
+    result = prefilter_text(raw_text)
+    logger.info(
+        f"{document_type.capitalize()} pre-filter - kept {result.lines_kept}/{result.lines_in} lines, "
+        f"~{result.tokens_saved} tokens saved"
+    )
+    return result.text
+
+
+async def _aextract_company_chunk(chunk: str) -> CompanyChequeList:
+    chain, parser = _build_company_chain()
+
+    return await llm_gateway.ainvoke(chain, {
+        "document": chunk,
+        "format_instructions": parser.get_format_instructions()
+    }, prompt_text=chunk)
+
+
+async def _aextract_bank_chunk(chunk: str) -> BankChequeList:
+    chain, parser = _build_bank_chain()
+
+    return await llm_gateway.ainvoke(chain, {
+        "document": chunk,
+        "format_instructions": parser.get_format_instructions()
+    }, prompt_text=chunk)
+
+
+async def aextract_company_cheques(
+    raw_text: str,
+    on_chunk: Optional[ChunkCallback] = None
+) -> CompanyChequeList:
+    """
+    Extract the cheques issued in a company register.
+
+    The document is split on its page markers and the chunks are extracted
+    concurrently through llm_gateway, so large registers never overflow
+    the model's output limit. Only cheque-relevant lines are sent (see
+    text_prefilter). Chunk results are concatenated in page order.
+    Results are cached by content hash, so identical text skips the LLM.
+
+    Args:
+        raw_text: Document text with page markers
+        on_chunk: Optional async callback receiving (cheques, completed,
+            total) as each chunk's raw cheques land
+    """
+
+    cache_key = build_cache_key(raw_text, "company", PROMPT_VERSION, llm_identity())
+    cached = await get_cached_extraction(cache_key)
+    if cached is not None:
+        result = CompanyChequeList.model_validate(cached)
+        if on_chunk is not None:
+            await on_chunk(result.cheques, 1, 1)
+        return result
+
+    chunks = chunk_raw_text(_prefilter(raw_text, "company"))
+    completed = 0
+
+    async def report(chunk_result: CompanyChequeList):
+        nonlocal completed
+        completed += 1
+        await on_chunk(chunk_result.cheques, completed, len(chunks))
+
+    chunk_results = await _extract_chunks(
+        chunks,
+        _aextract_company_chunk,
+        report if on_chunk is not None else None
+    )
+
+    logger.info(f"Company extraction - {len(chunks)} chunk(s) extracted")
+
+    result = CompanyChequeList(
+        cheques=_concat_chunks([r.cheques for r in chunk_results])
+    )
+
+    result = _clean_company_result(result)
+    await store_cached_extraction(cache_key, "company", result.model_dump())
+
+    return result
+
+
+async def aextract_bank_cheques(
+    raw_text: str,
+    on_chunk: Optional[ChunkCallback] = None
+) -> BankChequeList:
+    """
+    Extract the cheques cashed in a bank statement.
+
+    Pages in a recognised statement layout are read by the rule-based
+    parser; only the remaining pages are pre-filtered, split into chunks
+    and extracted concurrently by the LLM through llm_gateway. Results are
+    concatenated and cached by content hash, so identical text skips the
+    LLM.
+
+    Args:
+        raw_text: Document text with page markers
+        on_chunk: Optional async callback receiving (cheques, completed,
+            total); rule-parsed pages count as one chunk
+    """
+
+    cache_key = build_cache_key(raw_text, "bank", PROMPT_VERSION, llm_identity())
+    cached = await get_cached_extraction(cache_key)
+    if cached is not None:
+        result = BankChequeList.model_validate(cached)
+        if on_chunk is not None:
+            await on_chunk(result.cashed_cheques, 1, 1)
+        return result
+
+    cheque_lists = []
+    llm_text = raw_text
+    parsed = None
+
+    if BANK_PARSER_ENABLED:
+        parsed = parse_bank_statement(raw_text)
+        cheque_lists.append(parsed.cheques)
+        llm_text = parsed.unparsed_text if parsed.unparsed_pages else ""
+
+    chunks = chunk_raw_text(_prefilter(llm_text, "bank")) if llm_text else []
+    total = len(chunks) + (1 if parsed is not None else 0)
+    completed = 0
+
+    async def report(cheques: list):
+        nonlocal completed
+        completed += 1
+        await on_chunk(cheques, completed, total)
+
+    if parsed is not None and on_chunk is not None:
+        await report(parsed.cheques)
+
+    if chunks:
+        chunk_results = await _extract_chunks(
+            chunks,
+            _aextract_bank_chunk,
+            (lambda r: report(r.cashed_cheques)) if on_chunk is not None else None
+        )
+        cheque_lists.extend(r.cashed_cheques for r in chunk_results)
+
+        logger.info(f"Bank extraction - {len(chunks)} chunk(s) extracted")
+    else:
+        logger.info("Bank extraction - all pages parsed by rules, LLM skipped")
+
+    result = BankChequeList(
+        cashed_cheques=_concat_chunks(cheque_lists)
+    )
+
+    result = _clean_bank_result(result)
+    await store_cached_extraction(cache_key, "bank", result.model_dump())
+
+    return result
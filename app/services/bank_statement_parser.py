@@ -0,0 +1,244 @@
+"""
+Rule-based cheque extraction for bank statements.
+
+Most statements print one transaction per line with a date, a narration,
+an instrument (cheque) number column and withdrawal/deposit/balance
+amounts. This parser recognises that layout and produces BankCheque rows
+without calling the LLM. Only debit rows whose narration carries a cheque
+marker (CHQ, CLG, INST, ...) are taken as cheques; a page that also has
+other numbered debits, or that it cannot read confidently, is handed back
+so only those pages go to the model.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+import logging
+import re
+from app.core.config import BANK_PARSER_MIN_CONFIDENCE
+from app.schemas.cheque_schema import BankCheque
+from app.services.pdf_reader import split_pages
+
+logger = logging.getLogger(__name__)
+
+# Header keywords naming the instrument / cheque number column
+CHEQUE_COLUMN_RE = re.compile(
+    r"\b(INST(?:RUMENT)?\.?\s*NO|INSTNO|CHQ\.?\s*(?:/\s*REF\.?)?\s*NO|CHEQUE\s*(?:/\s*REF\.?)?\s*NO)\b",
+    re.IGNORECASE
+)
+# Header keywords naming the debit column
+DEBIT_COLUMN_RE = re.compile(r"\b(DEBIT|WITHDRAWALS?|DR\.?)\b", re.IGNORECASE)
+
+DATE_PATTERN = r"\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2,4}|\d{1,2}[\- ]?[A-Za-z]{3}[\- ]?\d{2,4}"
+DATE_RE = re.compile(rf"^\s*({DATE_PATTERN})\b")
+ANY_DATE_RE = re.compile(rf"\b(?:{DATE_PATTERN})\b")
+AMOUNT_RE = re.compile(r"(?<![\d/\-.])(\d{1,3}(?:,\d{2,3})*\.\d{2}|\d+\.\d{2})(?:\s*(Dr|Cr)\b)?", re.IGNORECASE)
+# Amounts as registers often print them: "15,000", "Rs 15000", "15000/-"
+# (a bare integer is indistinguishable from a cheque number, so it is not one)
+LOOSE_AMOUNT_RE = re.compile(
+    r"(?:\b(?:Rs\.?|INR)\s*|₹\s*)\d[\d,]*(?:\.\d{1,2})?(?:/-)?"
+    r"|(?<![\d/\-.,])\d{1,3}(?:,\d{2,3})+(?:\.\d{1,2})?(?:/-)?(?![\d,])"
+    r"|(?<![\d/\-.,])\d+/-",
+    re.IGNORECASE
+)
+CHEQUE_NUMBER_RE = re.compile(r"(?<![\d/\-.,])\d{4,10}(?![\d/\-.,])")
+CHEQUE_KEYWORD_RE = re.compile(r"\b(CHQ|CHEQUE|INST|CLG|CLEARING)\b", re.IGNORECASE)
+NON_CHEQUE_RE = re.compile(r"\b(NEFT|RTGS|IMPS|UPI|ATM|POS|ECS|NACH)\b", re.IGNORECASE)
+OPENING_BALANCE_RE = re.compile(r"OPENING\s+BALANCE", re.IGNORECASE)
+
+NO_TEXT_MARKER = "[NO TEXT FOUND]"
+
+
+@dataclass
+class ParsedPage:
+    """Rule-based parse of a single statement page."""
+    page_number: int
+    text: str
+    cheques: List[BankCheque] = field(default_factory=list)
+    confidence: float = 0.0
+    has_layout: bool = False
+
+    @property
+    def accepted(self) -> bool:
+        return self.has_layout and self.confidence >= BANK_PARSER_MIN_CONFIDENCE
+
+
+@dataclass
+class BankStatementParse:
+    """Result of running the rule-based parser over a whole statement."""
+    pages: List[ParsedPage]
+
+    @property
+    def cheques(self) -> List[BankCheque]:
+        return [c for page in self.pages if page.accepted for c in page.cheques]
+
+    @property
+    def unparsed_pages(self) -> List[Tuple[int, str]]:
+        return [(page.page_number, page.text) for page in self.pages if not page.accepted]
+
+    @property
+    def unparsed_text(self) -> str:
+        """Unparsed pages re-joined in the extract_raw_text_from_pdf page format."""
+        return "\n".join(
+            f"--- Page {page_number} ---\n{text}"
+            for page_number, text in self.unparsed_pages
+        )
+
+
+def _parse_amount(value: str) -> float:
+    return float(value.replace(",", ""))
+
+
+def _split_row(line: str):
+    """
+    Split a transaction line into (date, cheque_number_candidates, amounts).
+
+    Amounts are returned as (value, "dr" | "cr" | None) tuples in the
+    order they appear on the line.
+    """
+    date_match = DATE_RE.match(line)
+    if not date_match:
+        return None
+
+    amounts = [
+        (_parse_amount(m.group(1)), (m.group(2) or "").lower() or None)
+        for m in AMOUNT_RE.finditer(line)
+    ]
+
+    # Blank out dates and amounts so their digits aren't read as cheque numbers
+    stripped = AMOUNT_RE.sub(" ", line)
+    stripped = ANY_DATE_RE.sub(" ", stripped)
+    candidates = CHEQUE_NUMBER_RE.findall(stripped)
+
+    return date_match.group(1), candidates, amounts
+
+
+def _parse_page(page_number: int, text: str, layout_seen: bool, balance: Optional[float]):
+    """
+    Parse one page, returning (ParsedPage, layout_seen, running_balance).
+
+    The layout and running balance carry over between pages, since
+    statements only print the column header on the first page.
+    """
+    page = ParsedPage(page_number=page_number, text=text)
+
+    if text.strip() == NO_TEXT_MARKER:
+        page.has_layout = True
+        page.confidence = 1.0
+        return page, layout_seen, balance
+
+    cheque_rows = 0
+    confident_rows = 0
+    uncertain_rows = 0
+
+    for line in text.splitlines():
+        if CHEQUE_COLUMN_RE.search(line) and DEBIT_COLUMN_RE.search(line):
+            layout_seen = True
+            continue
+
+        if OPENING_BALANCE_RE.search(line):
+            opening = AMOUNT_RE.findall(line)
+            if opening:
+                balance = _parse_amount(opening[-1][0])
+            continue
+
+        row = _split_row(line)
+        if row is None:
+            # Cheque-looking line in a shape we don't recognise: let the LLM read the page
+            if CHEQUE_KEYWORD_RE.search(line) and AMOUNT_RE.search(line):
+                cheque_rows += 1
+            continue
+
+        date, candidates, amounts = row
+        new_balance = amounts[-1][0] if len(amounts) >= 2 else None
+        is_debit = layout_seen and not _is_credit(amounts, balance, new_balance)
+
+        if candidates and is_debit and CHEQUE_KEYWORD_RE.search(line):
+            cheque_rows += 1
+            cheque = _build_cheque(date, candidates, amounts, balance, new_balance)
+            if cheque is not None:
+                page.cheques.append(cheque)
+                if cheque.confidence >= BANK_PARSER_MIN_CONFIDENCE:
+                    confident_rows += 1
+        elif candidates and is_debit and amounts and not NON_CHEQUE_RE.search(line):
+            # A debit with a reference number but no cheque marker (loan EMI,
+            # bill payment, or a cheque in an unfamiliar narration): only the
+            # LLM can tell which
+            uncertain_rows += 1
+
+        if new_balance is not None:
+            balance = new_balance
+
+    page.has_layout = layout_seen
+    page.confidence = confident_rows / cheque_rows if cheque_rows else (1.0 if layout_seen else 0.0)
+    if uncertain_rows:
+        page.confidence = min(page.confidence, BANK_PARSER_MIN_CONFIDENCE / 2)
+
+    return page, layout_seen, balance
+
+
+def _is_credit(amounts, balance: Optional[float], new_balance: Optional[float]) -> bool:
+    """True when a row is a deposit (e.g. a cheque paid in), not one we issued."""
+    if not amounts:
+        return False
+    amount, marker = amounts[0]
+    if marker == "cr":
+        return True
+    if balance is not None and new_balance is not None:
+        return abs((new_balance - balance) - amount) <= 0.01
+    return False
+
+
+def _build_cheque(date: str, candidates, amounts, balance: Optional[float], new_balance: Optional[float]):
+    """
+    Build a BankCheque for a debit row, or None if it carries no amount.
+
+    Confidence is 1.0 when the debit is confirmed by the running balance
+    or an explicit Dr marker, lower when it has to be inferred.
+    """
+    if not amounts:
+        return None
+
+    cheque_number = candidates[0]
+    confidence = 1.0 if len(candidates) == 1 else 0.6
+    amount, marker = amounts[0]
+
+    if balance is not None and new_balance is not None:
+        if abs((balance - new_balance) - amount) > 0.01:
+            confidence = min(confidence, 0.5)
+    elif marker != "dr":
+        confidence = min(confidence, 0.7)
+
+    return BankCheque(
+        cheque_number=cheque_number,
+        clearing_date=date,
+        amount=amount,
+        confidence=confidence
+    )
+
+
+def parse_bank_statement(raw_text: str) -> BankStatementParse:
+    """
+    Run the rule-based parser over a whole statement.
+
+    Args:
+        raw_text: Text produced by extract_raw_text_from_pdf
+
+    Returns:
+        Per-page parse results; pages below BANK_PARSER_MIN_CONFIDENCE
+        are reported in unparsed_pages for LLM fallback
+    """
+    pages = []
+    layout_seen = False
+    balance = None
+
+    for page_number, text in split_pages(raw_text):
+        page, layout_seen, balance = _parse_page(page_number, text, layout_seen, balance)
+        pages.append(page)
+
+    result = BankStatementParse(pages=pages)
+
+    logger.info(
+        f"Bank rule parser - {len(pages) - len(result.unparsed_pages)}/{len(pages)} pages parsed, "
+        f"{len(result.cheques)} cheques"
+    )
+
+    return result
@@ -1,17 +1,43 @@
-from app.core.database import documents_collection, sessions_collection
+from app.core.database import documents_collection, sessions_collection, document_pages_collection
 from app.models.document_model import DocumentModel
-from app.core.exceptions import SessionNotFoundError, SessionValidationError, AuthorizationError
+from app.models.document_page import DocumentPageModel
+from app.core.exceptions import (
+    SessionNotFoundError,
+    AuthorizationError,
+    DocumentNotFoundError
+)
+from app.services.pdf_reader import split_pages, join_pages, has_cheque_like_content
+from dataclasses import dataclass
 from datetime import datetime
+from typing import AsyncIterator, Iterable, List, Optional
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Everything except text and extraction results, which can be large
+DOCUMENT_METADATA_FIELDS = (
+    "document_id",
+    "user_id",
+    "session_id",
+    "document_type",
+    "status",
+    "file_size",
+    "file_sha256",
+    "page_count",
+    "char_count",
+    "created_at",
+    "updated_at"
+)
+
 
 async def create_document(
     user_id: str,
     session_id: str,
     document_type: str,
-    raw_text: str
+    raw_text: str,
+    file_size: int = 0,
+    file_sha256: Optional[str] = None
 ) -> str:
     """
     Create a new document and associate it with a session.
@@ -21,6 +47,8 @@ async def create_document(
         session_id: ID of the session to associate with
         document_type: Type of document ("bank" or "company")
         raw_text: Extracted text from PDF
+        file_size: Size of the uploaded PDF in bytes
+        file_sha256: SHA-256 of the uploaded PDF
         
     Returns:
         Document ID
@@ -28,7 +56,6 @@ async def create_document(
     Raises:
         SessionNotFoundError: If session doesn't exist
         AuthorizationError: If user doesn't own the session
-        SessionValidationError: If session already has this document type
     """
     # Validate session exists and belongs to user
     session = await sessions_collection.find_one({"session_id": session_id})
@@ -38,32 +65,221 @@ async def create_document(
     if session["user_id"] != user_id:
         raise AuthorizationError("You don't have access to this session")
     
-    # Check if session already has this document type
-    field_name = f"{document_type}_document_id"
-    if session.get(field_name):
-        raise SessionValidationError(
-            f"Session already has a {document_type} document"
-        )
+    prepared = prepare_document(user_id, session_id, document_type, raw_text, file_size, file_sha256)
+    await insert_documents([prepared])
+    
+    return prepared.document["document_id"]
+
+
+@dataclass
+class PreparedDocument:
+    """A document and its page rows, ready to insert."""
+    document: dict
+    pages: List[dict]
+
+
+def prepare_document(
+    user_id: str,
+    session_id: str,
+    document_type: str,
+    raw_text: str,
+    file_size: int = 0,
+    file_sha256: Optional[str] = None,
+    document_id: Optional[str] = None
+) -> PreparedDocument:
+    """
+    Build the document and page rows for extracted text, without writing them.
+    
+    Args:
+        user_id: ID of the user creating the document
+        session_id: ID of the session the document belongs to
+        document_type: Type of document ("bank" or "company")
+        raw_text: Extracted text from PDF
+        file_size: Size of the uploaded PDF in bytes
+        file_sha256: SHA-256 of the uploaded PDF
+        document_id: Optional pre-generated document ID
+        
+    Returns:
+        PreparedDocument for insert_documents
+    """
+    pages = split_pages(raw_text)
     
-    # Create document
     document = DocumentModel(
         user_id=user_id,
         session_id=session_id,
         document_type=document_type,
-        raw_text=raw_text
+        page_count=len(pages),
+        char_count=sum(len(text) for _, text in pages),
+        file_size=file_size,
+        file_sha256=file_sha256,
+        **({"document_id": document_id} if document_id else {})
     )
     
-    # Insert into database
-    await documents_collection.insert_one(document.model_dump())
+    page_rows = [
+        DocumentPageModel(
+            document_id=document.document_id,
+            user_id=user_id,
+            session_id=session_id,
+            page_number=page_number,
+            text=text,
+            char_count=len(text),
+            has_cheque_content=has_cheque_like_content(text),
+            content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest()
+        ).model_dump()
+        for page_number, text in pages
+    ]
+    
+    return PreparedDocument(document=document.model_dump(), pages=page_rows)
+
+
+async def insert_documents(prepared: List[PreparedDocument]):
+    """
+    Insert prepared documents and all their pages.
+    
+    Uses one insert_many for the documents and one for the pages, however
+    many documents are given. Text is stored one row per page.
+    """
+    if not prepared:
+        return
+    
+    await documents_collection.insert_many([item.document for item in prepared], ordered=False)
+    
+    pages = [page for item in prepared for page in item.pages]
+    if pages:
+        await document_pages_collection.insert_many(pages, ordered=False)
+    
+    for item in prepared:
+        document = item.document
+        logger.info(
+            f"Created {document['document_type']} document {document['document_id']} "
+            f"({len(item.pages)} pages) for session {document['session_id']}"
+        )
+
+
+async def delete_documents(document_ids: List[str]):
+    """Delete documents and their pages."""
+    await documents_collection.delete_many({"document_id": {"$in": document_ids}})
+    await document_pages_collection.delete_many({"document_id": {"$in": document_ids}})
+
+
+async def get_document(document_id: str, fields: Optional[Iterable[str]] = None) -> Optional[dict]:
+    """
+    Get document by ID.
+    
+    Args:
+        document_id: Document ID
+        fields: Optional fields to load; by default the whole document,
+            including any legacy raw_text, structured_data and tally_result
+        
+    Returns:
+        Document (document_id is always included), or None
+    """
+    projection = None
+    if fields is not None:
+        projection = {"_id": 0, "document_id": 1, **{field: 1 for field in fields}}
+    
+    return await documents_collection.find_one({"document_id": document_id}, projection)
+
+
+async def get_document_metadata(document_id: str, user_id: Optional[str] = None) -> dict:
+    """
+    Get a document's metadata without its text or extraction results.
+    
+    Args:
+        document_id: Document ID
+        user_id: Optional user ID to validate ownership
+        
+    Returns:
+        Document with DOCUMENT_METADATA_FIELDS only
+        
+    Raises:
+        DocumentNotFoundError: If document doesn't exist
+        AuthorizationError: If user doesn't own the document
+    """
+    document = await get_document(document_id, DOCUMENT_METADATA_FIELDS)
+    
+    if not document:
+        raise DocumentNotFoundError(document_id)
+    
+    if user_id and document["user_id"] != user_id:
+        raise AuthorizationError("You don't have access to this document")
+    
+    return document
+
+
+def _page_filter(document_id: str, page_numbers: Optional[Iterable[int]]) -> dict:
+    query = {"document_id": document_id}
+    if page_numbers is not None:
+        query["page_number"] = {"$in": list(page_numbers)}
+    return query
+
+
+async def iter_document_pages(
+    document_id: str,
+    page_numbers: Optional[Iterable[int]] = None,
+    cheque_pages_only: bool = False,
+    include_text: bool = True
+) -> AsyncIterator[dict]:
+    """
+    Stream a document's pages in page order.
+    
+    Args:
+        document_id: Document ID
+        page_numbers: Optional subset of page numbers to load
+        cheque_pages_only: Skip pages without cheque-like content. The
+            check is re-run on the page text rather than trusting the
+            has_cheque_content flag stored at upload, so pages flagged by
+            an older, stricter heuristic are not lost
+        include_text: Set False to load page metadata only (ignored with
+            cheque_pages_only, which needs the text)
+        
+    Yields:
+        Page documents
+    """
+    projection = {"_id": 0}
+    if not include_text and not cheque_pages_only:
+        projection["text"] = 0
     
-    logger.info(f"Created {document_type} document {document.document_id} for session {session_id}")
+    cursor = document_pages_collection.find(
+        _page_filter(document_id, page_numbers),
+        projection
+    ).sort("page_number", 1)
     
-    return document.document_id
+    async for page in cursor:
+        if cheque_pages_only and not has_cheque_like_content(page["text"]):
+            continue
+        if not include_text:
+            page.pop("text", None)
+        yield page
 
 
-async def get_document(document_id: str):
-    """Get document by ID."""
-    return await documents_collection.find_one({"document_id": document_id})
+async def get_document_text(
+    document: dict,
+    page_numbers: Optional[Iterable[int]] = None,
+    cheque_pages_only: bool = False
+) -> str:
+    """
+    Get a document's text in the extract_raw_text_from_pdf page format.
+    
+    Loads only the requested pages. Documents created before page-level
+    storage fall back to their inline raw_text.
+    
+    Args:
+        document: Document (must include document_id; raw_text for legacy documents)
+        page_numbers: Optional subset of page numbers to load
+        cheque_pages_only: Skip pages without cheque-like content
+        
+    Returns:
+        Document text
+    """
+    if document.get("raw_text") is not None:
+        return document["raw_text"]
+    
+    pages: List[tuple] = []
+    async for page in iter_document_pages(document["document_id"], page_numbers, cheque_pages_only):
+        pages.append((page["page_number"], page["text"]))
+    
+    return join_pages(pages)
 
 
 async def update_document(document_id: str, update_data: dict):
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Optional
+import hashlib
+import logging
+from pymongo import ASCENDING
+from app.core.database import extraction_cache_collection
+from app.core.config import EXTRACTION_CACHE_ENABLED, EXTRACTION_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+
+def build_cache_key(raw_text: str, document_type: str, prompt_version: str, model: str) -> str:
+    """
+    Build a content-addressed cache key for an extraction.
+
+    Args:
+        raw_text: Document text sent to the extractor
+        document_type: Type of document ("bank" or "company")
+        prompt_version: Version of the extraction prompt
+        model: Name of the LLM model
+
+    Returns:
+        Hex SHA-256 key
+    """
+    text_hash = hashlib.sha256(raw_text.encode("utf-8")).hexdigest()
+    key_source = f"{text_hash}:{document_type}:{prompt_version}:{model}"
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+async def get_cached_extraction(cache_key: str) -> Optional[dict]:
+    """
+    Get a cached extraction result and refresh its last access time.
+
+    Args:
+        cache_key: Key from build_cache_key
+
+    Returns:
+        Cached structured data, or None on a miss
+    """
+    if not EXTRACTION_CACHE_ENABLED:
+        return None
+
+    try:
+        entry = await extraction_cache_collection.find_one_and_update(
+            {"cache_key": cache_key},
+            {
+                "$set": {"last_accessed_at": datetime.utcnow()},
+                "$inc": {"hits": 1}
+            },
+            projection={"structured_data": 1}
+        )
+    except Exception as e:
+        logger.warning(f"Extraction cache lookup failed: {str(e)}")
+        return None
+
+    if entry is None:
+        return None
+
+    logger.info(f"Extraction cache hit {cache_key[:12]}")
+    return entry["structured_data"]
+
+
+async def store_cached_extraction(cache_key: str, document_type: str, structured_data: dict):
+    """
+    Store an extraction result, evicting least recently used entries when full.
+
+    Entries also expire through the TTL index on last_accessed_at
+    created by init_db.py.
+
+    Args:
+        cache_key: Key from build_cache_key
+        document_type: Type of document ("bank" or "company")
+        structured_data: Extracted data to cache
+    """
+    if not EXTRACTION_CACHE_ENABLED:
+        return
+
+    now = datetime.utcnow()
+
+    try:
+        await extraction_cache_collection.update_one(
+            {"cache_key": cache_key},
+            {
+                "$set": {
+                    "document_type": document_type,
+                    "structured_data": structured_data,
+                    "last_accessed_at": now
+                },
+                "$setOnInsert": {"created_at": now, "hits": 0}
+            },
+            upsert=True
+        )
+
+        overflow = await extraction_cache_collection.estimated_document_count() - EXTRACTION_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            cursor = extraction_cache_collection.find(
+                {}, projection={"_id": 1}
+            ).sort("last_accessed_at", ASCENDING).limit(overflow)
+            stale_ids = [entry["_id"] async for entry in cursor]
+            await extraction_cache_collection.delete_many({"_id": {"$in": stale_ids}})
+            logger.info(f"Extraction cache evicted {len(stale_ids)} entries")
+
+    except Exception as e:
+        logger.warning(f"Extraction cache store failed: {str(e)}")
@@ -1,12 +1,41 @@
+import asyncio
+import hashlib
 import os
+from dataclasses import dataclass
 from fastapi import UploadFile
-from app.core.config import UPLOAD_DIR
+from app.core.config import UPLOAD_DIR, MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE
 import uuid
 
 ALLOWED_EXTENSIONS = {".pdf"}
 
 
-def save_pdf(file: UploadFile) -> str:
+@dataclass
+class SavedPdf:
+    """A PDF written to upload storage."""
+    path: str
+    sha256: str
+    size: int
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+async def save_pdf(file: UploadFile) -> SavedPdf:
+    """
+    Stream an uploaded PDF to disk.
+
+    The upload is copied in UPLOAD_CHUNK_SIZE pieces, so memory stays flat
+    regardless of file size, and all disk I/O runs in worker threads.
+    Data goes to a temporary file that is renamed into place only once
+    the whole upload has been written.
+
+    Raises:
+        ValueError: If the file is not a PDF or exceeds MAX_UPLOAD_BYTES
+    """
     _, ext = os.path.splitext(file.filename.lower())
 
     if ext not in ALLOWED_EXTENSIONS:
@@ -16,10 +45,35 @@ def save_pdf(file: UploadFile) -> str:
 
     unique_name = f"{uuid.uuid4()}.pdf"
     file_path = os.path.join(UPLOAD_DIR, unique_name)
+    temp_path = f"{file_path}.part"
+
+    await file.seek(0)
+
+    digest = hashlib.sha256()
+    size = 0
+    out = await asyncio.to_thread(open, temp_path, "wb")
+
+    try:
+        while True:
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+
+            size += len(chunk)
+            if size > MAX_UPLOAD_BYTES:
+                raise ValueError(
+                    f"File exceeds the maximum upload size of {MAX_UPLOAD_BYTES // (1024 * 1024)} MB"
+                )
+
+            digest.update(chunk)
+            await asyncio.to_thread(out.write, chunk)
 
-    file.file.seek(0)
+        await asyncio.to_thread(out.close)
+        await asyncio.to_thread(os.replace, temp_path, file_path)
 
-    with open(file_path, "wb") as f:
-        f.write(file.file.read())
+    except BaseException:
+        await asyncio.to_thread(out.close)
+        await asyncio.to_thread(_remove_quietly, temp_path)
+        raise
 
-    return file_path
+    return SavedPdf(path=file_path, sha256=digest.hexdigest(), size=size)
@@ -0,0 +1,444 @@
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from uuid import uuid4
+import asyncio
+import itertools
+import logging
+from fastapi import HTTPException
+from pymongo import ReturnDocument
+from app.core.config import (
+    TALLY_WORKERS,
+    TALLY_JOB_HEARTBEAT_SECONDS,
+    TALLY_JOB_STALE_SECONDS,
+    TALLY_JOB_SWEEP_SECONDS,
+    BULK_TALLY_MAX_SESSIONS
+)
+from app.core.database import jobs_collection, documents_collection
+from app.core.exceptions import JobNotFoundError, AuthorizationError, SessionValidationError
+from app.models.job import TallyJobModel
+from app.services.session_service import get_session_by_id, find_user_sessions
+from app.services.tally_service import run_tally
+
+logger = logging.getLogger(__name__)
+
+
+async def create_tally_job(session_id: str, user_id: str) -> TallyJobModel:
+    """
+    Create a queued tally job for a session.
+
+    Args:
+        session_id: Session ID to tally
+        user_id: Owner of the session
+
+    Returns:
+        Created job model
+
+    Raises:
+        SessionNotFoundError: If session doesn't exist
+        AuthorizationError: If user doesn't own the session
+    """
+    await get_session_by_id(session_id, user_id)
+
+    job = TallyJobModel(user_id=user_id, session_id=session_id)
+    await jobs_collection.insert_one(job.model_dump())
+
+    logger.info(f"Queued tally job {job.job_id} for session {session_id}")
+
+    return job
+
+
+async def get_tally_job(job_id: str, user_id: Optional[str] = None) -> dict:
+    """
+    Get a tally job by ID with optional user validation.
+
+    Args:
+        job_id: Job ID
+        user_id: Optional user ID to validate ownership
+
+    Returns:
+        Job document
+
+    Raises:
+        JobNotFoundError: If job doesn't exist
+        AuthorizationError: If user doesn't own the job
+    """
+    job = await jobs_collection.find_one({"job_id": job_id})
+
+    if not job:
+        raise JobNotFoundError(job_id)
+
+    if user_id and job["user_id"] != user_id:
+        raise AuthorizationError("You don't have access to this job")
+
+    return job
+
+
+async def _session_page_counts(session_ids: List[str]) -> Dict[str, int]:
+    """Total pages across each session's documents, in one aggregation."""
+    cursor = documents_collection.aggregate([
+        {"$match": {"session_id": {"$in": session_ids}}},
+        {"$group": {"_id": "$session_id", "pages": {"$sum": {"$ifNull": ["$page_count", 0]}}}}
+    ])
+    return {row["_id"]: row["pages"] async for row in cursor}
+
+
+async def create_bulk_tally(
+    user_id: str,
+    session_ids: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None
+) -> dict:
+    """
+    Queue one tally job per matching session, smallest sessions first.
+
+    Each job's priority is its session's page count, so a worker pool
+    drains small sessions before large ones and most of a batch finishes
+    early. Jobs are ordinary tally jobs tagged with a shared bulk_id:
+    every finished session is persisted as it completes, and a restarted
+    pool picks up whatever is still queued, so a batch survives restarts.
+
+    Args:
+        user_id: Owner of the sessions
+        session_ids: Sessions to tally
+        statuses: Tally every session in one of these statuses (used
+            when session_ids is not given)
+
+    Returns:
+        Dict with bulk_id, the queued jobs (job_id, session_id, priority)
+        in run order, and skipped sessions with the reason
+
+    Raises:
+        SessionValidationError: If neither sessions nor statuses are
+            given, or more than BULK_TALLY_MAX_SESSIONS sessions match
+    """
+    if not session_ids and not statuses:
+        raise SessionValidationError("Provide session IDs or a status filter")
+
+    sessions = await find_user_sessions(
+        user_id,
+        session_ids=session_ids,
+        statuses=None if session_ids else statuses,
+        limit=BULK_TALLY_MAX_SESSIONS + 1
+    )
+    if len(sessions) > BULK_TALLY_MAX_SESSIONS:
+        raise SessionValidationError(f"At most {BULK_TALLY_MAX_SESSIONS} sessions can be tallied at once")
+
+    skipped = []
+    found = {session["session_id"] for session in sessions}
+    for session_id in dict.fromkeys(session_ids or []):
+        if session_id not in found:
+            skipped.append({"session_id": session_id, "error": f"Session {session_id} not found"})
+
+    ready = []
+    for session in sessions:
+        if session["company_document_ids"] and session["bank_document_ids"]:
+            ready.append(session["session_id"])
+        else:
+            skipped.append({
+                "session_id": session["session_id"],
+                "error": "Session must have both company and bank documents uploaded"
+            })
+
+    pages = await _session_page_counts(ready) if ready else {}
+    ready.sort(key=lambda session_id: pages.get(session_id, 0))
+
+    bulk_id = str(uuid4())
+    jobs = [
+        TallyJobModel(user_id=user_id, session_id=session_id, bulk_id=bulk_id, priority=pages.get(session_id, 0))
+        for session_id in ready
+    ]
+    if jobs:
+        await jobs_collection.insert_many([job.model_dump() for job in jobs])
+
+    logger.info(f"Queued bulk tally {bulk_id}: {len(jobs)} sessions, {len(skipped)} skipped")
+
+    return {
+        "bulk_id": bulk_id,
+        "jobs": [
+            {"job_id": job.job_id, "session_id": job.session_id, "priority": job.priority}
+            for job in jobs
+        ],
+        "skipped": skipped
+    }
+
+
+async def get_bulk_tally(bulk_id: str, user_id: Optional[str] = None) -> dict:
+    """
+    Progress of a bulk tally, aggregated from its jobs.
+
+    Overall progress weights each session's progress by its page count,
+    which tracks remaining work better than a plain session count.
+
+    Args:
+        bulk_id: Bulk ID returned by create_bulk_tally
+        user_id: Optional user ID to validate ownership
+
+    Returns:
+        Dict with per-status counts, overall progress and one entry per
+        job (without results), in run order
+
+    Raises:
+        JobNotFoundError: If no job belongs to the bulk tally
+        AuthorizationError: If user doesn't own the bulk tally
+    """
+    cursor = jobs_collection.find(
+        {"bulk_id": bulk_id},
+        {"_id": 0, "result": 0}
+    ).sort([("priority", 1), ("created_at", 1)])
+    jobs = await cursor.to_list(length=None)
+
+    if not jobs:
+        raise JobNotFoundError(bulk_id)
+
+    if user_id and jobs[0]["user_id"] != user_id:
+        raise AuthorizationError("You don't have access to this bulk tally")
+
+    counts = {status: 0 for status in ("queued", "running", "completed", "failed")}
+    for job in jobs:
+        counts[job["status"]] += 1
+
+    # +1 so sessions with no recorded pages still count
+    weights = [job["priority"] + 1 for job in jobs]
+    done = sum(
+        weight * (100 if job["status"] in ("completed", "failed") else job["progress"])
+        for weight, job in zip(weights, jobs)
+    )
+
+    return {
+        "bulk_id": bulk_id,
+        "total": len(jobs),
+        **counts,
+        "progress": int(done / sum(weights)),
+        "jobs": jobs
+    }
+
+
+# Fields reset when a running job goes back to the queue
+REQUEUE_FIELDS = {"status": "queued", "stage": "queued", "progress": 0, "started_at": None}
+
+
+def _stale_running_filter() -> dict:
+    """Running jobs whose runner stopped heartbeating."""
+    stale_before = datetime.utcnow() - timedelta(seconds=TALLY_JOB_STALE_SECONDS)
+    return {"status": "running", "updated_at": {"$lt": stale_before}}
+
+
+async def requeue_bulk_tally(bulk_id: str, retry_failed: bool = False) -> List[dict]:
+    """
+    Put a bulk tally's unfinished jobs back in the queue, e.g. after the
+    process running it was stopped. Completed sessions are not redone, and
+    running jobs are only taken over once they stop heartbeating (see
+    requeue_stale_jobs), so a session a live worker is tallying is never
+    run twice.
+
+    Args:
+        bulk_id: Bulk ID returned by create_bulk_tally
+        retry_failed: Also retry sessions whose tally failed
+
+    Returns:
+        Requeued jobs (job_id, session_id, priority), in run order
+    """
+    statuses = ["queued"] + (["failed"] if retry_failed else [])
+    await jobs_collection.update_many(
+        {"bulk_id": bulk_id, "$or": [{"status": {"$in": statuses}}, _stale_running_filter()]},
+        {"$set": {**REQUEUE_FIELDS, "error": None, "updated_at": datetime.utcnow()}}
+    )
+
+    cursor = jobs_collection.find(
+        {"bulk_id": bulk_id, "status": "queued"},
+        {"_id": 0, "job_id": 1, "session_id": 1, "priority": 1}
+    ).sort([("priority", 1), ("created_at", 1)])
+
+    return await cursor.to_list(length=None)
+
+
+async def _update_job(job_id: str, update_data: dict):
+    update_data["updated_at"] = datetime.utcnow()
+    await jobs_collection.update_one({"job_id": job_id}, {"$set": update_data})
+
+
+async def _heartbeat(job_id: str):
+    """Touch a running job's updated_at so the stale sweep leaves it alone."""
+    while True:
+        await asyncio.sleep(TALLY_JOB_HEARTBEAT_SECONDS)
+        await jobs_collection.update_one(
+            {"job_id": job_id, "status": "running"},
+            {"$set": {"updated_at": datetime.utcnow()}}
+        )
+
+
+async def requeue_stale_jobs() -> List[dict]:
+    """
+    Put running jobs whose runner stopped heartbeating back in the queue.
+
+    Each job is reset with its own conditional update, so when several
+    nodes sweep at once every stale job is requeued by exactly one.
+
+    Returns:
+        Requeued jobs (job_id, priority)
+    """
+    stale_filter = _stale_running_filter()
+
+    requeued = []
+    async for job in jobs_collection.find(stale_filter, {"_id": 0, "job_id": 1}):
+        job = await jobs_collection.find_one_and_update(
+            {"job_id": job["job_id"], **stale_filter},
+            {"$set": {**REQUEUE_FIELDS, "updated_at": datetime.utcnow()}},
+            projection={"_id": 0, "job_id": 1, "priority": 1}
+        )
+        if job is not None:
+            requeued.append(job)
+
+    if requeued:
+        logger.warning(f"Requeued {len(requeued)} stale tally jobs")
+
+    return requeued
+
+
+async def execute_tally_job(job_id: str):
+    """
+    Claim and run a queued tally job, recording progress and outcome.
+
+    The claim is an atomic queued -> running transition, so a job is
+    only executed once even when several nodes share the queue. While it
+    runs the job heartbeats; if the worker is cancelled (e.g. on
+    shutdown) the job is put back in the queue rather than left running.
+    """
+    job = await jobs_collection.find_one_and_update(
+        {"job_id": job_id, "status": "queued"},
+        {"$set": {
+            "status": "running",
+            "stage": "starting",
+            "started_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }},
+        return_document=ReturnDocument.AFTER
+    )
+
+    if job is None:
+        logger.info(f"Tally job {job_id} already claimed, skipping")
+        return
+
+    async def progress(stage: str, percent: int, data: Optional[dict] = None):
+        await _update_job(job_id, {"stage": stage, "progress": percent})
+
+    heartbeat = asyncio.create_task(_heartbeat(job_id))
+
+    try:
+        result = await run_tally(job["session_id"], job["user_id"], progress)
+        # Only the summary: per-cheque outcomes are queried from tally_results
+        await _update_job(job_id, {
+            "status": "completed",
+            "stage": "completed",
+            "progress": 100,
+            "result": {
+                "session_id": result["session_id"],
+                "mode": result["mode"],
+                "summary": result["tally_result"]["summary"]
+            },
+            "finished_at": datetime.utcnow()
+        })
+        logger.info(f"Tally job {job_id} completed")
+
+    except asyncio.CancelledError:
+        logger.warning(f"Tally job {job_id} interrupted, returning it to the queue")
+        await jobs_collection.update_one(
+            {"job_id": job_id, "status": "running"},
+            {"$set": {**REQUEUE_FIELDS, "updated_at": datetime.utcnow()}}
+        )
+        raise
+
+    except Exception as e:
+        error = e.detail if isinstance(e, HTTPException) else str(e)
+        logger.error(f"Tally job {job_id} failed: {error}")
+        await _update_job(job_id, {
+            "status": "failed",
+            "error": error,
+            "finished_at": datetime.utcnow()
+        })
+
+    finally:
+        heartbeat.cancel()
+
+
+class TallyWorkerPool:
+    """
+    Bounded in-process pool that executes queued tally jobs.
+
+    At most `workers` tallies run at once on this node, which also caps
+    the LLM work a node can have in flight; the tallies share the
+    process-wide llm_gateway concurrency and rate budget. Jobs run in
+    priority order (lowest first), then in submission order.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(1, workers)
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self, requeue: bool = True):
+        """
+        Start the workers.
+
+        Args:
+            requeue: Also re-queue jobs left behind by a previous process,
+                and keep sweeping for jobs whose runner stops heartbeating
+        """
+        self._tasks = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.workers)
+        ]
+
+        if not requeue:
+            return
+
+        await requeue_stale_jobs()
+
+        cursor = jobs_collection.find(
+            {"status": "queued"},
+            {"job_id": 1, "priority": 1}
+        ).sort([("priority", 1), ("created_at", 1)])
+        async for job in cursor:
+            self._queue.put_nowait((job.get("priority", 0), next(self._sequence), job["job_id"]))
+
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+        logger.info(f"Tally worker pool started with {self.workers} workers, {self._queue.qsize()} queued jobs")
+
+    async def stop(self):
+        """Cancel the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, job_id: str, priority: int = 0):
+        """Queue a job for execution."""
+        await self._queue.put((priority, next(self._sequence), job_id))
+
+    async def join(self):
+        """Wait until every submitted job has been processed."""
+        await self._queue.join()
+
+    async def _worker(self, index: int):
+        while True:
+            _, _, job_id = await self._queue.get()
+            try:
+                await execute_tally_job(job_id)
+            except Exception as e:
+                logger.error(f"Tally worker {index} error on job {job_id}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    async def _sweep(self):
+        """Periodically re-queue jobs whose runner died on any node."""
+        while True:
+            await asyncio.sleep(TALLY_JOB_SWEEP_SECONDS)
+            try:
+                for job in await requeue_stale_jobs():
+                    await self.submit(job["job_id"], job.get("priority", 0))
+            except Exception as e:
+                logger.error(f"Tally job sweep failed: {str(e)}")
+
+
+tally_worker_pool = TallyWorkerPool(TALLY_WORKERS)
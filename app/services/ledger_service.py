@@ -0,0 +1,303 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+import logging
+import numpy as np
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.core.config import TALLY_AMOUNT_TOLERANCE, TALLY_DATE_WINDOW_DAYS
+from app.core.database import outstanding_cheques_collection
+from app.services.tally_engine import normalize_cheque_number, parse_date_ordinal
+
+logger = logging.getLogger(__name__)
+
+# One ledger entry per (user_id, cheque_key, amount, session_id), so the
+# same cheque number and amount issued in two sessions stays two entries.
+# An entry stays "outstanding" until a statement in another session
+# clears it.
+LEDGER_MATCH_FIELDS = {
+    "_id": 0,
+    "cheque_key": 1,
+    "amount": 1,
+    "cheque_number": 1,
+    "payee_name": 1,
+    "issue_date": 1,
+    "session_id": 1
+}
+
+
+def _ledger_key(row: dict) -> dict:
+    return {
+        "cheque_key": normalize_cheque_number(row.get("cheque_number")),
+        "amount": round(float(row.get("amount") or 0.0), 2)
+    }
+
+
+def _within_window(issue_date, clearing_date) -> bool:
+    """Same date rule as match_columns: unparseable dates never block a match."""
+    if not TALLY_DATE_WINDOW_DAYS:
+        return True
+    delta = parse_date_ordinal(clearing_date) - parse_date_ordinal(issue_date)
+    return bool(np.isnan(delta)) or 0 <= delta <= TALLY_DATE_WINDOW_DAYS
+
+
+async def clear_outstanding(
+    user_id: str,
+    session_id: str,
+    bank_rows: List[dict],
+    already_cleared: Optional[List[dict]] = None
+) -> Tuple[List[dict], List[int]]:
+    """
+    Clear outstanding cheques from earlier sessions against bank rows.
+
+    All candidate entries are fetched in one query on the
+    (user_id, cheque_key) index prefix, so each bank row costs an index
+    seek rather than a re-tally of the session that issued the cheque.
+    A row clears an entry when the amounts agree within
+    TALLY_AMOUNT_TOLERANCE and the clearing date falls in the tally date
+    window; when several sessions issued a matching cheque, the oldest
+    entry is cleared first.
+
+    Args:
+        user_id: Owner of the ledger
+        session_id: Session whose statement the bank rows come from
+        bank_rows: Bank rows no cheque in the session matched
+        already_cleared: cleared_from_ledger rows the tally already
+            carries (an incremental tally keeps the earlier ones); their
+            entries are not cleared a second time
+
+    Returns:
+        (one row per cleared cheque with the issuing session, the position
+        in bank_rows of the row that cleared each)
+    """
+    keys = {normalize_cheque_number(row.get("cheque_number")) for row in bank_rows} - {""}
+    if not keys:
+        return [], []
+
+    skip = {
+        (row["issued_session_id"], normalize_cheque_number(row.get("cheque_number")), row["amount"])
+        for row in already_cleared or []
+    }
+
+    entries: Dict[str, List[dict]] = defaultdict(list)
+    # Entries this session cleared before stay eligible, so a full re-tally reports them again
+    clearable = {"$or": [{"status": "outstanding"}, {"cleared_session_id": session_id}]}
+    cursor = outstanding_cheques_collection.find(
+        {
+            "user_id": user_id,
+            "cheque_key": {"$in": list(keys)},
+            "session_id": {"$ne": session_id},
+            **clearable
+        },
+        LEDGER_MATCH_FIELDS
+    ).sort("created_at", 1)
+    async for entry in cursor:
+        if (entry["session_id"], entry["cheque_key"], entry["amount"]) not in skip:
+            entries[entry["cheque_key"]].append(entry)
+
+    now = datetime.utcnow()
+    cleared = []
+    consumed = []
+    operations = []
+
+    for position, row in enumerate(bank_rows):
+        key = normalize_cheque_number(row.get("cheque_number"))
+        amount = float(row.get("amount") or 0.0)
+
+        for entry in entries.get(key, []):
+            if abs(entry["amount"] - amount) > TALLY_AMOUNT_TOLERANCE:
+                continue
+            if not _within_window(entry.get("issue_date"), row.get("clearing_date")):
+                continue
+
+            entries[key].remove(entry)
+            operations.append(UpdateOne(
+                {
+                    "user_id": user_id,
+                    "cheque_key": key,
+                    "amount": entry["amount"],
+                    "session_id": entry["session_id"],
+                    **clearable
+                },
+                {"$set": {
+                    "status": "cleared",
+                    "cleared_session_id": session_id,
+                    "clearing_date": row.get("clearing_date"),
+                    "cleared_amount": row.get("amount"),
+                    "updated_at": now
+                }}
+            ))
+            cleared.append({
+                "cheque_number": entry.get("cheque_number"),
+                "payee_name": entry.get("payee_name"),
+                "amount": entry["amount"],
+                "issue_date": entry.get("issue_date"),
+                "clearing_date": row.get("clearing_date"),
+                "bank_amount": row.get("amount"),
+                "issued_session_id": entry["session_id"]
+            })
+            consumed.append(position)
+            break
+
+    if operations:
+        result = await outstanding_cheques_collection.bulk_write(operations, ordered=False)
+        if result.modified_count < len(operations):
+            logger.warning(
+                f"Ledger: {len(operations) - result.modified_count} cheques were cleared concurrently"
+            )
+
+    return cleared, consumed
+
+
+async def cleared_elsewhere(user_id: str, session_id: str) -> Dict[tuple, dict]:
+    """
+    Ledger entries of a session that a statement in another session cleared.
+
+    Returns:
+        Mapping of (cheque_key, amount) -> entry
+    """
+    cursor = outstanding_cheques_collection.find(
+        {
+            "user_id": user_id,
+            "session_id": session_id,
+            "status": "cleared",
+            "cleared_session_id": {"$ne": session_id}
+        },
+        {"_id": 0, "cheque_key": 1, "amount": 1, "cleared_session_id": 1, "clearing_date": 1, "cleared_amount": 1}
+    )
+    return {(entry["cheque_key"], entry["amount"]): entry async for entry in cursor}
+
+
+async def record_tally(user_id: str, session_id: str, tally_result: dict) -> int:
+    """
+    Carry a tally's pending cheques into the ledger.
+
+    Pending cheques are upserted, so re-tallying a session does not add
+    them twice and never reopens an entry a later statement cleared.
+    Cheques the tally cashed are closed if an earlier tally of the same
+    session had left them outstanding. Everything goes out in one
+    unordered bulk_write.
+
+    Args:
+        user_id: Owner of the ledger
+        session_id: Session that was tallied
+        tally_result: Result of the tally
+
+    Returns:
+        Number of ledger entries written
+    """
+    now = datetime.utcnow()
+    operations = []
+
+    for row in tally_result.get("pending", []):
+        key = _ledger_key(row)
+        if not key["cheque_key"]:
+            continue
+
+        operations.append(UpdateOne(
+            {"user_id": user_id, "session_id": session_id, **key},
+            {
+                "$set": {
+                    "cheque_number": row.get("cheque_number"),
+                    "payee_name": row.get("payee_name"),
+                    "issue_date": row.get("issue_date"),
+                    "updated_at": now
+                },
+                "$setOnInsert": {
+                    "status": "outstanding",
+                    "created_at": now
+                }
+            },
+            upsert=True
+        ))
+
+    for row in tally_result.get("cashed", []):
+        key = _ledger_key(row)
+        if not key["cheque_key"]:
+            continue
+
+        operations.append(UpdateOne(
+            {"user_id": user_id, "session_id": session_id, "status": "outstanding", **key},
+            {"$set": {
+                "status": "cleared",
+                "cleared_session_id": session_id,
+                "clearing_date": row.get("clearing_date"),
+                "cleared_amount": row.get("amount"),
+                "updated_at": now
+            }}
+        ))
+
+    if not operations:
+        return 0
+
+    try:
+        result = await outstanding_cheques_collection.bulk_write(operations, ordered=False)
+    except BulkWriteError as e:
+        # A concurrent tally of this session inserted the same cheque first; its entry stands
+        logger.warning(f"Ledger write for session {session_id} partly failed: {e.details.get('writeErrors', [])[:1]}")
+        return e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+
+    return result.upserted_count + result.modified_count
+
+
+async def forget_session(user_id: str, session_id: str):
+    """
+    Remove a deleted session from the ledger.
+
+    Its own entries are deleted, so they can no longer be cleared by a
+    later statement, and entries of other sessions that its statement
+    cleared are reopened.
+
+    Args:
+        user_id: Owner of the ledger
+        session_id: Session being deleted
+    """
+    deleted = await outstanding_cheques_collection.delete_many({"user_id": user_id, "session_id": session_id})
+    reopened = await outstanding_cheques_collection.update_many(
+        {"user_id": user_id, "cleared_session_id": session_id},
+        {
+            "$set": {"status": "outstanding", "updated_at": datetime.utcnow()},
+            "$unset": {"cleared_session_id": "", "clearing_date": "", "cleared_amount": ""}
+        }
+    )
+
+    logger.info(
+        f"Ledger: removed {deleted.deleted_count} entries of session {session_id}, "
+        f"reopened {reopened.modified_count} it had cleared"
+    )
+
+
+async def reconcile_with_ledger(user_id: str, session_id: str, tally_result: dict) -> dict:
+    """
+    Clear earlier sessions' outstanding cheques against this tally's
+    unmatched bank rows, then carry its own pending cheques forward.
+
+    Cleared cheques are appended to tally_result["cleared_from_ledger"],
+    and exactly the bank rows that cleared them are dropped from
+    tally_result["unmatched_bank"].
+
+    Args:
+        user_id: Owner of the session
+        session_id: Session that was tallied
+        tally_result: Result of the tally, updated in place
+
+    Returns:
+        The updated tally result
+    """
+    unmatched_bank = tally_result.get("unmatched_bank", [])
+    cleared, consumed = await clear_outstanding(
+        user_id, session_id, unmatched_bank, tally_result.get("cleared_from_ledger")
+    )
+
+    if cleared:
+        consumed = set(consumed)
+        tally_result["unmatched_bank"] = [
+            row for position, row in enumerate(unmatched_bank) if position not in consumed
+        ]
+        logger.info(f"Ledger: {len(cleared)} cheques from earlier sessions cleared by session {session_id}")
+
+    tally_result["cleared_from_ledger"] = tally_result.get("cleared_from_ledger", []) + cleared
+
+    await record_tally(user_id, session_id, tally_result)
+
+    return tally_result
@@ -0,0 +1,205 @@
+"""
+Chat model providers selected by LLM_PROVIDER.
+
+- groq: Groq-hosted model (production default)
+- openai_compatible: any OpenAI-compatible endpoint at LLM_BASE_URL, e.g.
+  a local vLLM/llama.cpp server or benchmarks/replay_server.py
+- replay: serves recorded responses keyed by prompt hash, with
+  configurable synthetic latency; never touches the network
+- record: wraps LLM_RECORD_PROVIDER and saves every response for replay
+"""
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from app.core.config import (
+    LLM_MODEL,
+    LLM_MAX_TOKENS,
+    LLM_BASE_URL,
+    LLM_RECORD_PROVIDER,
+    LLM_REPLAY_DIR,
+    LLM_REPLAY_LATENCY_MS,
+    LLM_REPLAY_JITTER_MS,
+    LLM_HTTP_MAX_CONNECTIONS
+)
+
+logger = logging.getLogger(__name__)
+
+ProviderFactory = Callable[[], BaseChatModel]
+
+_providers: Dict[str, ProviderFactory] = {}
+
+
+class ReplayMissError(LookupError):
+    """Raised when the replay provider has no recording for a prompt."""
+
+
+def register_provider(name: str, factory: ProviderFactory):
+    """Register a chat model factory under a provider name."""
+    _providers[name] = factory
+
+
+def create_chat_model(name: str) -> BaseChatModel:
+    """
+    Create a chat model for a registered provider.
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    if name not in _providers:
+        raise ValueError(f"Unknown LLM provider '{name}'. Available: {', '.join(sorted(_providers))}")
+    return _providers[name]()
+
+
+def _http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=LLM_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_HTTP_MAX_CONNECTIONS
+    )
+
+
+def _create_groq() -> BaseChatModel:
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(
+        model=LLM_MODEL,
+        api_key=os.getenv("GROQ_API_KEY"),
+        temperature=0.0,
+        max_tokens=LLM_MAX_TOKENS,
+        max_retries=0,
+        http_client=httpx.Client(limits=_http_limits()),
+        http_async_client=httpx.AsyncClient(limits=_http_limits())
+    )
+
+
+def _create_openai_compatible() -> BaseChatModel:
+    try:
+        from langchain_openai import ChatOpenAI
+    except ImportError as e:
+        raise RuntimeError("LLM_PROVIDER=openai_compatible requires the langchain-openai package") from e
+
+    return ChatOpenAI(
+        model=LLM_MODEL,
+        base_url=LLM_BASE_URL,
+        api_key=os.getenv("LLM_API_KEY", "not-needed"),
+        temperature=0.0,
+        max_tokens=LLM_MAX_TOKENS,
+        max_retries=0,
+        http_client=httpx.Client(limits=_http_limits()),
+        http_async_client=httpx.AsyncClient(limits=_http_limits())
+    )
+
+
+def prompt_hash(messages: List[BaseMessage]) -> str:
+    """Stable hash of a prompt's message roles and contents."""
+    payload = json.dumps(
+        [[message.type, message.content] for message in messages],
+        ensure_ascii=False,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """Directory of recorded responses, one JSON file per prompt hash."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, key: str) -> Optional[str]:
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return json.load(f)["response"]
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, messages: List[BaseMessage], response: str):
+        os.makedirs(self.directory, exist_ok=True)
+        record = {
+            "key": key,
+            "messages": [{"type": m.type, "content": m.content} for m in messages],
+            "response": response
+        }
+        temp_path = f"{self._path(key)}.part"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(temp_path, self._path(key))
+
+
+class ReplayChatModel(BaseChatModel):
+    """
+    Deterministic chat model that serves recorded responses.
+
+    Latency is latency_ms plus a jitter in [0, jitter_ms) that is seeded
+    from the prompt hash, so a run is reproducible end to end.
+    """
+    directory: str = LLM_REPLAY_DIR
+    latency_ms: float = LLM_REPLAY_LATENCY_MS
+    jitter_ms: float = LLM_REPLAY_JITTER_MS
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _lookup(self, messages: List[BaseMessage]):
+        key = prompt_hash(messages)
+        response = ReplayStore(self.directory).load(key)
+        if response is None:
+            raise ReplayMissError(f"No recorded response for prompt {key[:12]} in {self.directory}")
+        delay = (self.latency_ms + random.Random(key).random() * self.jitter_ms) / 1000.0
+        return response, delay
+
+    @staticmethod
+    def _result(response: str) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=response))])
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        response, delay = self._lookup(messages)
+        time.sleep(delay)
+        return self._result(response)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        response, delay = self._lookup(messages)
+        await asyncio.sleep(delay)
+        return self._result(response)
+
+
+class RecordingChatModel(BaseChatModel):
+    """Chat model wrapper that saves every response for later replay."""
+    inner: BaseChatModel
+    directory: str = LLM_REPLAY_DIR
+
+    @property
+    def _llm_type(self) -> str:
+        return f"record:{self.inner._llm_type}"
+
+    def _save(self, messages: List[BaseMessage], result: ChatResult):
+        ReplayStore(self.directory).save(prompt_hash(messages), messages, result.generations[0].message.content)
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        result = self.inner._generate(messages, stop=stop, **kwargs)
+        self._save(messages, result)
+        return result
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        result = await self.inner._agenerate(messages, stop=stop, **kwargs)
+        self._save(messages, result)
+        return result
+
+
+register_provider("groq", _create_groq)
+register_provider("openai_compatible", _create_openai_compatible)
+register_provider("replay", ReplayChatModel)
+register_provider("record", lambda: RecordingChatModel(inner=create_chat_model(LLM_RECORD_PROVIDER)))
@@ -1,19 +1,182 @@
-import os
-from dotenv import load_dotenv
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, Optional
 
-from langchain_groq import ChatGroq
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from app.core.config import (
+    LLM_PROVIDER,
+    LLM_MODEL,
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_OUTPUT_TOKEN_ESTIMATE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS
+)
+from app.services.llm_providers import create_chat_model
 
+logger = logging.getLogger(__name__)
 
-load_dotenv()
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
 
-groq_api_key = os.getenv("GROQ_API_KEY")
+_llm: Optional[BaseChatModel] = None
+_provider: str = LLM_PROVIDER
 
 
-def get_llm():
-    return ChatGroq(
-        model="openai/gpt-oss-120b", 
-        api_key=groq_api_key,    
-        temperature=0.0,            
-        max_tokens=4000,            
-        max_retries=2              
-    )
+def get_llm() -> BaseChatModel:
+    """
+    Get the process-wide chat model for the configured provider.
+
+    One client is shared by every extraction so HTTP connections are
+    pooled and kept alive. Retries are left to llm_gateway, which
+    coordinates them across concurrent tallies.
+    """
+    global _llm
+    if _llm is None:
+        _llm = create_chat_model(_provider)
+        logger.info(f"LLM provider '{_provider}' initialised ({LLM_MODEL})")
+    return _llm
+
+
+def use_provider(name: str):
+    """Switch the process-wide chat model to another registered provider."""
+    global _llm, _provider
+    _provider = name
+    _llm = None
+
+
+def llm_identity() -> str:
+    """Provider and model name, used to keep cached extractions apart."""
+    return f"{_provider}:{LLM_MODEL}"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)."""
+    return len(text) // 4 + 1
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at `per_minute` units a minute."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> float:
+        """Wait until `amount` units are available and take them. Returns seconds waited."""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+def _is_retryable(error: Exception) -> bool:
+    status_code = getattr(error, "status_code", None)
+    if status_code is not None:
+        return status_code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError)) or \
+        type(error).__name__ in ("APIConnectionError", "APITimeoutError")
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers or "retry-after" not in headers:
+        return None
+    try:
+        return float(headers["retry-after"])
+    except ValueError:
+        return None
+
+
+class LLMGateway:
+    """
+    Process-wide gate in front of every LLM call.
+
+    Caps in-flight requests with a semaphore, paces requests/min and
+    tokens/min with token buckets, and retries rate-limit and transient
+    errors with exponential backoff and full jitter.
+    """
+
+    def __init__(self):
+        self._loop = None
+        self.stats = {
+            "requests": 0,
+            "in_flight": 0,
+            "retries": 0,
+            "failures": 0,
+            "throttled_seconds": 0.0
+        }
+
+    def _ensure_primitives(self):
+        # asyncio primitives are bound to one event loop; rebuild them if the loop changed
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(max(1, LLM_MAX_CONCURRENCY))
+            self._requests = TokenBucket(LLM_REQUESTS_PER_MINUTE)
+            self._tokens = TokenBucket(LLM_TOKENS_PER_MINUTE)
+
+    async def ainvoke(self, runnable, inputs: Dict[str, Any], prompt_text: str = "") -> Any:
+        """
+        Invoke a runnable (e.g. prompt | llm | parser) through the gateway.
+
+        Args:
+            runnable: LangChain runnable to invoke
+            inputs: Input dict for the runnable
+            prompt_text: Prompt body, used to estimate tokens for the limiter
+
+        Returns:
+            The runnable's output
+        """
+        self._ensure_primitives()
+        estimated = estimate_tokens(prompt_text) + LLM_OUTPUT_TOKEN_ESTIMATE
+
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                self.stats["throttled_seconds"] += await self._requests.acquire(1)
+                self.stats["throttled_seconds"] += await self._tokens.acquire(estimated)
+
+                self.stats["requests"] += 1
+                self.stats["in_flight"] += 1
+                try:
+                    return await runnable.ainvoke(inputs)
+                except Exception as e:
+                    if not _is_retryable(e) or attempt >= LLM_MAX_RETRIES:
+                        self.stats["failures"] += 1
+                        raise
+                    error = e
+                finally:
+                    self.stats["in_flight"] -= 1
+
+            # Back off outside the semaphore so other calls can proceed
+            attempt += 1
+            self.stats["retries"] += 1
+            delay = _retry_after(error)
+            if delay is None:
+                delay = random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt))
+            logger.warning(f"LLM call failed ({type(error).__name__}), retry {attempt}/{LLM_MAX_RETRIES} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+llm_gateway = LLMGateway()
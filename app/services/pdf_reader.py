@@ -1,15 +1,33 @@
+import asyncio
+import multiprocessing
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
 import pdfplumber
+from app.core.config import PDF_EXTRACT_WORKERS, PDF_PARALLEL_MIN_PAGES
 
-def extract_raw_text_from_pdf(file_path: str) -> str:
-    """
-    Extracts raw text from a PDF.
-    No parsing, no structuring, no assumptions.
-    """
+# Matches the page markers written by extract_raw_text_from_pdf
+PAGE_MARKER_RE = re.compile(r"^--- Page (\d+) ---$", re.MULTILINE)
+
+# A cheque row carries a cheque-number-like figure next to a date or an
+# amount; amounts may be printed without paise ("15,000", "Rs 7500/-")
+_AMOUNT_RE = re.compile(r"\d[\d,]*\.\d{2}\b|\d{1,3}(?:,\d{2,3})+\b|\bRs\.?\s*\d|₹\s*\d|\d/-", re.IGNORECASE)
+_NUMBER_RE = re.compile(r"(?<![\d.,/\-])\d{4,10}(?![\d.,/\-])")
+_DATE_RE = re.compile(r"\b\d{1,2}[/\-.]\d{1,2}[/\-.]\d{2,4}\b|\b\d{1,2}[\- ]?[A-Za-z]{3}[\- ]?\d{2,4}\b")
+_CHEQUE_WORD_RE = re.compile(r"\b(CHQ|CHEQUE|CHECK|INST(?:RUMENT)?|INSTNO)\b", re.IGNORECASE)
+
+
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _extract_page_range(file_path: str, start: int, stop: Optional[int] = None) -> List[str]:
+    """Extract the "--- Page N ---" segments for pages [start, stop) (0-based)."""
 
     full_text = []
 
     with pdfplumber.open(file_path) as pdf:
-        for page_number, page in enumerate(pdf.pages, start=1):
+        for page_number, page in enumerate(pdf.pages[start:stop], start=start + 1):
             text = page.extract_text()
             if text:
                 full_text.append(
@@ -20,4 +38,121 @@ def extract_raw_text_from_pdf(file_path: str) -> str:
                     f"\n--- Page {page_number} ---\n[NO TEXT FOUND]"
                 )
 
-    return "\n".join(full_text)
+    return full_text
+
+
+def _count_pages(file_path: str) -> int:
+    with pdfplumber.open(file_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_raw_text_from_pdf(file_path: str) -> str:
+    """
+    Extracts raw text from a PDF.
+    No parsing, no structuring, no assumptions.
+    """
+
+    return "\n".join(_extract_page_range(file_path, 0))
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    if _process_pool is None:
+        # Forking a process that runs the event loop and Mongo client threads
+        # can deadlock the child; start workers from a clean interpreter
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _process_pool = ProcessPoolExecutor(
+            max_workers=max(1, PDF_EXTRACT_WORKERS),
+            mp_context=multiprocessing.get_context(start_method)
+        )
+    return _process_pool
+
+
+def shutdown_pdf_pool():
+    """Shut down the extraction process pool (called on application shutdown)."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(cancel_futures=True)
+        _process_pool = None
+
+
+def page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Split pages into at most `workers` contiguous, near-equal [start, stop) ranges."""
+    workers = max(1, min(workers, page_count))
+    size, extra = divmod(page_count, workers)
+    ranges = []
+    start = 0
+    for index in range(workers):
+        stop = start + size + (1 if index < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+async def extract_raw_text_from_pdf_async(file_path: str, workers: int = PDF_EXTRACT_WORKERS) -> str:
+    """
+    Extract raw text off the event loop, splitting large PDFs across processes.
+
+    Pages are extracted in contiguous ranges by a shared process pool and
+    re-joined in order, so the output is identical to
+    extract_raw_text_from_pdf. PDFs shorter than PDF_PARALLEL_MIN_PAGES
+    are read by a single worker.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _get_process_pool()
+
+    page_count = await loop.run_in_executor(pool, _count_pages, file_path)
+    if page_count < PDF_PARALLEL_MIN_PAGES:
+        workers = 1
+
+    segments = await asyncio.gather(*(
+        loop.run_in_executor(pool, _extract_page_range, file_path, start, stop)
+        for start, stop in page_ranges(page_count, workers)
+    ))
+
+    return "\n".join(segment for segment_list in segments for segment in segment_list)
+
+
+def split_pages(raw_text: str) -> List[Tuple[int, str]]:
+    """
+    Split text produced by extract_raw_text_from_pdf back into pages.
+
+    Returns:
+        List of (page_number, page_text) tuples. Text without any page
+        markers is returned as a single page numbered 1.
+    """
+    markers = list(PAGE_MARKER_RE.finditer(raw_text))
+
+    if not markers:
+        return [(1, raw_text.strip())] if raw_text.strip() else []
+
+    pages = []
+    for index, marker in enumerate(markers):
+        end = markers[index + 1].start() if index + 1 < len(markers) else len(raw_text)
+        pages.append((int(marker.group(1)), raw_text[marker.end():end].strip("\n")))
+
+    return pages
+
+
+def join_pages(pages: List[Tuple[int, str]]) -> str:
+    """Inverse of split_pages: rebuild text in the extract_raw_text_from_pdf format."""
+    return "\n".join(f"\n--- Page {page_number} ---\n{text}" for page_number, text in pages)
+
+
+def has_cheque_like_content(text: str) -> bool:
+    """
+    Cheap check for whether a page could hold cheque rows.
+
+    Deliberately permissive: it only rules out pages that neither mention
+    cheques, nor hold an amount and a cheque-number-like figure, nor have
+    a line with both a date and such a figure (cover pages, terms, blank
+    pages).
+    """
+    if _CHEQUE_WORD_RE.search(text):
+        return True
+    if _AMOUNT_RE.search(text) and _NUMBER_RE.search(text):
+        return True
+    return any(
+        _DATE_RE.search(line) and _NUMBER_RE.search(_DATE_RE.sub(" ", line))
+        for line in text.splitlines()
+    )
@@ -1,13 +1,36 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import base64
+import json
 import logging
-from app.core.database import sessions_collection, documents_collection
+from pymongo import ReturnDocument
+from app.core.config import SESSION_MAX_DOCUMENTS_PER_TYPE
+from app.core.database import sessions_collection, documents_collection, document_pages_collection
 from app.core.exceptions import SessionNotFoundError, SessionValidationError, AuthorizationError
 from app.models.session import SessionModel
 from app.schemas.session_schema import SessionCreate
+from app.services.document_service import PreparedDocument, prepare_document, insert_documents
+from app.services.ledger_service import forget_session
+from app.services.tally_results_service import delete_tally_results
 
 logger = logging.getLogger(__name__)
 
+# Fields returned by session listings (everything SessionResponse needs)
+SESSION_LIST_PROJECTION = {
+    "_id": 0,
+    "session_id": 1,
+    "user_id": 1,
+    "session_name": 1,
+    "company_document_ids": 1,
+    "bank_document_ids": 1,
+    "company_document_id": 1,
+    "bank_document_id": 1,
+    "status": 1,
+    "created_at": 1,
+    "updated_at": 1
+}
+
 
 async def create_session(user_id: str, session_data: SessionCreate) -> SessionModel:
     """
@@ -32,26 +55,122 @@ async def create_session(user_id: str, session_data: SessionCreate) -> SessionMo
     return session
 
 
-async def get_user_sessions(user_id: str) -> List[dict]:
+async def find_user_sessions(
+    user_id: str,
+    session_ids: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+    limit: Optional[int] = None
+) -> List[dict]:
     """
-    Get all sessions for a user.
+    Get a user's sessions by ID and/or status, for batch operations.
     
     Args:
         user_id: User ID
+        session_ids: Only these sessions, if given
+        statuses: Only sessions in one of these statuses, if given
+        limit: Maximum sessions to return
         
     Returns:
-        List of session documents
+        Session documents (SESSION_LIST_PROJECTION fields), oldest first
+    """
+    query = {"user_id": user_id}
+    if session_ids:
+        query["session_id"] = {"$in": session_ids}
+    if statuses:
+        query["status"] = {"$in": statuses}
+    
+    cursor = sessions_collection.find(query, SESSION_LIST_PROJECTION).sort("created_at", 1)
+    sessions = await cursor.to_list(length=limit)
+    
+    return [_with_document_ids(session) for session in sessions]
+
+
+def encode_session_cursor(session: dict) -> str:
+    """Opaque cursor pointing just past a session in (created_at, session_id) order."""
+    payload = json.dumps({"c": session["created_at"].isoformat(), "s": session["session_id"]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_session_cursor(cursor: str) -> tuple:
     """
-    cursor = sessions_collection.find({"user_id": user_id}).sort("created_at", -1)
-    sessions = await cursor.to_list(length=None)
+    Decode a cursor from encode_session_cursor.
     
-    return sessions
+    Raises:
+        SessionValidationError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(payload["c"]), str(payload["s"])
+    except (ValueError, KeyError, TypeError):
+        raise SessionValidationError("Invalid pagination cursor")
+
+
+async def list_user_sessions(
+    user_id: str,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    statuses: Optional[List[str]] = None
+) -> dict:
+    """
+    Get one page of a user's sessions, newest first.
+    
+    Pages are keyset-paginated on (created_at, session_id), so each page
+    is an index range scan however deep the client pages, and only the
+    fields in SESSION_LIST_PROJECTION are read.
+    
+    Args:
+        user_id: User ID
+        limit: Maximum sessions to return
+        cursor: next_cursor from the previous page, if any
+        statuses: Optional session statuses to filter on
+        
+    Returns:
+        Dict with "sessions", "total" (all matching sessions) and
+        "next_cursor" (None on the last page)
+        
+    Raises:
+        SessionValidationError: If the cursor is malformed
+    """
+    base_filter = {"user_id": user_id}
+    if statuses:
+        base_filter["status"] = {"$in": statuses}
+    
+    page_filter = dict(base_filter)
+    if cursor:
+        created_at, session_id = decode_session_cursor(cursor)
+        page_filter["$or"] = [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "session_id": {"$lt": session_id}}
+        ]
+    
+    page_query = sessions_collection.find(page_filter, SESSION_LIST_PROJECTION) \
+        .sort([("created_at", -1), ("session_id", -1)]) \
+        .limit(limit + 1)
+    
+    sessions, total = await asyncio.gather(
+        page_query.to_list(length=limit + 1),
+        sessions_collection.count_documents(base_filter)
+    )
+    
+    next_cursor = None
+    if len(sessions) > limit:
+        sessions = sessions[:limit]
+        next_cursor = encode_session_cursor(sessions[-1])
+    
+    return {
+        "sessions": [_with_document_ids(session) for session in sessions],
+        "total": total,
+        "next_cursor": next_cursor
+    }
 
 
 async def get_session_by_id(session_id: str, user_id: Optional[str] = None) -> dict:
     """
     Get session by ID with optional user validation.
     
+    The full tally_result that sessions tallied by earlier versions
+    still embed is never loaded.
+    
     Args:
         session_id: Session ID
         user_id: Optional user ID to validate ownership
@@ -63,7 +182,7 @@ async def get_session_by_id(session_id: str, user_id: Optional[str] = None) -> d
         SessionNotFoundError: If session doesn't exist
         AuthorizationError: If user doesn't own the session
     """
-    session = await sessions_collection.find_one({"session_id": session_id})
+    session = await sessions_collection.find_one({"session_id": session_id}, {"tally_result": 0})
     
     if not session:
         raise SessionNotFoundError(session_id)
@@ -72,75 +191,383 @@ async def get_session_by_id(session_id: str, user_id: Optional[str] = None) -> d
     if user_id and session["user_id"] != user_id:
         raise AuthorizationError("You don't have access to this session")
     
+    return _with_document_ids(session)
+
+
+def session_document_ids(session: dict, document_type: str) -> List[str]:
+    """
+    All document IDs of one type in a session, in upload order.
+    
+    Sessions created before multi-document support only have the
+    single-id field; it is merged in so both shapes read the same.
+    """
+    ids = list(session.get(f"{document_type}_document_ids") or [])
+    legacy_id = session.get(f"{document_type}_document_id")
+    if legacy_id and legacy_id not in ids:
+        ids.insert(0, legacy_id)
+    return ids
+
+
+def _with_document_ids(session: dict) -> dict:
+    """Fill both document ID lists, including legacy single-id sessions."""
+    for document_type in ("company", "bank"):
+        session[f"{document_type}_document_ids"] = session_document_ids(session, document_type)
     return session
 
 
-async def update_session_document(
+def _document_fields(document_type: str) -> Tuple[str, str, str]:
+    """(list field, legacy single-id field, other side's legacy field) for a type."""
+    if document_type not in ("company", "bank"):
+        raise SessionValidationError(f"Unknown document type '{document_type}'")
+    other_type = "bank" if document_type == "company" else "company"
+    return f"{document_type}_document_ids", f"{document_type}_document_id", f"{other_type}_document_id"
+
+
+async def _attach_failure(session_id: str, user_id: str, document_type: str) -> Exception:
+    """Work out why an attach matched nothing (only runs on the failure path)."""
+    session = await sessions_collection.find_one(
+        {"session_id": session_id},
+        {"_id": 0, "user_id": 1}
+    )
+    if not session:
+        return SessionNotFoundError(session_id)
+    if session["user_id"] != user_id:
+        return AuthorizationError("You don't have access to this session")
+    return SessionValidationError(
+        f"Session already has the maximum of {SESSION_MAX_DOCUMENTS_PER_TYPE} {document_type} documents"
+    )
+
+
+async def attach_document(
     session_id: str,
     user_id: str,
     document_id: str,
     document_type: str
 ) -> dict:
     """
-    Associate a document with a session.
+    Atomically add a document to a session.
+    
+    One conditional find_one_and_update checks ownership and the
+    SESSION_MAX_DOCUMENTS_PER_TYPE limit, appends the document, fills the
+    legacy single-id field if it is still empty, advances the status
+    ("<type>_uploaded", or "complete" once both sides have a document)
+    and returns the new session. Adding a document to a tallied session
+    moves it back to "complete" until it is tallied again.
     
     Args:
         session_id: Session ID
         user_id: User ID (for validation)
-        document_id: Document ID to associate
+        document_id: Document ID to attach
         document_type: Type of document ("company" or "bank")
         
     Returns:
-        Updated session document
+        Updated session document (without tally_result)
         
     Raises:
         SessionNotFoundError: If session doesn't exist
         AuthorizationError: If user doesn't own the session
-        SessionValidationError: If session already has this document type
+        SessionValidationError: If the session already holds the maximum
+            number of documents of this type
     """
-    # Get and validate session
-    session = await get_session_by_id(session_id, user_id)
+    list_field, legacy_field, other_legacy_field = _document_fields(document_type)
     
-    # Check if session already has this document type
-    field_name = f"{document_type}_document_id"
-    if session.get(field_name):
-        raise SessionValidationError(
-            f"Session already has a {document_type} document. Delete the session and create a new one."
-        )
-    
-    # Determine new status
-    if document_type == "company":
-        if session.get("bank_document_id"):
-            new_status = "complete"
-        else:
-            new_status = "company_uploaded"
-    else:  # bank
-        if session.get("company_document_id"):
-            new_status = "complete"
-        else:
-            new_status = "bank_uploaded"
+    session = await sessions_collection.find_one_and_update(
+        {
+            "session_id": session_id,
+            "user_id": user_id,
+            f"{list_field}.{max(0, SESSION_MAX_DOCUMENTS_PER_TYPE - 1)}": {"$exists": False}
+        },
+        [{"$set": {
+            list_field: {"$concatArrays": [{"$ifNull": [f"${list_field}", []]}, [document_id]]},
+            legacy_field: {"$ifNull": [f"${legacy_field}", document_id]},
+            "status": {"$cond": [
+                {"$ifNull": [f"${other_legacy_field}", False]},
+                "complete",
+                f"{document_type}_uploaded"
+            ]},
+            "updated_at": datetime.utcnow()
+        }}],
+        projection={"tally_result": 0},
+        return_document=ReturnDocument.AFTER
+    )
     
-    # Update session
-    update_data = {
-        field_name: document_id,
-        "status": new_status,
-        "updated_at": datetime.utcnow()
-    }
+    if session is None:
+        raise await _attach_failure(session_id, user_id, document_type)
+    
+    logger.info(f"Updated session {session_id} with {document_type} document {document_id}")
+    
+    return _with_document_ids(session)
+
+
+async def attach_documents(
+    session_id: str,
+    user_id: str,
+    document_ids: Dict[str, List[str]]
+) -> dict:
+    """
+    Atomically add several documents to a session in one update.
+    
+    The batch form of attach_document: one pipeline find_one_and_update
+    checks ownership, appends each type's documents with $concatArrays
+    and fills the legacy fields and status the same way. Documents that
+    would take a type past SESSION_MAX_DOCUMENTS_PER_TYPE are left out
+    (in order), so a full session keeps the earlier ones; callers find
+    which were attached in the returned lists.
+    
+    Args:
+        session_id: Session ID
+        user_id: User ID (for validation)
+        document_ids: Document IDs to attach, keyed by type ("company" or "bank")
+        
+    Returns:
+        Updated session document (without tally_result)
+        
+    Raises:
+        SessionNotFoundError: If session doesn't exist
+        AuthorizationError: If user doesn't own the session
+        SessionValidationError: If a document type is unknown
+    """
+    for document_type in document_ids:
+        _document_fields(document_type)
+    
+    fields = {}
+    attached = {}
+    for document_type in ("company", "bank"):
+        ids = document_ids.get(document_type) or []
+        list_field, legacy_field, _ = _document_fields(document_type)
+        if not ids:
+            attached[document_type] = False
+            continue
+        existing = {"$ifNull": [f"${list_field}", []]}
+        count = {"$size": existing}
+        # The i-th new document fits while the session holds fewer than LIMIT - i
+        attached[document_type] = {"$lt": [count, SESSION_MAX_DOCUMENTS_PER_TYPE]}
+        fields[list_field] = {"$concatArrays": [existing] + [
+            {"$cond": [{"$lt": [count, SESSION_MAX_DOCUMENTS_PER_TYPE - i]}, [document_id], []]}
+            for i, document_id in enumerate(ids)
+        ]}
+        fields[legacy_field] = {"$ifNull": [
+            f"${legacy_field}",
+            {"$cond": [attached[document_type], ids[0], None]}
+        ]}
+    
+    if not fields:
+        return await get_session_by_id(session_id, user_id)
+    
+    has_company = {"$or": [{"$ifNull": ["$company_document_id", False]}, attached["company"]]}
+    has_bank = {"$or": [{"$ifNull": ["$bank_document_id", False]}, attached["bank"]]}
+    fields["status"] = {"$cond": [
+        {"$or": [attached["company"], attached["bank"]]},
+        {"$cond": [
+            {"$and": [has_company, has_bank]},
+            "complete",
+            {"$cond": [has_company, "company_uploaded", "bank_uploaded"]}
+        ]},
+        "$status"
+    ]}
+    fields["updated_at"] = datetime.utcnow()
+    
+    session = await sessions_collection.find_one_and_update(
+        {"session_id": session_id, "user_id": user_id},
+        [{"$set": fields}],
+        projection={"tally_result": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    
+    if session is None:
+        raise await _attach_failure(session_id, user_id, next(iter(document_ids)))
+    
+    logger.info(
+        f"Updated session {session_id} with "
+        + ", ".join(f"{len(ids)} {t}" for t, ids in document_ids.items() if ids)
+        + " documents"
+    )
+    
+    return _with_document_ids(session)
+
+
+async def detach_document(session_id: str, document_id: str, document_type: str):
+    """
+    Undo attach_document.
+    
+    Args:
+        session_id: Session ID
+        document_id: Document ID that was attached
+        document_type: Type of document ("company" or "bank")
+    """
+    list_field, legacy_field, other_legacy_field = _document_fields(document_type)
+    
+    session = await sessions_collection.find_one_and_update(
+        {"session_id": session_id},
+        {"$pull": {list_field: document_id}},
+        projection={"tally_result": 0},
+        return_document=ReturnDocument.AFTER
+    )
+    if session is None:
+        return
+    
+    remaining = [d for d in session_document_ids(session, document_type) if d != document_id]
+    has_own = bool(remaining)
+    has_other = bool(session.get(other_legacy_field))
+    
+    if has_own and has_other:
+        new_status = "complete"
+    elif has_own:
+        new_status = f"{document_type}_uploaded"
+    elif has_other:
+        new_status = "bank_uploaded" if document_type == "company" else "company_uploaded"
+    else:
+        new_status = "created"
     
     await sessions_collection.update_one(
         {"session_id": session_id},
-        {"$set": update_data}
+        {"$set": {
+            legacy_field: remaining[0] if remaining else None,
+            "status": new_status,
+            "updated_at": datetime.utcnow()
+        }}
     )
+
+
+async def add_session_document(
+    session_id: str,
+    user_id: str,
+    document_type: str,
+    raw_text: str,
+    file_size: int = 0,
+    file_sha256: Optional[str] = None
+) -> Tuple[str, dict]:
+    """
+    Store an uploaded document and attach it to a session.
     
-    logger.info(f"Updated session {session_id} with {document_type} document {document_id}")
+    The document is attached first with attach_document (which also
+    validates the session), then it and its pages are inserted. If the
+    insert fails it is detached again. Three round-trips in all.
+    
+    Args:
+        session_id: Session ID
+        user_id: User ID (for validation)
+        document_type: Type of document ("company" or "bank")
+        raw_text: Extracted text from PDF
+        file_size: Size of the uploaded PDF in bytes
+        file_sha256: SHA-256 of the uploaded PDF
+        
+    Returns:
+        (document_id, updated session document)
+        
+    Raises:
+        SessionNotFoundError: If session doesn't exist
+        AuthorizationError: If user doesn't own the session
+        SessionValidationError: If the session already holds the maximum
+            number of documents of this type
+    """
+    prepared = prepare_document(user_id, session_id, document_type, raw_text, file_size, file_sha256)
+    document_id = prepared.document["document_id"]
+    
+    session = await attach_document(session_id, user_id, document_id, document_type)
     
-    # Return updated session
-    return await get_session_by_id(session_id)
+    try:
+        await insert_documents([prepared])
+    except BaseException:
+        await detach_document(session_id, document_id, document_type)
+        raise
+    
+    return document_id, session
+
+
+async def add_session_documents(
+    session_id: str,
+    user_id: str,
+    prepared: List[PreparedDocument]
+) -> Tuple[dict, List[Optional[Exception]]]:
+    """
+    Attach several prepared documents to a session and insert them in bulk.
+    
+    All documents are attached with a single attach_documents update;
+    one that does not fit (the session is full for its type) is skipped
+    and its error reported. The attached documents and their pages are
+    then written with a single insert_many each. If that write fails
+    every attach is rolled back.
+    
+    Args:
+        session_id: Session ID
+        user_id: User ID (for validation)
+        prepared: Documents from prepare_document
+        
+    Returns:
+        (updated session document, per-document error or None)
+        
+    Raises:
+        SessionNotFoundError: If session doesn't exist
+        AuthorizationError: If user doesn't own the session
+    """
+    document_ids: Dict[str, List[str]] = {}
+    for item in prepared:
+        document_ids.setdefault(item.document["document_type"], []).append(item.document["document_id"])
+    
+    session = await attach_documents(session_id, user_id, document_ids)
+    
+    errors: List[Optional[Exception]] = []
+    attached: List[PreparedDocument] = []
+    for item in prepared:
+        document_type = item.document["document_type"]
+        if item.document["document_id"] in session[f"{document_type}_document_ids"]:
+            attached.append(item)
+            errors.append(None)
+        else:
+            errors.append(SessionValidationError(
+                f"Session already has the maximum of {SESSION_MAX_DOCUMENTS_PER_TYPE} {document_type} documents"
+            ))
+    
+    try:
+        await insert_documents(attached)
+    except BaseException:
+        for item in attached:
+            await detach_document(session_id, item.document["document_id"], item.document["document_type"])
+        raise
+    
+    return session, errors
+
+
+async def mark_session_tallied(
+    session_id: str,
+    tally_result: Optional[dict] = None,
+    document_ids: Optional[List[str]] = None
+):
+    """
+    Mark a session as tallied.
+    
+    Only the summary and the duplicate report of the tally are stored on
+    the session; its cheque lists can be as large as the registers, so
+    they are kept one row per cheque in tally_results instead (see
+    write_tally_results) and never embedded in the session document.
+    
+    Args:
+        session_id: Session ID
+        tally_result: Optional tally result whose summary to store
+        document_ids: Documents the tally covered, so the next tally can
+            work incrementally from this one
+    """
+    update_data = {"status": "tallied", "updated_at": datetime.utcnow()}
+    if tally_result is not None:
+        update_data["tally_summary"] = tally_result["summary"]
+        update_data["tally_duplicates"] = tally_result.get("duplicates", [])
+    if document_ids is not None:
+        update_data["tallied_document_ids"] = document_ids
+    
+    # Also drop the full result embedded by earlier versions
+    await sessions_collection.update_one(
+        {"session_id": session_id},
+        {"$set": update_data, "$unset": {"tally_result": ""}}
+    )
+    
+    logger.info(f"Session {session_id} marked as tallied")
 
 
 async def delete_session(session_id: str, user_id: str) -> bool:
     """
-    Delete a session and its associated documents.
+    Delete a session, its documents, its outstanding-cheque ledger entries
+    and its tally result rows.
     
     Args:
         session_id: Session ID
@@ -156,8 +583,13 @@ async def delete_session(session_id: str, user_id: str) -> bool:
     # Get and validate session
     session = await get_session_by_id(session_id, user_id)
     
-    # Delete associated documents
+    # Delete associated documents and their pages
     await documents_collection.delete_many({"session_id": session_id})
+    await document_pages_collection.delete_many({"session_id": session_id})
+    
+    # Its pending cheques must not be cleared by later statements
+    await forget_session(user_id, session_id)
+    await delete_tally_results(user_id, session_id)
     
     # Delete session
     result = await sessions_collection.delete_one({"session_id": session_id})
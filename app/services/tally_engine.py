@@ -1,67 +1,564 @@
-from typing import Dict, List
+from dataclasses import dataclass
+from datetime import datetime
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Optional
+import re
+import numpy as np
+from app.core.config import (
+    TALLY_AMOUNT_TOLERANCE,
+    TALLY_CANDIDATE_SCAN_LIMIT,
+    TALLY_DATE_WINDOW_DAYS,
+    TALLY_MAX_CANDIDATES
+)
 
+DATE_FORMATS = (
+    "%d/%m/%Y", "%d/%m/%y", "%d-%m-%Y", "%d-%m-%y", "%d.%m.%Y", "%d.%m.%y",
+    "%Y-%m-%d", "%Y/%m/%d", "%d-%b-%Y", "%d-%b-%y", "%d %b %Y", "%d %b %y",
+    "%d%b%Y", "%d %B %Y", "%B %d, %Y", "%b %d, %Y",
+)
 
-def tally_cheques(company_data, bank_data) -> Dict:
+_NON_ALNUM_RE = re.compile(r"[^0-9A-Z]")
+_PREFIX_RE = re.compile(r"^(?:CHQ|CHEQUE|CHECK|INSTNO|INST|NO)+(?=\d)")
 
-    company_cheques = company_data.cheques
-    bank_cheques = bank_data.cashed_cheques
 
-    bank_lookup = {c.cheque_number: c for c in bank_cheques}
+def normalize_cheque_number(value: Optional[str]) -> str:
+    """
+    Normalize a cheque number for matching.
+
+    Drops spaces and punctuation, "CHQ"/"INST"/"NO" style prefixes and
+    leading zeros, so "CHQ No. 000123", "000123" and "123" share a key.
+    """
+    key = _NON_ALNUM_RE.sub("", (value or "").upper())
+    key = _PREFIX_RE.sub("", key)
+    if key.isdigit():
+        key = key.lstrip("0") or "0"
+    return key
+
+
+@lru_cache(maxsize=4096)
+def parse_date_ordinal(value: Optional[str]) -> float:
+    """Day ordinal of a statement date string, or NaN if it can't be parsed."""
+    if not value:
+        return np.nan
+    text = value.strip()
+    for date_format in DATE_FORMATS:
+        try:
+            return float(datetime.strptime(text, date_format).toordinal())
+        except ValueError:
+            continue
+    return np.nan
+
+
+@dataclass
+class ChequeColumns:
+    """Column-oriented view of a cheque register."""
+    cheque_numbers: np.ndarray  # fixed-width unicode, normalized
+    amounts: np.ndarray  # float64
+    days: Optional[np.ndarray] = None  # float64 day ordinals, NaN when unknown
+    rows: Optional[list] = None  # original cheque models, needed by tally_columns
+
+    @classmethod
+    def from_cheques(cls, cheques: list, date_field: str) -> "ChequeColumns":
+        return cls(
+            cheque_numbers=np.array([normalize_cheque_number(c.cheque_number) for c in cheques], dtype=str),
+            amounts=np.array([c.amount or 0.0 for c in cheques], dtype=np.float64),
+            days=np.array([parse_date_ordinal(getattr(c, date_field)) for c in cheques], dtype=np.float64),
+            rows=cheques
+        )
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def day_values(self) -> np.ndarray:
+        return self.days if self.days is not None else np.full(len(self), np.nan)
+
+
+@dataclass
+class TallyMatch:
+    """Index-level result of matching two registers."""
+    company_index: np.ndarray  # matched company rows
+    bank_index: np.ndarray  # bank row paired with each matched company row
+    pending_index: np.ndarray  # company rows with no bank row
+    unmatched_bank_index: np.ndarray  # bank rows not paired with any company row
+    company_duplicates: Dict[str, int]
+    bank_duplicates: Dict[str, int]
+    outside_window_company: Optional[np.ndarray] = None  # pending rows split off by the date window
+    outside_window_bank: Optional[np.ndarray] = None  # the bank row each was paired with
+
+
+def _occurrence_rank(keys: np.ndarray) -> np.ndarray:
+    """For keys sorted ascending, the 0-based position of each row within its key group."""
+    n = len(keys)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sizes = np.diff(np.r_[starts, n])
+    return np.arange(n, dtype=np.int64) - np.repeat(starts, sizes)
+
+
+def _factorize(numbers: np.ndarray):
+    """
+    Map cheque number strings to dense integer keys.
+
+    Returns (keys, first_row) where first_row[k] is a row holding key k.
+    ASCII strings are packed into uint64 words and grouped with integer
+    sorts, which is several times faster than sorting unicode strings.
+    """
+    n = len(numbers)
+    width = numbers.dtype.itemsize // 4
+    if n == 0 or width == 0:
+        return np.zeros(n, dtype=np.int64), np.zeros(min(n, 1), dtype=np.int64)
+
+    code_points = numbers.view(np.uint32).reshape(n, width)
+    if not (code_points < 256).all():
+        _, first_row, keys = np.unique(numbers, return_index=True, return_inverse=True)
+        return keys.astype(np.int64), first_row
+
+    packed = np.zeros((n, width + (-width) % 8), dtype=np.uint8)
+    packed[:, :width] = code_points
+    words = packed.view(np.uint64)
+
+    if words.shape[1] == 1:
+        order = np.argsort(words[:, 0])
+        ordered = words[order, 0]
+        new_group = np.r_[True, ordered[1:] != ordered[:-1]]
+    else:
+        order = np.lexsort(words.T[::-1])
+        ordered = words[order]
+        new_group = np.r_[True, (ordered[1:] != ordered[:-1]).any(axis=1)]
+
+    keys = np.empty(n, dtype=np.int64)
+    keys[order] = np.cumsum(new_group) - 1
+    return keys, order[new_group]
+
+
+def _sort_by_key_and_amount(keys: np.ndarray, cents: np.ndarray) -> np.ndarray:
+    """Row order sorted by (key, amount)."""
+    if len(keys) == 0:
+        return np.zeros(0, dtype=np.int64)
+    # Pack both into one int64 when they fit: a single argsort beats lexsort
+    cents_bits = 63 - int(keys.max()).bit_length()
+    if cents.max() < 2 ** cents_bits:
+        return np.argsort((keys << cents_bits) | cents)
+    return np.lexsort((cents, keys))
+
+
+def _duplicates(keys: np.ndarray, n_keys: int, numbers: np.ndarray, first_row: np.ndarray) -> Dict[str, int]:
+    """Cheque numbers that occur more than once, with their counts."""
+    counts = np.bincount(keys, minlength=n_keys)
+    duplicate_keys = np.flatnonzero(counts > 1)
+    return {str(numbers[first_row[k]]): int(counts[k]) for k in duplicate_keys}
+
+
+def _pair_sorted(
+    company_order: np.ndarray,
+    company_sorted_keys: np.ndarray,
+    bank_order: np.ndarray,
+    bank_sorted_keys: np.ndarray
+):
+    """
+    Pair rows of two key-sorted sides occurrence by occurrence.
+
+    Returns:
+        (company_positions, bank_positions) of the paired rows
+    """
+    company_rank = _occurrence_rank(company_sorted_keys)
+    bank_rank = _occurrence_rank(bank_sorted_keys)
+
+    # (key, rank) pairs, ascending on both sides because each side is sorted by key
+    stride = int(max(company_rank.max(initial=0), bank_rank.max(initial=0))) + 1
+    company_pair = company_sorted_keys * stride + company_rank
+    bank_pair = bank_sorted_keys * stride + bank_rank
+
+    positions = np.searchsorted(bank_pair, company_pair)
+    found = positions < len(bank_pair)
+    found[found] = bank_pair[positions[found]] == company_pair[found]
+
+    return company_order[found], bank_order[positions[found]]
+
+
+def _split_sorted(keys: np.ndarray, cents: np.ndarray, n_company: int):
+    """
+    Sort company and bank rows together by (key, cents) with one argsort.
+
+    keys and cents hold the company rows first, then the bank rows.
+
+    Returns:
+        (company_order, company_ids, bank_order, bank_ids): each side's
+        rows in (key, cents) order and the dense (key, cents) group id of
+        each of those rows
+    """
+    if len(keys) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty, empty, empty
+
+    order = _sort_by_key_and_amount(keys, cents)
+    sorted_keys = keys[order]
+    sorted_cents = cents[order]
+    new_group = np.r_[True, (sorted_keys[1:] != sorted_keys[:-1]) | (sorted_cents[1:] != sorted_cents[:-1])]
+    sorted_ids = np.cumsum(new_group) - 1
+
+    is_company = order < n_company
+    return (
+        order[is_company], sorted_ids[is_company],
+        order[~is_company] - n_company, sorted_ids[~is_company]
+    )
+
+
+def match_columns(
+    company: ChequeColumns,
+    bank: ChequeColumns,
+    date_window_days: int = TALLY_DATE_WINDOW_DAYS
+) -> TallyMatch:
+    """
+    Pair company and bank rows on cheque number with a sort-merge join.
+
+    Cheque numbers may repeat on either side. Rows are first joined on
+    (cheque number, amount), so an exact bank row always wins; the rows
+    left over within one cheque number are then ordered by amount and
+    paired occurrence by occurrence, and surplus rows stay unpaired.
+    Repeated numbers are reported rather than silently dropped.
+
+    When date_window_days is set, a pair whose clearing date falls outside
+    [issue_date, issue_date + date_window_days] is split again and kept in
+    outside_window_company/outside_window_bank so it can be reported.
+    Pairs with an unparseable date on either side are kept.
+    """
+    n_company = len(company)
+
+    numbers = np.concatenate([company.cheque_numbers, bank.cheque_numbers])
+    keys, first_row = _factorize(numbers)
+    company_keys = keys[:n_company]
+    bank_keys = keys[n_company:]
+
+    cents = np.rint(np.concatenate([company.amounts, bank.amounts]) * 100).astype(np.int64)
+    if len(cents):
+        cents -= cents.min()
+    company_cents = cents[:n_company]
+    bank_cents = cents[n_company:]
+
+    # Exact (cheque number, amount) matches first
+    company_order, company_ids, bank_order, bank_ids = _split_sorted(keys, cents, n_company)
+    paired_bank = np.full(n_company, -1, dtype=np.int64)
+    company_rows, bank_rows = _pair_sorted(company_order, company_ids, bank_order, bank_ids)
+    paired_bank[company_rows] = bank_rows
+
+    # Then the leftovers of each cheque number, in amount order; filtering
+    # the sorted rows keeps them sorted, so they need no second sort
+    bank_used = np.zeros(len(bank), dtype=bool)
+    bank_used[bank_rows] = True
+    company_left = company_order[paired_bank[company_order] < 0]
+    bank_left = bank_order[~bank_used[bank_order]]
+    company_rows, bank_rows = _pair_sorted(
+        company_left, company_keys[company_left],
+        bank_left, bank_keys[bank_left]
+    )
+    paired_bank[company_rows] = bank_rows
+
+    company_index = np.flatnonzero(paired_bank >= 0)
+    outside_company = np.zeros(0, dtype=np.int64)
+    outside_bank = np.zeros(0, dtype=np.int64)
+
+    if date_window_days:
+        delta = bank.day_values()[paired_bank[company_index]] - company.day_values()[company_index]
+        outside = (delta < 0) | (delta > date_window_days)  # False for NaN
+        outside_company = company_index[outside]
+        outside_bank = paired_bank[outside_company]
+        paired_bank[outside_company] = -1
+        company_index = company_index[~outside]
+
+    bank_matched = np.zeros(len(bank), dtype=bool)
+    bank_matched[paired_bank[company_index]] = True
+
+    return TallyMatch(
+        company_index=company_index,
+        bank_index=paired_bank[company_index],
+        pending_index=np.flatnonzero(paired_bank < 0),
+        unmatched_bank_index=np.flatnonzero(~bank_matched),
+        company_duplicates=_duplicates(company_keys, len(first_row), numbers, first_row),
+        bank_duplicates=_duplicates(bank_keys, len(first_row), numbers, first_row),
+        outside_window_company=outside_company,
+        outside_window_bank=outside_bank
+    )
+
+
+def _candidate_score(
+    company: ChequeColumns,
+    bank: ChequeColumns,
+    row: int,
+    bank_row: int,
+    amount_tolerance: float,
+    date_window_days: int
+) -> float:
+    """Cheque number similarity (0.5), amount closeness (0.3) and date proximity (0.2)."""
+    delta = bank.day_values()[bank_row] - company.day_values()[row]
+    number_score = SequenceMatcher(None, str(company.cheque_numbers[row]), str(bank.cheque_numbers[bank_row])).ratio()
+    amount_score = max(0.0, 1.0 - abs(bank.amounts[bank_row] - company.amounts[row]) / max(amount_tolerance, 1e-9))
+    if np.isnan(delta) or not date_window_days:
+        date_score = 0.5
+    else:
+        date_score = min(1.0, max(0.0, 1.0 - delta / date_window_days))
+    return round(float(0.5 * number_score + 0.3 * amount_score + 0.2 * date_score), 3)
+
+
+def find_candidates(
+    company: ChequeColumns,
+    bank: ChequeColumns,
+    company_index: np.ndarray,
+    bank_index: np.ndarray,
+    amount_tolerance: float = TALLY_AMOUNT_TOLERANCE,
+    date_window_days: int = TALLY_DATE_WINDOW_DAYS,
+    max_candidates: int = TALLY_MAX_CANDIDATES,
+    scan_limit: int = TALLY_CANDIDATE_SCAN_LIMIT
+) -> Dict[int, List[tuple]]:
+    """
+    Rank leftover bank rows as possible matches for leftover company rows.
+
+    Leftover bank rows are sorted by amount once; each company row then
+    binary-searches the rows within amount_tolerance instead of comparing
+    against every bank row. When many rows share an amount, only the
+    scan_limit rows clearing soonest after the issue date are scored, so
+    the cost stays O(n * scan_limit) however often an amount repeats.
+    Candidates are scored on cheque number similarity (0.5), amount
+    closeness (0.3) and date proximity (0.2).
+
+    Returns:
+        Mapping of company row -> [(bank_row, score), ...], best first
+    """
+    if len(company_index) == 0 or len(bank_index) == 0 or max_candidates <= 0:
+        return {}
+
+    order = np.argsort(bank.amounts[bank_index], kind="stable")
+    sorted_rows = bank_index[order]
+    sorted_amounts = bank.amounts[sorted_rows]
+
+    amounts = company.amounts[company_index]
+    lower = np.searchsorted(sorted_amounts, amounts - amount_tolerance, side="left")
+    upper = np.searchsorted(sorted_amounts, amounts + amount_tolerance, side="right")
+
+    company_days = company.day_values()
+    sorted_days = bank.day_values()[sorted_rows]
+    scan_limit = max(1, scan_limit)
+
+    candidates = {}
+    for position in np.flatnonzero(upper > lower).tolist():
+        row = int(company_index[position])
+        window_rows = sorted_rows[lower[position]:upper[position]]
+
+        delta = sorted_days[lower[position]:upper[position]] - company_days[row]
+        if date_window_days:
+            # Unknown dates rank after every in-window date; out-of-window rows are dropped
+            rank = np.where(np.isnan(delta), date_window_days + 1.0, delta)
+            keep = np.isnan(delta) | ((delta >= 0) & (delta <= date_window_days))
+        else:
+            rank = np.where(np.isnan(delta), np.inf, np.abs(delta))
+            keep = np.ones(len(delta), dtype=bool)
+
+        window_rows, rank = window_rows[keep], rank[keep]
+        if len(window_rows) > scan_limit:
+            nearest = np.argpartition(rank, scan_limit - 1)[:scan_limit]
+            window_rows = window_rows[np.sort(nearest)]
+
+        scored = [
+            (bank_row, _candidate_score(company, bank, row, bank_row, amount_tolerance, date_window_days))
+            for bank_row in window_rows.tolist()
+        ]
+
+        if scored:
+            scored.sort(key=lambda item: item[1], reverse=True)
+            candidates[row] = scored[:max_candidates]
+
+    return candidates
+
+
+def tally_cheques(
+    company_data,
+    bank_data,
+    amount_tolerance: float = TALLY_AMOUNT_TOLERANCE,
+    date_window_days: int = TALLY_DATE_WINDOW_DAYS
+) -> Dict:
+
+    company = ChequeColumns.from_cheques(company_data.cheques, "issue_date")
+    bank = ChequeColumns.from_cheques(bank_data.cashed_cheques, "clearing_date")
+
+    return tally_columns(company, bank, amount_tolerance, date_window_days)
+
+
+def tally_columns(
+    company: ChequeColumns,
+    bank: ChequeColumns,
+    amount_tolerance: float = TALLY_AMOUNT_TOLERANCE,
+    date_window_days: int = TALLY_DATE_WINDOW_DAYS
+) -> Dict:
+    """
+    Tally two column-oriented registers.
+
+    Returns the same summary/cashed/pending/mismatched_amount shape as
+    tally_cheques, plus a duplicates section listing repeated cheque
+    numbers on each side, ranked candidate bank rows for each
+    pending cheque, and the bank rows no company cheque matched. A pending
+    cheque whose number and amount matched a bank row that cleared outside
+    the date window lists that row first among its candidates, flagged
+    outside_date_window, and is counted in summary.total_outside_window.
+    """
+    match = match_columns(company, bank, date_window_days)
+
+    differences = np.abs(bank.amounts[match.bank_index] - company.amounts[match.company_index])
+    is_mismatch = differences > amount_tolerance
+
+    cashed_company = match.company_index[~is_mismatch]
+    cashed_bank = match.bank_index[~is_mismatch]
+    mismatched_company = match.company_index[is_mismatch]
+    mismatched_bank = match.bank_index[is_mismatch]
+
+    company_rows = company.rows
+    bank_rows = bank.rows
 
     cashed = []
+    for c, b in zip(cashed_company.tolist(), cashed_bank.tolist()):
+        cheque = company_rows[c]
+        cashed.append({
+            "cheque_number": cheque.cheque_number,
+            "payee_name": cheque.payee_name,
+            "amount": cheque.amount,
+            "bank_amount": bank_rows[b].amount,
+            "issue_date": cheque.issue_date,
+            "clearing_date": bank_rows[b].clearing_date
+        })
+
     pending = []
+    for c in match.pending_index.tolist():
+        cheque = company_rows[c]
+        pending.append({
+            "cheque_number": cheque.cheque_number,
+            "payee_name": cheque.payee_name,
+            "amount": cheque.amount,
+            "issue_date": cheque.issue_date
+        })
+
     mismatched = []
+    for c, b in zip(mismatched_company.tolist(), mismatched_bank.tolist()):
+        mismatched.append({
+            "cheque_number": company_rows[c].cheque_number,
+            "issued_amount": company_rows[c].amount,
+            "bank_amount": bank_rows[b].amount
+        })
 
-    total_issued_amount = 0
-    total_cashed_amount = 0
-    total_pending_amount = 0
-
-    for cheque in company_cheques:
-        total_issued_amount += cheque.amount
-
-        bank_match = bank_lookup.get(cheque.cheque_number)
-
-        if bank_match:
-
-            if abs(bank_match.amount - cheque.amount) > 0.01:
-                mismatched.append({
-                    "cheque_number": cheque.cheque_number,
-                    "issued_amount": cheque.amount,
-                    "bank_amount": bank_match.amount
-                })
-            else:
-                cashed.append({
-                    "cheque_number": cheque.cheque_number,
-                    "payee_name": cheque.payee_name,
-                    "amount": cheque.amount,
-                    "issue_date": cheque.issue_date,
-                    "clearing_date": bank_match.clearing_date
-                })
-
-                total_cashed_amount += cheque.amount
-        else:
-            pending.append({
-                "cheque_number": cheque.cheque_number,
-                "payee_name": cheque.payee_name,
-                "amount": cheque.amount,
-                "issue_date": cheque.issue_date
-            })
+    unmatched_bank = [
+        {
+            "cheque_number": bank_rows[b].cheque_number,
+            "amount": bank_rows[b].amount,
+            "clearing_date": bank_rows[b].clearing_date
+        }
+        for b in match.unmatched_bank_index.tolist()
+    ]
+
+    candidate_rows = find_candidates(
+        company, bank, match.pending_index, match.unmatched_bank_index,
+        amount_tolerance, date_window_days
+    )
 
-            total_pending_amount += cheque.amount
+    # A same-number, same-amount row that cleared outside the date window
+    # is the most likely counterpart, so it is always listed first
+    outside_window = set()
+    if match.outside_window_company is not None:
+        for c, b in zip(match.outside_window_company.tolist(), match.outside_window_bank.tolist()):
+            score = _candidate_score(company, bank, c, b, amount_tolerance, date_window_days)
+            candidate_rows[c] = [(b, score)] + candidate_rows.get(c, [])
+            outside_window.add((c, b))
+
+    candidates = []
+    for c, ranked in candidate_rows.items():
+        candidates.append({
+            "cheque_number": company_rows[c].cheque_number,
+            "amount": company_rows[c].amount,
+            "issue_date": company_rows[c].issue_date,
+            "candidates": [
+                {
+                    "cheque_number": bank_rows[b].cheque_number,
+                    "amount": bank_rows[b].amount,
+                    "clearing_date": bank_rows[b].clearing_date,
+                    "score": score,
+                    "outside_date_window": (c, b) in outside_window
+                }
+                for b, score in ranked
+            ]
+        })
 
     result = {
         "summary": {
-            "total_issued": len(company_cheques),
+            "total_issued": len(company),
             "total_cashed": len(cashed),
             "total_pending": len(pending),
             "total_mismatched": len(mismatched),
-            "amount_issued": round(total_issued_amount, 2),
-            "amount_cashed": round(total_cashed_amount, 2),
-            "amount_pending": round(total_pending_amount, 2),
+            "total_duplicates": len(match.company_duplicates) + len(match.bank_duplicates),
+            "total_outside_window": len(outside_window),
+            "amount_issued": round(float(company.amounts.sum()), 2),
+            "amount_cashed": round(float(company.amounts[cashed_company].sum()), 2),
+            "amount_pending": round(float(company.amounts[match.pending_index].sum()), 2),
         },
         "cashed": cashed,
         "pending": pending,
-        "mismatched_amount": mismatched
+        "mismatched_amount": mismatched,
+        "duplicates": _duplicate_rows(match),
+        "candidates": candidates,
+        "unmatched_bank": unmatched_bank
     }
 
     return result
+
+
+def _duplicate_rows(match: TallyMatch) -> List[Dict]:
+    rows = [
+        {"cheque_number": number, "source": "company", "count": count}
+        for number, count in match.company_duplicates.items()
+    ]
+    rows.extend(
+        {"cheque_number": number, "source": "bank", "count": count}
+        for number, count in match.bank_duplicates.items()
+    )
+    return rows
+
+
+def merge_tally_results(previous: Dict, increment: Dict) -> Dict:
+    """
+    Fold the tally of a new bank statement into an earlier tally.
+
+    increment must come from matching the new statement against the
+    cheques still pending in previous. Cheques cashed or mismatched
+    earlier stay as they were; pending and candidates come from the
+    increment, and the summary is recomputed for the whole register.
+    Bank rows left unmatched and cheques cleared from the outstanding
+    ledger accumulate across increments. Company duplicates were already
+    reported by the earlier tally, so only bank-side duplicates are taken
+    from the increment.
+    """
+    cashed = previous["cashed"] + increment["cashed"]
+    mismatched = previous["mismatched_amount"] + increment["mismatched_amount"]
+    duplicates = previous.get("duplicates", []) + [
+        row for row in increment.get("duplicates", []) if row["source"] == "bank"
+    ]
+    previous_summary = previous["summary"]
+    increment_summary = increment["summary"]
+
+    return {
+        "summary": {
+            "total_issued": previous_summary["total_issued"],
+            "total_cashed": len(cashed),
+            "total_pending": len(increment["pending"]),
+            "total_mismatched": len(mismatched),
+            "total_duplicates": len(duplicates),
+            "total_outside_window": increment_summary.get("total_outside_window", 0),
+            "amount_issued": previous_summary["amount_issued"],
+            "amount_cashed": round(previous_summary["amount_cashed"] + increment_summary["amount_cashed"], 2),
+            "amount_pending": increment_summary["amount_pending"],
+        },
+        "cashed": cashed,
+        "pending": increment["pending"],
+        "mismatched_amount": mismatched,
+        "duplicates": duplicates,
+        "candidates": increment.get("candidates", []),
+        "unmatched_bank": previous.get("unmatched_bank", []) + increment.get("unmatched_bank", []),
+        "cleared_from_ledger": previous.get("cleared_from_ledger", [])
+    }
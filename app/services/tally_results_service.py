@@ -0,0 +1,365 @@
+from datetime import datetime
+from typing import List, Optional
+import asyncio
+import base64
+import json
+import logging
+import numpy as np
+from pymongo import DeleteMany, InsertOne, UpdateMany
+from app.core.config import OUTSTANDING_LEDGER_ENABLED
+from app.core.database import tally_results_collection
+from app.core.exceptions import SessionValidationError
+from app.models.tally_result import TallyResultModel
+from app.services.ledger_service import cleared_elsewhere
+from app.services.tally_engine import normalize_cheque_number, parse_date_ordinal
+
+logger = logging.getLogger(__name__)
+
+# Fields returned by tally result queries
+TALLY_RESULT_PROJECTION = {"_id": 0, "user_id": 0, "cheque_key": 0}
+
+
+def _parse_day(value: Optional[str]) -> Optional[datetime]:
+    ordinal = parse_date_ordinal(value)
+    return None if np.isnan(ordinal) else datetime.fromordinal(int(ordinal))
+
+
+def _row(user_id: str, session_id: str, status: str, tallied_at: datetime, **fields) -> dict:
+    amount = round(float(fields.pop("amount", None) or 0.0), 2)
+    return TallyResultModel(
+        user_id=user_id,
+        session_id=session_id,
+        status=status,
+        cheque_key=normalize_cheque_number(fields.get("cheque_number")),
+        amount=amount,
+        issued_on=_parse_day(fields.get("issue_date")),
+        cleared_on=_parse_day(fields.get("clearing_date")),
+        tallied_at=tallied_at,
+        **fields
+    ).model_dump()
+
+
+def build_result_rows(user_id: str, session_id: str, tally_result: dict) -> List[dict]:
+    """
+    Flatten a tally result into one row per cheque outcome.
+
+    Args:
+        user_id: Owner of the session
+        session_id: Session that was tallied
+        tally_result: Result of the tally
+
+    Returns:
+        TallyResultModel rows as dicts
+    """
+    tallied_at = datetime.utcnow()
+    rows = []
+
+    for cheque in tally_result.get("cashed", []):
+        rows.append(_row(
+            user_id, session_id, "cashed", tallied_at,
+            cheque_number=cheque.get("cheque_number"),
+            payee_name=cheque.get("payee_name"),
+            amount=cheque.get("amount"),
+            # Cashed within tolerance, so the bank may differ by a few paise;
+            # tallies stored before bank_amount was recorded fall back to amount
+            bank_amount=cheque.get("bank_amount", cheque.get("amount")),
+            issue_date=cheque.get("issue_date"),
+            clearing_date=cheque.get("clearing_date")
+        ))
+
+    for cheque in tally_result.get("pending", []):
+        rows.append(_row(
+            user_id, session_id, "pending", tallied_at,
+            cheque_number=cheque.get("cheque_number"),
+            payee_name=cheque.get("payee_name"),
+            amount=cheque.get("amount"),
+            issue_date=cheque.get("issue_date")
+        ))
+
+    for cheque in tally_result.get("mismatched_amount", []):
+        rows.append(_row(
+            user_id, session_id, "mismatched", tallied_at,
+            cheque_number=cheque.get("cheque_number"),
+            amount=cheque.get("issued_amount"),
+            bank_amount=cheque.get("bank_amount")
+        ))
+
+    for cheque in tally_result.get("unmatched_bank", []):
+        rows.append(_row(
+            user_id, session_id, "unmatched_bank", tallied_at,
+            cheque_number=cheque.get("cheque_number"),
+            amount=cheque.get("amount"),
+            bank_amount=cheque.get("amount"),
+            clearing_date=cheque.get("clearing_date")
+        ))
+
+    return rows
+
+
+async def write_tally_results(user_id: str, session_id: str, tally_result: dict) -> int:
+    """
+    Replace a session's rows in tally_results with its latest tally.
+
+    The session's old rows are deleted and the new ones inserted in one
+    ordered bulk_write. Pending cheques that a later session's statement
+    already cleared (per the outstanding-cheque ledger) are stored as
+    "cleared_late", and the pending rows of earlier sessions that this
+    tally cleared from the ledger are flipped to "cleared_late" in the
+    same request.
+
+    Args:
+        user_id: Owner of the session
+        session_id: Session that was tallied
+        tally_result: Result of the tally
+
+    Returns:
+        Number of rows written for the session
+    """
+    rows = build_result_rows(user_id, session_id, tally_result)
+
+    if OUTSTANDING_LEDGER_ENABLED:
+        cleared = await cleared_elsewhere(user_id, session_id)
+        for row in rows:
+            entry = cleared.get((row["cheque_key"], row["amount"])) if row["status"] == "pending" else None
+            if entry is not None:
+                row.update({
+                    "status": "cleared_late",
+                    "bank_amount": entry.get("cleared_amount"),
+                    "clearing_date": entry.get("clearing_date"),
+                    "cleared_on": _parse_day(entry.get("clearing_date")),
+                    "cleared_session_id": entry["cleared_session_id"]
+                })
+
+    operations = [DeleteMany({"session_id": session_id})]
+    operations.extend(InsertOne(row) for row in rows)
+
+    for cheque in tally_result.get("cleared_from_ledger", []):
+        operations.append(UpdateMany(
+            {
+                "session_id": cheque["issued_session_id"],
+                "status": "pending",
+                "cheque_key": normalize_cheque_number(cheque.get("cheque_number")),
+                "amount": round(float(cheque.get("amount") or 0.0), 2)
+            },
+            {"$set": {
+                "status": "cleared_late",
+                "bank_amount": cheque.get("bank_amount"),
+                "clearing_date": cheque.get("clearing_date"),
+                "cleared_on": _parse_day(cheque.get("clearing_date")),
+                "cleared_session_id": session_id
+            }}
+        ))
+
+    await tally_results_collection.bulk_write(operations, ordered=True)
+
+    logger.info(f"Wrote {len(rows)} tally result rows for session {session_id}")
+
+    return len(rows)
+
+
+async def read_tally_result(user_id: str, session_id: str) -> dict:
+    """
+    Rebuild the cheque lists of a session's latest tally from its rows.
+
+    The inverse of build_result_rows, for incremental re-tallies: the
+    session document only keeps the summary, so the registers are read
+    back from tally_results instead of being stored twice. Rows another
+    session's statement cleared ("cleared_late") are pending again, as
+    they were in the tally itself; cheques this session cleared for
+    earlier sessions are rebuilt from those sessions' rows.
+
+    Args:
+        user_id: Owner of the session
+        session_id: Session that was tallied
+
+    Returns:
+        Dict with "cashed", "pending", "mismatched_amount",
+        "unmatched_bank" and "cleared_from_ledger", shaped like the
+        tally result
+    """
+    result = {"cashed": [], "pending": [], "mismatched_amount": [], "unmatched_bank": [], "cleared_from_ledger": []}
+
+    own_rows = tally_results_collection.find({"session_id": session_id}, TALLY_RESULT_PROJECTION)
+    async for row in own_rows:
+        if row["status"] == "cashed":
+            result["cashed"].append({
+                "cheque_number": row.get("cheque_number"),
+                "payee_name": row.get("payee_name"),
+                "amount": row["amount"],
+                "bank_amount": row.get("bank_amount"),
+                "issue_date": row.get("issue_date"),
+                "clearing_date": row.get("clearing_date")
+            })
+        elif row["status"] in ("pending", "cleared_late"):
+            result["pending"].append({
+                "cheque_number": row.get("cheque_number"),
+                "payee_name": row.get("payee_name"),
+                "amount": row["amount"],
+                "issue_date": row.get("issue_date")
+            })
+        elif row["status"] == "mismatched":
+            result["mismatched_amount"].append({
+                "cheque_number": row.get("cheque_number"),
+                "issued_amount": row["amount"],
+                "bank_amount": row.get("bank_amount")
+            })
+        elif row["status"] == "unmatched_bank":
+            result["unmatched_bank"].append({
+                "cheque_number": row.get("cheque_number"),
+                "amount": row["amount"],
+                "clearing_date": row.get("clearing_date")
+            })
+
+    cleared_rows = tally_results_collection.find(
+        {"user_id": user_id, "status": "cleared_late", "cleared_session_id": session_id},
+        TALLY_RESULT_PROJECTION
+    )
+    async for row in cleared_rows:
+        result["cleared_from_ledger"].append({
+            "cheque_number": row.get("cheque_number"),
+            "payee_name": row.get("payee_name"),
+            "amount": row["amount"],
+            "issue_date": row.get("issue_date"),
+            "clearing_date": row.get("clearing_date"),
+            "bank_amount": row.get("bank_amount"),
+            "issued_session_id": row["session_id"]
+        })
+
+    return result
+
+
+async def delete_tally_results(user_id: str, session_id: str):
+    """
+    Delete a session's rows, and put back to "pending" the rows of other
+    sessions that only its statement had marked "cleared_late".
+
+    Args:
+        user_id: Owner of the session
+        session_id: Session being deleted
+    """
+    deleted = await tally_results_collection.delete_many({"session_id": session_id})
+    await tally_results_collection.update_many(
+        {"user_id": user_id, "status": "cleared_late", "cleared_session_id": session_id},
+        {"$set": {
+            "status": "pending",
+            "bank_amount": None,
+            "clearing_date": None,
+            "cleared_on": None,
+            "cleared_session_id": None
+        }}
+    )
+
+    logger.info(f"Deleted {deleted.deleted_count} tally result rows for session {session_id}")
+
+
+def encode_result_cursor(row: dict) -> str:
+    """Opaque cursor pointing just past a row in (amount, row_id) descending order."""
+    payload = json.dumps({"a": row["amount"], "r": row["row_id"]})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_result_cursor(cursor: str) -> tuple:
+    """
+    Decode a cursor from encode_result_cursor.
+
+    Raises:
+        SessionValidationError: If the cursor is malformed
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return float(payload["a"]), str(payload["r"])
+    except (ValueError, KeyError, TypeError):
+        raise SessionValidationError("Invalid pagination cursor")
+
+
+def _range(lower, upper) -> Optional[dict]:
+    bounds = {}
+    if lower is not None:
+        bounds["$gte"] = lower
+    if upper is not None:
+        bounds["$lte"] = upper
+    return bounds or None
+
+
+async def query_tally_results(
+    user_id: str,
+    session_ids: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+    cheque_number: Optional[str] = None,
+    min_amount: Optional[float] = None,
+    max_amount: Optional[float] = None,
+    issued_from: Optional[datetime] = None,
+    issued_to: Optional[datetime] = None,
+    cleared_from: Optional[datetime] = None,
+    cleared_to: Optional[datetime] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> dict:
+    """
+    Get one page of a user's cheque outcomes across sessions, largest
+    amount first.
+
+    Every filter maps onto an indexed field, so e.g. all pending cheques
+    over 50,000 is a single index range scan on the server.
+
+    Args:
+        user_id: User ID
+        session_ids: Only these sessions
+        statuses: Only these outcomes ("cashed", "pending", "mismatched",
+            "cleared_late", "unmatched_bank")
+        cheque_number: Only this cheque number (normalized before matching)
+        min_amount: Minimum amount, inclusive
+        max_amount: Maximum amount, inclusive
+        issued_from: Earliest issue date, inclusive
+        issued_to: Latest issue date, inclusive
+        cleared_from: Earliest clearing date, inclusive
+        cleared_to: Latest clearing date, inclusive
+        limit: Maximum rows to return
+        cursor: Cursor returned as next_cursor by the previous page
+
+    Returns:
+        Dict with "results", "total" (all matching rows) and
+        "next_cursor" (None on the last page)
+
+    Raises:
+        SessionValidationError: If the cursor is malformed
+    """
+    base_filter = {"user_id": user_id}
+    if session_ids:
+        base_filter["session_id"] = {"$in": session_ids}
+    if statuses:
+        base_filter["status"] = {"$in": statuses}
+    if cheque_number:
+        base_filter["cheque_key"] = normalize_cheque_number(cheque_number)
+
+    for field, bounds in (
+        ("amount", _range(min_amount, max_amount)),
+        ("issued_on", _range(issued_from, issued_to)),
+        ("cleared_on", _range(cleared_from, cleared_to))
+    ):
+        if bounds:
+            base_filter[field] = bounds
+
+    page_filter = dict(base_filter)
+    if cursor:
+        amount, row_id = decode_result_cursor(cursor)
+        page_filter = {"$and": [base_filter, {"$or": [
+            {"amount": {"$lt": amount}},
+            {"amount": amount, "row_id": {"$lt": row_id}}
+        ]}]}
+
+    page_query = tally_results_collection.find(page_filter, TALLY_RESULT_PROJECTION) \
+        .sort([("amount", -1), ("row_id", -1)]) \
+        .limit(limit + 1)
+
+    results, total = await asyncio.gather(
+        page_query.to_list(length=limit + 1),
+        tally_results_collection.count_documents(base_filter)
+    )
+
+    next_cursor = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_cursor = encode_result_cursor(results[-1])
+
+    return {"results": results, "total": total, "next_cursor": next_cursor}
@@ -0,0 +1,339 @@
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import logging
+from app.core.config import OUTSTANDING_LEDGER_ENABLED
+from app.core.exceptions import SessionValidationError
+from app.schemas.cheque_schema import BankChequeList, CompanyCheque, CompanyChequeList
+from app.services.document_service import get_document, get_document_text, update_document
+from app.services.ai_extractor import aextract_company_cheques, aextract_bank_cheques
+from app.services.tally_engine import ChequeColumns, match_columns, merge_tally_results, tally_cheques
+from app.services.session_service import get_session_by_id, mark_session_tallied, session_document_ids
+from app.services.ledger_service import reconcile_with_ledger
+from app.services.tally_results_service import read_tally_result, write_tally_results
+from fastapi import HTTPException, status
+
+logger = logging.getLogger(__name__)
+
+# Text is read from document_pages; raw_text only exists on legacy documents
+TALLY_DOCUMENT_FIELDS = ("raw_text", "page_count")
+
+# Receives (stage, percent, data); data carries stage details such as
+# per-chunk partial counts, or None
+ProgressCallback = Callable[[str, int, Optional[dict]], Awaitable[None]]
+
+
+async def _report(progress: Optional[ProgressCallback], stage: str, percent: int, data: Optional[dict] = None):
+    if progress is not None:
+        await progress(stage, percent, data)
+
+
+class _PartialTally:
+    """
+    Running cashed/pending counts while extraction chunks land.
+
+    Counts are provisional: chunk rows are not yet cleaned or deduplicated
+    across chunks, and cheques still pending may clear in a later chunk.
+    """
+
+    def __init__(
+        self,
+        progress: ProgressCallback,
+        document_ids: Dict[str, List[str]],
+        company_cheques: Optional[list] = None
+    ):
+        self.progress = progress
+        self.cheques: Dict[str, list] = {"company": list(company_cheques or []), "bank": []}
+        # Extraction progress per (document_type, document_id)
+        self.fraction: Dict[Tuple[str, str], float] = {
+            (document_type, document_id): 0.0
+            for document_type, ids in document_ids.items()
+            for document_id in ids
+        }
+
+    def callback(self, document_type: str, document_id: str):
+        async def on_chunk(cheques: list, completed: int, total: int):
+            self.cheques[document_type].extend(cheques)
+            self.fraction[(document_type, document_id)] = completed / total if total else 1.0
+
+            match = match_columns(
+                ChequeColumns.from_cheques(self.cheques["company"], "issue_date"),
+                ChequeColumns.from_cheques(self.cheques["bank"], "clearing_date")
+            )
+            percent = 10 + int(70 * sum(self.fraction.values()) / max(1, len(self.fraction)))
+            await self.progress("extraction_chunk", percent, {
+                "document_type": document_type,
+                "document_id": document_id,
+                "chunk": completed,
+                "chunks": total,
+                "cheques": len(cheques),
+                "partial": {
+                    "company_cheques": len(self.cheques["company"]),
+                    "bank_cheques": len(self.cheques["bank"]),
+                    "cashed": len(match.company_index),
+                    "pending": len(match.pending_index)
+                }
+            })
+
+        return on_chunk
+
+
+async def _load_documents(document_ids: List[str], fields=TALLY_DOCUMENT_FIELDS) -> List[dict]:
+    documents = await asyncio.gather(*(get_document(document_id, fields) for document_id in document_ids))
+
+    if any(document is None for document in documents):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="One or more documents not found"
+        )
+
+    return list(documents)
+
+
+async def _extract_documents(
+    documents: List[dict],
+    texts: List[str],
+    document_type: str,
+    partial: Optional[_PartialTally]
+) -> list:
+    """Extract every document of one type concurrently, one structured list per document."""
+    extract = aextract_company_cheques if document_type == "company" else aextract_bank_cheques
+
+    return await asyncio.gather(*(
+        extract(text, partial.callback(document_type, document["document_id"]) if partial else None)
+        for document, text in zip(documents, texts)
+    ))
+
+
+def _combine_company(structured: list) -> CompanyChequeList:
+    return CompanyChequeList(cheques=[cheque for item in structured for cheque in item.cheques])
+
+
+def _combine_bank(structured: list) -> BankChequeList:
+    return BankChequeList(cashed_cheques=[cheque for item in structured for cheque in item.cashed_cheques])
+
+
+def _is_incremental(session: dict, company_ids: List[str], bank_ids: List[str]) -> bool:
+    """
+    Whether only new bank statements need tallying.
+
+    True when the last tally covered every company document and every
+    other bank document still in the session, and at least one bank
+    statement has been added since.
+    """
+    tallied_ids = set(session.get("tallied_document_ids") or [])
+    new_bank_ids = [document_id for document_id in bank_ids if document_id not in tallied_ids]
+
+    return (
+        session.get("tally_summary") is not None
+        and tallied_ids <= set(company_ids) | set(bank_ids)
+        and set(company_ids) <= tallied_ids
+        and 0 < len(new_bank_ids) < len(bank_ids)
+    )
+
+
+async def _full_tally(
+    company_ids: List[str],
+    bank_ids: List[str],
+    progress: Optional[ProgressCallback]
+) -> Tuple[CompanyChequeList, BankChequeList, dict]:
+    """Extract every document and tally the combined registers."""
+    company_docs, bank_docs = await asyncio.gather(
+        _load_documents(company_ids),
+        _load_documents(bank_ids)
+    )
+
+    # Load only the pages that can hold cheque rows
+    company_texts, bank_texts = await asyncio.gather(
+        asyncio.gather(*(get_document_text(doc, cheque_pages_only=True) for doc in company_docs)),
+        asyncio.gather(*(get_document_text(doc, cheque_pages_only=True) for doc in bank_docs))
+    )
+
+    await _report(progress, "extracting", 10, {
+        "mode": "full",
+        "company_documents": len(company_docs),
+        "bank_documents": len(bank_docs),
+        "company_pages": sum(doc.get("page_count") or 0 for doc in company_docs),
+        "bank_pages": sum(doc.get("page_count") or 0 for doc in bank_docs)
+    })
+
+    # Structure data using LLM (all extractions run concurrently)
+    partial = _PartialTally(progress, {"company": company_ids, "bank": bank_ids}) if progress is not None else None
+    company_parts, bank_parts = await asyncio.gather(
+        _extract_documents(company_docs, company_texts, "company", partial),
+        _extract_documents(bank_docs, bank_texts, "bank", partial)
+    )
+
+    # One logical register per side
+    company_structured = _combine_company(company_parts)
+    bank_structured = _combine_bank(bank_parts)
+
+    logger.info(f"Tally - Company cheques: {len(company_structured.cheques)}, Bank cheques: {len(bank_structured.cashed_cheques)}")
+
+    await _report(progress, "matching", 80, {
+        "company_cheques": len(company_structured.cheques),
+        "bank_cheques": len(bank_structured.cashed_cheques)
+    })
+
+    # Apply tally engine off the event loop; large registers take a while
+    result = await asyncio.to_thread(tally_cheques, company_structured, bank_structured)
+
+    await _report(progress, "saving", 90, {"summary": result["summary"]})
+
+    # Save structured data per document; the combined result lives on the session
+    await asyncio.gather(
+        *(
+            update_document(document_id, {"structured_data": part.dict(), "status": "tallied"})
+            for document_id, part in zip(company_ids, company_parts)
+        ),
+        *(
+            update_document(document_id, {"structured_data": part.dict(), "status": "structured"})
+            for document_id, part in zip(bank_ids, bank_parts)
+        )
+    )
+
+    return company_structured, bank_structured, result
+
+
+async def _incremental_tally(
+    session: dict,
+    user_id: str,
+    company_ids: List[str],
+    bank_ids: List[str],
+    progress: Optional[ProgressCallback]
+) -> Tuple[CompanyChequeList, BankChequeList, dict]:
+    """
+    Extract only the new bank statements and match them against the
+    cheques the last tally left pending.
+
+    The last tally is read back from its tally_results rows, plus the
+    summary and duplicates stored on the session.
+    """
+    tallied_ids = set(session["tallied_document_ids"])
+    new_bank_ids = [document_id for document_id in bank_ids if document_id not in tallied_ids]
+    old_bank_ids = [document_id for document_id in bank_ids if document_id in tallied_ids]
+
+    new_docs, stored_docs, previous = await asyncio.gather(
+        _load_documents(new_bank_ids),
+        _load_documents(company_ids + old_bank_ids, ("structured_data",)),
+        read_tally_result(user_id, session["session_id"])
+    )
+    previous["summary"] = session["tally_summary"]
+    previous["duplicates"] = session.get("tally_duplicates") or []
+    new_texts = await asyncio.gather(*(get_document_text(doc, cheque_pages_only=True) for doc in new_docs))
+
+    await _report(progress, "extracting", 10, {
+        "mode": "incremental",
+        "company_documents": 0,
+        "bank_documents": len(new_docs),
+        "company_pages": 0,
+        "bank_pages": sum(doc.get("page_count") or 0 for doc in new_docs)
+    })
+
+    pending = CompanyChequeList(cheques=[
+        CompanyCheque(**row)
+        for row in previous["pending"]
+    ])
+
+    partial = _PartialTally(progress, {"bank": new_bank_ids}, pending.cheques) if progress is not None else None
+    new_parts = await _extract_documents(new_docs, new_texts, "bank", partial)
+    new_structured = _combine_bank(new_parts)
+
+    logger.info(f"Incremental tally - Pending cheques: {len(pending.cheques)}, New bank cheques: {len(new_structured.cashed_cheques)}")
+
+    await _report(progress, "matching", 80, {
+        "company_cheques": len(pending.cheques),
+        "bank_cheques": len(new_structured.cashed_cheques)
+    })
+
+    increment = await asyncio.to_thread(tally_cheques, pending, new_structured)
+    result = merge_tally_results(previous, increment)
+
+    await _report(progress, "saving", 90, {"summary": result["summary"]})
+
+    await asyncio.gather(*(
+        update_document(document_id, {"structured_data": part.dict(), "status": "structured"})
+        for document_id, part in zip(new_bank_ids, new_parts)
+    ))
+
+    # The response carries the full registers, rebuilt from what earlier tallies stored
+    stored = {doc["document_id"]: doc.get("structured_data") or {} for doc in stored_docs}
+    company_structured = CompanyChequeList(cheques=[
+        cheque for document_id in company_ids for cheque in stored[document_id].get("cheques", [])
+    ])
+    bank_structured = BankChequeList(cashed_cheques=[
+        cheque for document_id in old_bank_ids for cheque in stored[document_id].get("cashed_cheques", [])
+    ] + new_structured.cashed_cheques)
+
+    return company_structured, bank_structured, result
+
+
+async def run_tally(
+    session_id: str,
+    user_id: str,
+    progress: Optional[ProgressCallback] = None
+) -> dict:
+    """
+    Run the full tally pipeline for a session.
+
+    All company registers in the session are tallied as one register, and
+    all bank statements as one statement. When the session was tallied
+    before and only bank statements have been added since, just the new
+    statements are extracted and matched against the cheques that were
+    still pending ("incremental" mode); anything else re-tallies every
+    document ("full" mode).
+
+    Args:
+        session_id: Session ID containing company and bank documents
+        user_id: Owner of the session
+        progress: Optional async callback receiving (stage, percent, data);
+            extraction also reports every chunk as "extraction_chunk" with
+            provisional cashed/pending counts
+
+    Returns:
+        Tally response with structured data, tally result and mode
+
+    Raises:
+        SessionNotFoundError: If session doesn't exist
+        AuthorizationError: If user doesn't own the session
+        SessionValidationError: If a document is missing from the session
+    """
+    await _report(progress, "loading_documents", 5)
+
+    # Get and validate session
+    session = await get_session_by_id(session_id, user_id)
+    company_ids = session_document_ids(session, "company")
+    bank_ids = session_document_ids(session, "bank")
+
+    # Validate session has both document types
+    if not company_ids or not bank_ids:
+        raise SessionValidationError(
+            "Session must have both company and bank documents uploaded"
+        )
+
+    if _is_incremental(session, company_ids, bank_ids):
+        mode = "incremental"
+        company_structured, bank_structured, result = await _incremental_tally(
+            session, user_id, company_ids, bank_ids, progress
+        )
+    else:
+        mode = "full"
+        company_structured, bank_structured, result = await _full_tally(company_ids, bank_ids, progress)
+
+    # Clear late cheques from earlier sessions, and carry this session's pending ones forward
+    if OUTSTANDING_LEDGER_ENABLED:
+        result = await reconcile_with_ledger(user_id, session_id, result)
+
+    # One queryable row per cheque outcome
+    await write_tally_results(user_id, session_id, result)
+
+    await mark_session_tallied(session_id, result, company_ids + bank_ids)
+
+    await _report(progress, "completed", 100)
+
+    return {
+        "session_id": session_id,
+        "mode": mode,
+        "company_structured": company_structured.dict(),
+        "bank_structured": bank_structured.dict(),
+        "tally_result": result
+    }
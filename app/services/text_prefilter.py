@@ -0,0 +1,210 @@
+"""
+Pre-filter that trims document text down to cheque-relevant lines.
+
+Statements are mostly noise for cheque extraction: headers, balances,
+NEFT/UPI/IMPS transfers, footers. Each line is scored for cheque-like
+content (cheque keywords, an instrument-number-like figure, an amount)
+and only lines reaching PREFILTER_MIN_SCORE are sent to the LLM. A line
+with both a date and an instrument-number-like figure is always kept
+(unless it is marked as an electronic transfer), since that is the
+shape of a register row. Page markers are kept so chunking and page
+references still work, and the dropped lines are collapsed into a
+single count per page.
+"""
+from dataclasses import dataclass
+from typing import List
+import logging
+import re
+from app.core.config import (
+    PREFILTER_MIN_SCORE,
+    PREFILTER_CONTEXT_LINES,
+    PREFILTER_TABULAR
+)
+from app.services.bank_statement_parser import (
+    AMOUNT_RE,
+    ANY_DATE_RE,
+    CHEQUE_NUMBER_RE,
+    LOOSE_AMOUNT_RE,
+    NON_CHEQUE_RE
+)
+from app.services.llm_service import estimate_tokens
+from app.services.pdf_reader import split_pages
+
+logger = logging.getLogger(__name__)
+
+CHEQUE_WORD_RE = re.compile(r"\b(CHQ|CHEQUE|CHECK|INST(?:RUMENT)?|INSTNO|CLG|CLEARING)\b", re.IGNORECASE)
+
+TABULAR_HEADER = "Date | Details | Number | Amounts"
+
+# Totals across all documents filtered by this process
+prefilter_stats = {
+    "documents": 0,
+    "lines_in": 0,
+    "lines_kept": 0,
+    "tokens_in": 0,
+    "tokens_out": 0,
+    "tokens_saved": 0
+}
+
+
+@dataclass
+class PrefilterResult:
+    """Filtered text plus what the filter removed."""
+    text: str
+    lines_in: int
+    lines_kept: int
+    tokens_in: int
+    tokens_out: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(0, self.tokens_in - self.tokens_out)
+
+
+def _find_amounts(text: str) -> List[str]:
+    """Amounts with paise ("1,234.56") or as registers print them ("15,000", "Rs 15000/-")."""
+    amounts = [match.group(0) for match in AMOUNT_RE.finditer(text)]
+    amounts.extend(match.group(0) for match in LOOSE_AMOUNT_RE.finditer(AMOUNT_RE.sub(" ", text)))
+    return amounts
+
+
+def _strip_amounts(text: str) -> str:
+    return LOOSE_AMOUNT_RE.sub(" ", AMOUNT_RE.sub(" ", text))
+
+
+def _has_cheque_number(line: str) -> bool:
+    return bool(CHEQUE_NUMBER_RE.search(_strip_amounts(ANY_DATE_RE.sub(" ", line))))
+
+
+def is_row_like(line: str) -> bool:
+    """
+    A date plus an instrument-number-like figure, and no electronic
+    transfer marker: never filtered out, whatever its score.
+    """
+    return (
+        bool(ANY_DATE_RE.search(line))
+        and _has_cheque_number(line)
+        and not NON_CHEQUE_RE.search(line)
+    )
+
+
+def score_line(line: str) -> int:
+    """
+    Score how likely a line is to hold (or describe) a cheque row.
+
+    Cheque keywords count 3, an instrument-number-like figure 2 and an
+    amount 1; electronic-transfer markers (NEFT, UPI, ...) count -3.
+    """
+    score = 0
+    if CHEQUE_WORD_RE.search(line):
+        score += 3
+    if _has_cheque_number(line):
+        score += 2
+    if _find_amounts(line):
+        score += 1
+    if NON_CHEQUE_RE.search(line):
+        score -= 3
+    return score
+
+
+def to_tabular(line: str) -> str:
+    """
+    Rewrite a line as "date | details | number | amounts".
+
+    Lines that are already pipe-separated (e.g. cheque registers) are
+    returned unchanged.
+    """
+    if "|" in line:
+        return line
+
+    dates = ANY_DATE_RE.findall(line)
+    rest = ANY_DATE_RE.sub(" ", line)
+    amounts = _find_amounts(rest)
+    rest = _strip_amounts(rest)
+    numbers = CHEQUE_NUMBER_RE.findall(rest)
+    details = " ".join(CHEQUE_NUMBER_RE.sub(" ", rest).split())
+
+    return " | ".join([
+        dates[0] if dates else "",
+        details,
+        " ".join(numbers),
+        " ".join(amounts)
+    ])
+
+
+def _filter_lines(lines: List[str], min_score: int, context: int, tabular: bool) -> List[str]:
+    hits = [
+        index for index, line in enumerate(lines)
+        if score_line(line) >= min_score or is_row_like(line)
+    ]
+
+    keep = set()
+    for index in hits:
+        keep.update(range(max(0, index - context), min(len(lines), index + context + 1)))
+
+    kept = [lines[index] for index in sorted(keep)]
+    if tabular:
+        # The fixed header replaces the statement's own column headers
+        kept = [to_tabular(line) for line in kept if _find_amounts(line) or is_row_like(line)]
+        if kept:
+            kept.insert(0, TABULAR_HEADER)
+    return kept
+
+
+def prefilter_text(
+    raw_text: str,
+    min_score: int = PREFILTER_MIN_SCORE,
+    context_lines: int = PREFILTER_CONTEXT_LINES,
+    tabular: bool = PREFILTER_TABULAR
+) -> PrefilterResult:
+    """
+    Keep only cheque-relevant lines of document text.
+
+    Args:
+        raw_text: Text with "--- Page N ---" markers
+        min_score: Minimum score_line() value for a line to be kept
+        context_lines: Neighbouring lines kept around each hit, for
+            narrations that wrap onto a second line
+        tabular: Rewrite kept lines in the compact to_tabular() form
+
+    Returns:
+        PrefilterResult. If no line qualifies the original text is
+        returned unchanged, so the LLM still sees documents in an
+        unfamiliar layout.
+    """
+    pages = split_pages(raw_text) or [(1, raw_text)]
+    tokens_in = estimate_tokens(raw_text)
+
+    sections = []
+    lines_in = lines_kept = 0
+    for page_number, text in pages:
+        lines = [line for line in text.splitlines() if line.strip()]
+        kept = _filter_lines(lines, min_score, context_lines, tabular)
+        lines_in += len(lines)
+        lines_kept += len(kept)
+
+        if not kept:
+            continue
+
+        dropped = len(lines) - len(kept)
+        if dropped > 0:
+            kept.append(f"[{dropped} non-cheque lines omitted]")
+        sections.append(f"--- Page {page_number} ---\n" + "\n".join(kept))
+
+    text = "\n".join(sections) if lines_kept else raw_text
+    result = PrefilterResult(
+        text=text,
+        lines_in=lines_in,
+        lines_kept=lines_kept if lines_kept else lines_in,
+        tokens_in=tokens_in,
+        tokens_out=estimate_tokens(text)
+    )
+
+    prefilter_stats["documents"] += 1
+    prefilter_stats["lines_in"] += result.lines_in
+    prefilter_stats["lines_kept"] += result.lines_kept
+    prefilter_stats["tokens_in"] += result.tokens_in
+    prefilter_stats["tokens_out"] += result.tokens_out
+    prefilter_stats["tokens_saved"] += result.tokens_saved
+
+    return result
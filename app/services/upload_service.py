@@ -0,0 +1,127 @@
+from dataclasses import dataclass
+from typing import List, Optional
+import asyncio
+import logging
+from fastapi import HTTPException, UploadFile
+from app.core.config import BATCH_UPLOAD_MAX_FILES, BATCH_UPLOAD_CONCURRENCY
+from app.services.document_service import PreparedDocument, prepare_document
+from app.services.file_storage import save_pdf
+from app.services.pdf_reader import extract_raw_text_from_pdf_async
+from app.services.session_service import get_session_by_id, add_session_documents
+from app.core.exceptions import SessionValidationError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _FileOutcome:
+    filename: str
+    document_type: str
+    prepared: Optional[PreparedDocument] = None
+    error: Optional[str] = None
+
+
+async def _process_file(
+    file: UploadFile,
+    document_type: str,
+    session_id: str,
+    user_id: str,
+    semaphore: asyncio.Semaphore
+) -> _FileOutcome:
+    outcome = _FileOutcome(filename=file.filename, document_type=document_type)
+
+    async with semaphore:
+        try:
+            saved = await save_pdf(file)
+            raw_text = await extract_raw_text_from_pdf_async(saved.path)
+            outcome.prepared = prepare_document(
+                user_id, session_id, document_type, raw_text, saved.size, saved.sha256
+            )
+        except ValueError as e:
+            outcome.error = str(e)
+        except Exception as e:
+            logger.error(f"Batch upload error on {file.filename}: {str(e)}")
+            outcome.error = "Failed to process file"
+
+    return outcome
+
+
+async def ingest_batch(
+    session_id: str,
+    user_id: str,
+    files: List[UploadFile],
+    document_types: List[str]
+) -> dict:
+    """
+    Save, extract and attach many uploaded PDFs to a session in one go.
+
+    Files are streamed to storage and their text extracted concurrently,
+    at most BATCH_UPLOAD_CONCURRENCY at a time, so the batch takes about
+    as long as its slowest files rather than the sum of all. Every
+    successfully extracted document is then attached to the session in
+    one update and persisted with bulk inserts.
+    A file that fails does not fail the batch; its error is reported in
+    its result instead.
+
+    Args:
+        session_id: Session ID
+        user_id: User ID (for validation)
+        files: Uploaded PDFs
+        document_types: Type of each file, or a single type for all files
+
+    Returns:
+        Dict with the updated session and one result per file, in upload order
+
+    Raises:
+        SessionNotFoundError: If session doesn't exist
+        AuthorizationError: If user doesn't own the session
+        SessionValidationError: If the batch is empty, too large or the
+            document types don't line up with the files
+    """
+    if not files:
+        raise SessionValidationError("No files uploaded")
+
+    if len(files) > BATCH_UPLOAD_MAX_FILES:
+        raise SessionValidationError(f"At most {BATCH_UPLOAD_MAX_FILES} files can be uploaded at once")
+
+    if len(document_types) == 1:
+        document_types = document_types * len(files)
+    if len(document_types) != len(files):
+        raise SessionValidationError("Provide one document type per file, or a single type for all files")
+
+    # Fail fast on a bad session before doing any file work
+    await get_session_by_id(session_id, user_id)
+
+    semaphore = asyncio.Semaphore(max(1, BATCH_UPLOAD_CONCURRENCY))
+    outcomes = await asyncio.gather(*(
+        _process_file(file, document_type, session_id, user_id, semaphore)
+        for file, document_type in zip(files, document_types)
+    ))
+
+    extracted = [outcome for outcome in outcomes if outcome.prepared is not None]
+    session, errors = await add_session_documents(
+        session_id,
+        user_id,
+        [outcome.prepared for outcome in extracted]
+    )
+
+    for outcome, error in zip(extracted, errors):
+        if error is not None:
+            outcome.error = error.detail if isinstance(error, HTTPException) else str(error)
+
+    results = []
+    for outcome in outcomes:
+        document = outcome.prepared.document if outcome.prepared and not outcome.error else None
+        results.append({
+            "filename": outcome.filename,
+            "document_type": outcome.document_type,
+            "status": "uploaded" if document else "failed",
+            "document_id": document["document_id"] if document else None,
+            "page_count": document["page_count"] if document else None,
+            "error": outcome.error
+        })
+
+    uploaded = sum(1 for result in results if result["status"] == "uploaded")
+    logger.info(f"Batch upload to session {session_id}: {uploaded}/{len(results)} files uploaded")
+
+    return {"session": session, "results": results}
@@ -1,8 +1,10 @@
 from datetime import datetime
 from typing import Optional
 import logging
+from pymongo import ReturnDocument
 from app.core.database import users_collection
-from app.core.auth import get_password_hash, verify_password
+from app.core.auth import ahash_password, averify_password
+from app.core.user_cache import user_cache
 from app.core.exceptions import UserAlreadyExistsError, AuthenticationError
 from app.models.user import UserModel
 from app.schemas.user_schema import UserRegister
@@ -37,7 +39,7 @@ async def create_user(user_data: UserRegister) -> UserModel:
     user = UserModel(
         email=user_data.email,
         username=user_data.username,
-        hashed_password=get_password_hash(user_data.password)
+        hashed_password=await ahash_password(user_data.password)
     )
     
     # Insert into database
@@ -73,14 +75,21 @@ async def authenticate_user(username: str, password: str) -> Optional[dict]:
     if not user:
         raise AuthenticationError("Invalid username or password")
     
-    # Verify password
-    if not verify_password(password, user["hashed_password"]):
+    # Verify password (off the event loop)
+    valid, new_hash = await averify_password(password, user["hashed_password"])
+    if not valid:
         raise AuthenticationError("Invalid username or password")
     
     # Check if user is active
     if not user.get("is_active", True):
         raise AuthenticationError("Account is inactive")
     
+    # Upgrade hashes made with an old work factor while we have the password
+    if new_hash:
+        await update_user(user["user_id"], {"hashed_password": new_hash})
+        user["hashed_password"] = new_hash
+        logger.info(f"Rehashed password for user {user['username']}")
+    
     logger.info(f"User authenticated: {user['username']}")
     
     return user
@@ -123,3 +132,43 @@ async def get_user_by_username(username: str) -> Optional[dict]:
         User document or None
     """
     return await users_collection.find_one({"username": username})
+
+
+async def update_user(user_id: str, update_data: dict) -> Optional[dict]:
+    """
+    Update a user and drop them from the authenticated-user cache.
+    
+    Args:
+        user_id: User ID
+        update_data: Fields to set
+        
+    Returns:
+        Updated user document, or None if the user doesn't exist
+    """
+    update_data["updated_at"] = datetime.utcnow()
+    
+    user = await users_collection.find_one_and_update(
+        {"user_id": user_id},
+        {"$set": update_data},
+        return_document=ReturnDocument.AFTER
+    )
+    
+    user_cache.invalidate(user_id)
+    
+    if user:
+        logger.info(f"Updated user {user_id}: {', '.join(sorted(update_data))}")
+    
+    return user
+
+
+async def deactivate_user(user_id: str) -> bool:
+    """
+    Deactivate a user account; their tokens stop working immediately on this node.
+    
+    Args:
+        user_id: User ID
+        
+    Returns:
+        True if the user exists
+    """
+    return await update_user(user_id, {"is_active": False}) is not None
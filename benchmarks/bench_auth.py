@@ -0,0 +1,91 @@
+"""
+Benchmark for password verification under concurrent logins.
+
+Usage:
+    python -m benchmarks.bench_auth [--logins 32] [--rounds 10 12] [--workers 4]
+
+For each bcrypt work factor, runs a burst of concurrent logins two ways:
+
+    inline     pwd_context.verify called directly in the coroutine (the
+               old behaviour: every verify blocks the event loop)
+    offloaded  auth.averify_password on the password thread pool
+
+and reports login throughput plus the worst event-loop stall, measured by
+a 10 ms ticker running alongside; that stall is what every other request
+on the worker waits through.
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from passlib.context import CryptContext
+
+from app.core import auth
+
+TICK_SECONDS = 0.01
+
+
+async def _ticker(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(time.perf_counter() - start - TICK_SECONDS)
+
+
+async def run_burst(logins: int, hashed: str, offloaded: bool) -> dict:
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(0)
+
+    async def login():
+        if offloaded:
+            valid, _ = await auth.averify_password("correct horse battery", hashed)
+        else:
+            valid = auth.pwd_context.verify("correct horse battery", hashed)
+        assert valid
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+
+    return {
+        "seconds": elapsed,
+        "logins_per_second": logins / elapsed,
+        "max_stall_ms": max(lags, default=0.0) * 1000
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 12])
+    parser.add_argument("--workers", type=int, default=None, help="Password thread pool size")
+    args = parser.parse_args()
+
+    if args.workers:
+        auth._password_executor = ThreadPoolExecutor(max_workers=args.workers)
+
+    print(f"{args.logins} concurrent logins, {auth._password_executor._max_workers} hashing threads")
+    print(f"{'rounds':>6}  {'mode':<10}{'total s':>10}{'logins/s':>12}{'max stall ms':>15}")
+
+    for rounds in args.rounds:
+        context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+        auth.pwd_context = context
+        hashed = context.hash("correct horse battery")
+
+        for offloaded in (False, True):
+            result = asyncio.run(run_burst(args.logins, hashed, offloaded))
+            mode = "offloaded" if offloaded else "inline"
+            print(
+                f"{rounds:>6}  {mode:<10}{result['seconds']:>10.2f}"
+                f"{result['logins_per_second']:>12.1f}{result['max_stall_ms']:>15.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
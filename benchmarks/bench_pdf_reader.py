@@ -0,0 +1,73 @@
+"""
+Benchmark for parallel PDF text extraction.
+
+Usage:
+    python -m benchmarks.bench_pdf_reader [--pages 200] [--workers 1 2 4 8]
+
+Builds a synthetic bank statement PDF, extracts it with the serial
+extract_raw_text_from_pdf and with extract_raw_text_from_pdf_async at each
+worker count, and checks that every run returns identical text.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from app.services import pdf_reader
+from benchmarks.synthetic_pdf import write_text_pdf
+
+
+def statement_pages(page_count: int, rows_per_page: int = 60):
+    balance = 10_000_000.00
+    pages = []
+    for page in range(page_count):
+        lines = ["Date Narration Chq./Ref.No. Value Dt Withdrawal Amt. Deposit Amt. Closing Balance"]
+        for row in range(rows_per_page):
+            amount = 1000 + (page * rows_per_page + row) % 9000
+            balance -= amount
+            lines.append(
+                f"01/03/24 CHQ PAID-CLG-VENDOR {page * rows_per_page + row:06d} 01/03/24 "
+                f"{amount:,.2f} {balance:,.2f}"
+            )
+        pages.append(lines)
+    return pages
+
+
+async def run_async(path: str, workers: int) -> str:
+    return await pdf_reader.extract_raw_text_from_pdf_async(path, workers=workers)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    # Let the pool grow to the largest worker count being measured
+    pdf_reader.PDF_EXTRACT_WORKERS = max(args.workers)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "statement.pdf")
+        write_text_pdf(path, statement_pages(args.pages))
+
+        start = time.perf_counter()
+        expected = pdf_reader.extract_raw_text_from_pdf(path)
+        serial = time.perf_counter() - start
+        print(f"{'mode':>12} {'seconds':>9} {'speedup':>8}")
+        print(f"{'serial':>12} {serial:>9.2f} {1.0:>8.2f}")
+
+        # Warm the pool so process start-up isn't counted
+        asyncio.run(run_async(path, max(args.workers)))
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            text = asyncio.run(run_async(path, workers))
+            elapsed = time.perf_counter() - start
+            assert text == expected, f"output differs with {workers} workers"
+            print(f"{f'{workers} workers':>12} {elapsed:>9.2f} {serial / elapsed:>8.2f}")
+
+    pdf_reader.shutdown_pdf_pool()
+
+
+if __name__ == "__main__":
+    main()
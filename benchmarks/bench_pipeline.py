@@ -0,0 +1,272 @@
+"""
+End-to-end benchmark for the upload -> extract -> tally pipeline.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--scenario small medium] [--iterations 5]
+        [--llm-latency-ms 0] [--bank-llm] [--mongo]
+        [--baseline benchmarks/baseline.json] [--write-baseline] [--tolerance 0.25] [--min-ms 5]
+
+Each iteration generates a synthetic company register and bank statement
+(benchmarks/synthetic.py) and runs them through the real services:
+
+    save_pdf      both PDFs streamed into upload storage
+    extract_text  pdfplumber text extraction (process pool)
+    extraction    cheque extraction; the LLM is SyntheticChatModel, a
+                  stand-in with --llm-latency-ms of simulated model time
+    tally         tally_cheques on the extracted rows
+    mongo_write   the writes run_tally makes: documents and pages attached
+                  to a session, the outstanding-cheque ledger, tally_results
+                  rows and the session summary (only with --mongo; point
+                  MONGO_URL/DATABASE_NAME at a scratch database)
+
+The report gives p50/p95/p99 per stage plus cheque throughput. With
+--write-baseline the results are saved as JSON; otherwise, if the
+baseline file exists, each stage's p50 is compared against it and the
+run fails when one is slower by more than --tolerance.
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+from fastapi import UploadFile
+
+from app.services import ai_extractor, extraction_cache, llm_service, pdf_reader
+from app.services.file_storage import save_pdf
+from app.services.llm_providers import register_provider
+from app.services.tally_engine import tally_cheques
+from benchmarks.synthetic import SyntheticChatModel, generate_scenario
+
+SCENARIOS = {
+    "small": {"pages": 2, "cheques": 50},
+    "medium": {"pages": 20, "cheques": 500},
+    "large": {"pages": 100, "cheques": 3000},
+}
+STAGES = ["save_pdf", "extract_text", "extraction", "tally", "mongo_write", "total"]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def _upload(path: str, filename: str) -> UploadFile:
+    with open(path, "rb") as f:
+        return UploadFile(file=io.BytesIO(f.read()), filename=filename)
+
+
+async def _mongo_write(company_text: str, bank_text: str, company, bank, result: dict) -> str:
+    """The writes tally_service.run_tally and the upload endpoints make for one session."""
+    from app.core.config import OUTSTANDING_LEDGER_ENABLED
+    from app.schemas.session_schema import SessionCreate
+    from app.services.document_service import update_document
+    from app.services.ledger_service import reconcile_with_ledger
+    from app.services.session_service import add_session_document, create_session, mark_session_tallied
+    from app.services.tally_results_service import write_tally_results
+
+    user_id = "bench-user"
+    session = await create_session(user_id, SessionCreate(session_name="pipeline benchmark"))
+
+    company_id, _ = await add_session_document(session.session_id, user_id, "company", company_text)
+    bank_id, _ = await add_session_document(session.session_id, user_id, "bank", bank_text)
+
+    await asyncio.gather(
+        update_document(company_id, {"structured_data": company.dict(), "status": "tallied"}),
+        update_document(bank_id, {"structured_data": bank.dict(), "status": "structured"})
+    )
+
+    if OUTSTANDING_LEDGER_ENABLED:
+        result = await reconcile_with_ledger(user_id, session.session_id, result)
+    await write_tally_results(user_id, session.session_id, result)
+    await mark_session_tallied(session.session_id, result, [company_id, bank_id])
+
+    return session.session_id
+
+
+async def run_iteration(scenario, workdir: str, use_mongo: bool) -> Dict[str, float]:
+    """Run one pipeline pass and return seconds spent per stage."""
+    timings = {}
+    register_path = os.path.join(workdir, "register.pdf")
+    statement_path = os.path.join(workdir, "statement.pdf")
+    scenario.write_pdfs(register_path, statement_path)
+
+    uploads = [_upload(register_path, "register.pdf"), _upload(statement_path, "statement.pdf")]
+    pipeline_start = time.perf_counter()
+
+    start = time.perf_counter()
+    saved = [await save_pdf(upload) for upload in uploads]
+    timings["save_pdf"] = time.perf_counter() - start
+
+    try:
+        start = time.perf_counter()
+        company_text, bank_text = await asyncio.gather(
+            *(pdf_reader.extract_raw_text_from_pdf_async(item.path) for item in saved)
+        )
+        timings["extract_text"] = time.perf_counter() - start
+    finally:
+        for item in saved:
+            os.remove(item.path)
+
+    start = time.perf_counter()
+    company, bank = await asyncio.gather(
+        ai_extractor.aextract_company_cheques(company_text),
+        ai_extractor.aextract_bank_cheques(bank_text)
+    )
+    timings["extraction"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = tally_cheques(company, bank)
+    timings["tally"] = time.perf_counter() - start
+
+    if use_mongo:
+        from app.services.session_service import delete_session
+
+        start = time.perf_counter()
+        session_id = await _mongo_write(company_text, bank_text, company, bank, result)
+        timings["mongo_write"] = time.perf_counter() - start
+        await delete_session(session_id, "bench-user")
+
+    timings["total"] = time.perf_counter() - pipeline_start
+    timings["_cheques"] = len(company.cheques) + len(bank.cashed_cheques)
+    timings["_bank_cheques"] = len(bank.cashed_cheques)
+    timings["_mismatched"] = result["summary"]["total_mismatched"]
+    return timings
+
+
+def summarize(samples: List[Dict[str, float]]) -> dict:
+    """p50/p95/p99/mean in milliseconds and cheques/s for each stage."""
+    cheques = samples[0]["_cheques"]
+    stages = {}
+    for stage in STAGES:
+        values = np.array([sample[stage] for sample in samples if stage in sample])
+        if values.size == 0:
+            continue
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        stages[stage] = {
+            "p50_ms": round(p50 * 1000, 3),
+            "p95_ms": round(p95 * 1000, 3),
+            "p99_ms": round(p99 * 1000, 3),
+            "mean_ms": round(values.mean() * 1000, 3),
+            "cheques_per_second": round(cheques / values.mean(), 1) if values.mean() > 0 else None
+        }
+    return stages
+
+
+async def run_scenario(name: str, args) -> dict:
+    params = SCENARIOS[name]
+    samples = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for iteration in range(args.warmup + args.iterations):
+            scenario = generate_scenario(cheques=params["cheques"], pages=params["pages"], seed=iteration)
+            timings = await run_iteration(scenario, workdir, args.mongo)
+            if timings["_bank_cheques"] != scenario.expected_cleared:
+                raise SystemExit(
+                    f"{name}: extracted {timings['_bank_cheques']} cleared cheques, "
+                    f"expected {scenario.expected_cleared}"
+                )
+            if iteration >= args.warmup:
+                samples.append(timings)
+
+    return {"params": params, "iterations": len(samples), "stages": summarize(samples)}
+
+
+def print_report(results: dict):
+    for name, scenario in results["scenarios"].items():
+        params = scenario["params"]
+        print(f"\n{name}: {params['pages']} pages, {params['cheques']} cheques, {scenario['iterations']} iterations")
+        print(f"  {'stage':<14}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'cheques/s':>14}")
+        for stage, stats in scenario["stages"].items():
+            print(
+                f"  {stage:<14}{stats['p50_ms']:>12.2f}{stats['p95_ms']:>12.2f}"
+                f"{stats['p99_ms']:>12.2f}{stats['cheques_per_second'] or 0:>14.1f}"
+            )
+
+
+def compare(results: dict, baseline: dict, tolerance: float, min_ms: float) -> List[str]:
+    """
+    Stages whose p50 is more than `tolerance` slower than the baseline.
+
+    Stages faster than min_ms in the baseline are skipped; at that scale
+    timer noise swamps any real change.
+    """
+    regressions = []
+    for name, scenario in results["scenarios"].items():
+        base_stages = baseline.get("scenarios", {}).get(name, {}).get("stages", {})
+        for stage, stats in scenario["stages"].items():
+            base = base_stages.get(stage)
+            if not base or base["p50_ms"] < min_ms:
+                continue
+            ratio = stats["p50_ms"] / base["p50_ms"]
+            if ratio > 1 + tolerance:
+                regressions.append(
+                    f"{name}/{stage}: p50 {stats['p50_ms']:.2f} ms vs baseline {base['p50_ms']:.2f} ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=["small", "medium"])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--bank-llm", action="store_true", help="Send bank statements to the LLM instead of the rule parser")
+    parser.add_argument("--mongo", action="store_true", help="Include the MongoDB writes")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--write-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--min-ms", type=float, default=5.0, help="Ignore stages faster than this in the baseline")
+    args = parser.parse_args()
+
+    # Measure the pipeline itself: no cached extractions, no rate limiting
+    extraction_cache.EXTRACTION_CACHE_ENABLED = False
+    llm_service.LLM_REQUESTS_PER_MINUTE = 10**9
+    llm_service.LLM_TOKENS_PER_MINUTE = 10**12
+    ai_extractor.BANK_PARSER_ENABLED = not args.bank_llm
+
+    register_provider("synthetic", lambda: SyntheticChatModel(latency_ms=args.llm_latency_ms))
+    llm_service.use_provider("synthetic")
+
+    async def run_all():
+        return {name: await run_scenario(name, args) for name in args.scenario}
+
+    try:
+        scenarios = asyncio.run(run_all())
+    finally:
+        pdf_reader.shutdown_pdf_pool()
+
+    results = {
+        "settings": {
+            "llm_latency_ms": args.llm_latency_ms,
+            "bank_llm": args.bank_llm,
+            "mongo": args.mongo,
+            "python": platform.python_version(),
+            "cpus": os.cpu_count()
+        },
+        "scenarios": scenarios
+    }
+    print_report(results)
+
+    if args.write_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_ms)
+        if regressions:
+            print("\nRegressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo stage slower than baseline by more than {args.tolerance:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Local OpenAI-compatible stand-in that serves recorded LLM responses.
+
+Usage:
+    LLM_REPLAY_DIR=llm_recordings uvicorn benchmarks.replay_server:app --port 8001
+
+Then run the app with LLM_PROVIDER=openai_compatible and
+LLM_BASE_URL=http://localhost:8001/v1 to exercise the full HTTP client
+path offline. Responses come from the same recordings the in-process
+"replay" provider uses (capture them with LLM_PROVIDER=record), with the
+same LLM_REPLAY_LATENCY_MS / LLM_REPLAY_JITTER_MS synthetic latency.
+"""
+import asyncio
+import random
+import time
+from typing import List
+from fastapi import FastAPI, HTTPException
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from pydantic import BaseModel
+from app.core.config import LLM_MODEL, LLM_REPLAY_DIR, LLM_REPLAY_LATENCY_MS, LLM_REPLAY_JITTER_MS
+from app.services.llm_providers import ReplayStore, prompt_hash
+
+app = FastAPI(title="LLM replay server")
+store = ReplayStore(LLM_REPLAY_DIR)
+
+MESSAGE_TYPES = {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage}
+
+
+class ChatMessage(BaseModel):
+    role: str
+    content: str
+
+
+class ChatCompletionRequest(BaseModel):
+    model: str = LLM_MODEL
+    messages: List[ChatMessage]
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: ChatCompletionRequest):
+    messages = [MESSAGE_TYPES[m.role](content=m.content) for m in request.messages]
+    key = prompt_hash(messages)
+
+    response = store.load(key)
+    if response is None:
+        raise HTTPException(status_code=404, detail=f"No recorded response for prompt {key[:12]}")
+
+    await asyncio.sleep((LLM_REPLAY_LATENCY_MS + random.Random(key).random() * LLM_REPLAY_JITTER_MS) / 1000.0)
+
+    return {
+        "id": f"replay-{key[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": response},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
@@ -0,0 +1,167 @@
+"""
+Synthetic cheque registers and bank statements for benchmarks.
+
+generate_scenario() builds a company cheque register and a matching bank
+statement with a known ground truth: a share of cheques clears, some
+clear with a different amount and some cheque numbers are duplicated.
+The text layouts mirror real documents closely enough for both the rule
+based bank parser and SyntheticChatModel (a stand-in for the LLM) to
+read them.
+"""
+from dataclasses import dataclass, field
+from typing import Any, List
+import asyncio
+import json
+import random
+import re
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from benchmarks.synthetic_pdf import write_text_pdf
+
+PAYEES = [
+    "ACME SUPPLIES", "NORTHWIND TRADERS", "BLUE RIVER LOGISTICS", "KAPOOR & SONS",
+    "CITY POWER LTD", "GREENLEAF FOODS", "ORBIT TELECOM", "SUNRISE PRINTERS",
+]
+STATEMENT_HEADER = "Date Narration Chq./Ref.No. Value Dt Withdrawal Amt. Deposit Amt. Closing Balance"
+REGISTER_HEADER = "Cheque No | Issue Date | Payee | Amount"
+
+REGISTER_ROW_RE = re.compile(r"^(\d{6}) \| (\S+) \| (.+?) \| ([\d,]+\.\d{2})$", re.MULTILINE)
+STATEMENT_ROW_RE = re.compile(r"^(\S+) CHQ PAID-CLG-.*? (\d{6}) \S+ ([\d,]+\.\d{2}) [\d,]+\.\d{2}$", re.MULTILINE)
+
+
+@dataclass
+class Scenario:
+    """Generated documents plus the counts a correct tally should report."""
+    register_pages: List[List[str]]
+    statement_pages: List[List[str]]
+    cheque_count: int
+    expected_cleared: int
+    expected_mismatched: int
+    expected_duplicates: int
+    meta: dict = field(default_factory=dict)
+
+    def write_pdfs(self, register_path: str, statement_path: str):
+        write_text_pdf(register_path, self.register_pages)
+        write_text_pdf(statement_path, self.statement_pages)
+
+
+def _paginate(rows: List[str], pages: int, header: str) -> List[List[str]]:
+    pages = max(1, pages)
+    per_page = max(1, -(-len(rows) // pages))
+    chunks = [rows[i:i + per_page] for i in range(0, len(rows), per_page)] or [[]]
+    while len(chunks) < pages:
+        chunks.append([])
+    return [[header] + chunk for chunk in chunks]
+
+
+def generate_scenario(
+    cheques: int = 200,
+    pages: int = 10,
+    clear_rate: float = 0.7,
+    mismatch_rate: float = 0.03,
+    duplicate_rate: float = 0.01,
+    noise_rows: int = 2,
+    seed: int = 42
+) -> Scenario:
+    """
+    Build a register/statement pair.
+
+    Args:
+        cheques: Cheques issued in the company register
+        pages: Pages in each document
+        clear_rate: Share of cheques that appear on the statement
+        mismatch_rate: Share of cleared cheques debited with a different amount
+        duplicate_rate: Share of register rows reusing an earlier cheque number
+        noise_rows: Non-cheque statement rows (NEFT/UPI) per cleared cheque
+        seed: Random seed
+    """
+    rng = random.Random(seed)
+
+    numbers = [f"{n:06d}" for n in rng.sample(range(100000, 999999), cheques)]
+    duplicates = 0
+    for index in range(1, cheques):
+        if rng.random() < duplicate_rate:
+            numbers[index] = numbers[rng.randrange(index)]
+            duplicates += 1
+
+    register_rows = []
+    issued = []
+    for index, number in enumerate(numbers):
+        amount = round(rng.uniform(500, 250000), 2)
+        day = 1 + index * 27 // max(1, cheques)
+        issue_date = f"{day:02d}/03/2024"
+        register_rows.append(f"{number} | {issue_date} | {rng.choice(PAYEES)} | {amount:,.2f}")
+        issued.append((number, amount, day))
+
+    balance = 50_000_000.00
+    statement_rows = [f"Opening Balance {balance:,.2f}"]
+    cleared = mismatched = 0
+    for number, amount, day in issued:
+        for _ in range(noise_rows):
+            credit = round(rng.uniform(100, 5000), 2)
+            balance += credit
+            statement_rows.append(
+                f"{day:02d}/04/24 NEFT-CR-{rng.randrange(10**9):09d}-CUSTOMER {day:02d}/04/24 {credit:,.2f} {balance:,.2f}"
+            )
+        if rng.random() >= clear_rate:
+            continue
+        debit = amount
+        if rng.random() < mismatch_rate:
+            debit = round(amount + rng.choice([-1, 1]) * rng.uniform(1, 100), 2)
+            mismatched += 1
+        balance -= debit
+        cleared += 1
+        statement_rows.append(
+            f"{day:02d}/04/24 CHQ PAID-CLG-{rng.choice(PAYEES)} {number} {day:02d}/04/24 {debit:,.2f} {balance:,.2f}"
+        )
+
+    return Scenario(
+        register_pages=_paginate(register_rows, pages, REGISTER_HEADER),
+        statement_pages=_paginate(statement_rows, pages, STATEMENT_HEADER),
+        cheque_count=cheques,
+        expected_cleared=cleared,
+        expected_mismatched=mismatched,
+        expected_duplicates=duplicates,
+        meta={"cheques": cheques, "pages": pages, "seed": seed}
+    )
+
+
+class SyntheticChatModel(BaseChatModel):
+    """
+    Stand-in LLM that reads the synthetic layouts with regexes.
+
+    Answers company-register and bank-statement prompts with the JSON the
+    real model would return, after latency_ms of simulated model time, so
+    the rest of the extraction pipeline runs unchanged.
+    """
+    latency_ms: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "synthetic"
+
+    @staticmethod
+    def _respond(messages: List[BaseMessage]) -> str:
+        prompt = messages[-1].content
+        if "bank statement" in prompt:
+            rows = [
+                {"cheque_number": number, "clearing_date": date, "amount": float(amount.replace(",", ""))}
+                for date, number, amount in STATEMENT_ROW_RE.findall(prompt)
+            ]
+            return json.dumps({"cashed_cheques": rows})
+
+        rows = [
+            {"cheque_number": number, "issue_date": date, "payee_name": payee, "amount": float(amount.replace(",", ""))}
+            for number, date, payee, amount in REGISTER_ROW_RE.findall(prompt)
+        ]
+        return json.dumps({"cheques": rows})
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self._respond(messages)))])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency_ms / 1000.0)
+        return self._generate(messages, stop=stop, **kwargs)
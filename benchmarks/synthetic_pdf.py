@@ -0,0 +1,61 @@
+"""
+Minimal dependency-free PDF writer for benchmark fixtures.
+
+Writes plain text pages in Helvetica, one line per entry, which is all
+pdfplumber needs to exercise the real extraction path.
+"""
+from typing import List
+
+
+def _escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_text_pdf(path: str, pages: List[List[str]], font_size: int = 9):
+    """
+    Write a PDF with one page per entry in `pages`.
+
+    Args:
+        path: Output file path
+        pages: Lines of text for each page
+        font_size: Font size in points
+    """
+    leading = font_size + 2
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    page_ids = []
+
+    for lines in pages:
+        commands = [f"BT /F1 {font_size} Tf {leading} TL 36 806 Td"]
+        commands.extend(f"({_escape(line)}) Tj T*" for line in lines)
+        commands.append("ET")
+        stream = "\n".join(commands).encode("latin-1", "replace")
+
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        page_ids.append(len(objects))
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+
+    xref_offset = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(path, "wb") as f:
+        f.write(out)
@@ -0,0 +1,101 @@
+"""
+Bulk tally script.
+Tally many sessions of one user without going through the API, e.g. for
+a month-end close:
+
+    python bulk_tally.py --user ops@example.com --status complete
+    python bulk_tally.py --user ops@example.com --session <id> --session <id>
+    python bulk_tally.py --resume <bulk_id>
+
+Sessions run smallest first on a local worker pool and share the LLM
+budget. Every finished session is saved as it completes, so an
+interrupted run continues with --resume without redoing finished work.
+"""
+import argparse
+import asyncio
+from app.core.config import TALLY_WORKERS
+from app.services.job_service import (
+    TallyWorkerPool,
+    create_bulk_tally,
+    get_bulk_tally,
+    requeue_bulk_tally
+)
+from app.services.pdf_reader import shutdown_pdf_pool
+from app.services.user_service import get_user_by_email, get_user_by_id
+
+PROGRESS_INTERVAL_SECONDS = 5
+
+
+async def _report_progress(bulk_id: str):
+    while True:
+        await asyncio.sleep(PROGRESS_INTERVAL_SECONDS)
+        bulk = await get_bulk_tally(bulk_id)
+        print(
+            f"  {bulk['progress']:>3}%  completed {bulk['completed']}/{bulk['total']}, "
+            f"running {bulk['running']}, failed {bulk['failed']}"
+        )
+
+
+async def bulk_tally(args):
+    """Queue (or resume) a bulk tally and run it to completion."""
+    if args.resume:
+        bulk_id = args.resume
+        jobs = await requeue_bulk_tally(bulk_id, retry_failed=args.retry_failed)
+        print(f"Resuming bulk tally {bulk_id}: {len(jobs)} sessions left")
+        running = (await get_bulk_tally(bulk_id))["running"]
+        if running:
+            print(f"  {running} sessions are still running on a live worker and were left to it")
+    else:
+        user = await get_user_by_email(args.user) or await get_user_by_id(args.user)
+        if user is None:
+            print(f"❌ User {args.user} not found")
+            return
+
+        bulk = await create_bulk_tally(user["user_id"], session_ids=args.session, statuses=args.status)
+        bulk_id = bulk["bulk_id"]
+        jobs = bulk["jobs"]
+        print(f"Queued bulk tally {bulk_id}: {len(jobs)} sessions")
+        for skipped in bulk["skipped"]:
+            print(f"  skipped {skipped['session_id']}: {skipped['error']}")
+
+    if not jobs:
+        return
+
+    pool = TallyWorkerPool(args.workers)
+    await pool.start(requeue=False)
+    reporter = asyncio.create_task(_report_progress(bulk_id))
+
+    try:
+        for job in jobs:
+            await pool.submit(job["job_id"], job["priority"])
+        await pool.join()
+    finally:
+        reporter.cancel()
+        await pool.stop()
+        shutdown_pdf_pool()
+
+    bulk = await get_bulk_tally(bulk_id)
+    print(f"\n✅ Bulk tally {bulk_id}: {bulk['completed']} completed, {bulk['failed']} failed")
+    for job in bulk["jobs"]:
+        if job["status"] == "failed":
+            print(f"  ✗ {job['session_id']}: {job['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--user", help="Email or user ID owning the sessions")
+    parser.add_argument("--session", action="append", help="Session ID to tally (repeatable)")
+    parser.add_argument("--status", action="append", help="Tally every session in this status (repeatable)")
+    parser.add_argument("--resume", metavar="BULK_ID", help="Continue an interrupted bulk tally")
+    parser.add_argument("--retry-failed", action="store_true", help="With --resume, also retry failed sessions")
+    parser.add_argument("--workers", type=int, default=TALLY_WORKERS, help="Sessions tallied at once")
+    args = parser.parse_args()
+
+    if not args.resume and not (args.user and (args.session or args.status)):
+        parser.error("--user with --session or --status is required unless resuming")
+
+    asyncio.run(bulk_tally(args))
+
+
+if __name__ == "__main__":
+    main()
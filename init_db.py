@@ -4,7 +4,7 @@ Run this once to create indexes for optimal performance.
 """
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
-from app.core.config import MONGO_URL, DATABASE_NAME
+from app.core.config import MONGO_URL, DATABASE_NAME, EXTRACTION_CACHE_TTL_SECONDS
 
 
 async def create_indexes():
@@ -23,7 +23,8 @@ async def create_indexes():
     # Sessions collection indexes
     await db.sessions.create_index("session_id", unique=True)
     await db.sessions.create_index("user_id")
-    await db.sessions.create_index([("user_id", 1), ("created_at", -1)])
+    await db.sessions.create_index([("user_id", 1), ("created_at", -1), ("session_id", -1)])
+    await db.sessions.create_index([("user_id", 1), ("status", 1), ("created_at", -1), ("session_id", -1)])
     print("✓ Created sessions indexes")
     
     # Documents collection indexes
@@ -32,6 +33,51 @@ async def create_indexes():
     await db.documents.create_index("user_id")
     print("✓ Created documents indexes")
     
+    # Document pages collection indexes
+    await db.document_pages.create_index([("document_id", 1), ("page_number", 1)], unique=True)
+    await db.document_pages.create_index("session_id")
+    print("✓ Created document pages indexes")
+    
+    # Extraction cache indexes (TTL on last access gives LRU-style expiry)
+    await db.extraction_cache.create_index("cache_key", unique=True)
+    await db.extraction_cache.create_index(
+        "last_accessed_at",
+        expireAfterSeconds=EXTRACTION_CACHE_TTL_SECONDS
+    )
+    print("✓ Created extraction cache indexes")
+    
+    # Tally jobs collection indexes
+    await db.tally_jobs.create_index("job_id", unique=True)
+    await db.tally_jobs.create_index([("status", 1), ("created_at", 1)])
+    await db.tally_jobs.create_index([("status", 1), ("updated_at", 1)])  # stale-job sweep
+    await db.tally_jobs.create_index("user_id")
+    await db.tally_jobs.create_index("bulk_id", sparse=True)
+    print("✓ Created tally jobs indexes")
+    
+    # Outstanding-cheque ledger indexes (one entry per issuing session,
+    # cheque number and amount); the earlier key without the session merged
+    # distinct cheques, so it is dropped
+    if "user_id_1_cheque_key_1_amount_1" in await db.outstanding_cheques.index_information():
+        await db.outstanding_cheques.drop_index("user_id_1_cheque_key_1_amount_1")
+    await db.outstanding_cheques.create_index(
+        [("user_id", 1), ("cheque_key", 1), ("amount", 1), ("session_id", 1)],
+        unique=True
+    )
+    await db.outstanding_cheques.create_index([("user_id", 1), ("status", 1), ("created_at", -1)])
+    await db.outstanding_cheques.create_index([("user_id", 1), ("session_id", 1)])
+    await db.outstanding_cheques.create_index([("user_id", 1), ("cleared_session_id", 1)], sparse=True)
+    print("✓ Created outstanding cheques indexes")
+    
+    # Tally results collection indexes (one row per cheque outcome)
+    await db.tally_results.create_index("row_id", unique=True)
+    await db.tally_results.create_index([("session_id", 1), ("status", 1)])
+    await db.tally_results.create_index([("user_id", 1), ("status", 1), ("amount", -1), ("row_id", -1)])
+    await db.tally_results.create_index([("user_id", 1), ("amount", -1), ("row_id", -1)])
+    await db.tally_results.create_index([("user_id", 1), ("status", 1), ("issued_on", 1)])
+    await db.tally_results.create_index([("user_id", 1), ("status", 1), ("cleared_on", 1)])
+    await db.tally_results.create_index([("user_id", 1), ("cheque_key", 1)])
+    print("✓ Created tally results indexes")
+    
     print("\n✅ All indexes created successfully!")
     
     client.close()
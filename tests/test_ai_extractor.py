@@ -0,0 +1,30 @@
+import asyncio
+from app.schemas.cheque_schema import CompanyCheque, CompanyChequeList
+from app.services import ai_extractor
+
+
+def test_cheque_repeated_across_chunks_is_kept(monkeypatch):
+    # Page 1 and page 2 land in different chunks, each with cheque 500
+    rows = {
+        "1": CompanyCheque(cheque_number="500", amount=100.0, issue_date="01/03/2024"),
+        "2": CompanyCheque(cheque_number="500", amount=900.0, issue_date="20/03/2024")
+    }
+
+    async def extract_chunk(chunk):
+        page = chunk.split("--- Page ")[1].split(" ---")[0]
+        return CompanyChequeList(cheques=[rows[page]])
+
+    async def no_cache(*args):
+        return None
+
+    monkeypatch.setattr(ai_extractor, "PREFILTER_ENABLED", False)
+    chunk_raw_text = ai_extractor.chunk_raw_text
+    monkeypatch.setattr(ai_extractor, "chunk_raw_text", lambda raw_text: chunk_raw_text(raw_text, 1))
+    monkeypatch.setattr(ai_extractor, "_aextract_company_chunk", extract_chunk)
+    monkeypatch.setattr(ai_extractor, "get_cached_extraction", no_cache)
+    monkeypatch.setattr(ai_extractor, "store_cached_extraction", no_cache)
+
+    text = "--- Page 1 ---\n500 100.00\n--- Page 2 ---\n500 900.00"
+    result = asyncio.run(ai_extractor.aextract_company_cheques(text))
+
+    assert [cheque.amount for cheque in result.cheques] == [100.0, 900.0]
@@ -0,0 +1,37 @@
+from app.services.bank_statement_parser import parse_bank_statement
+
+HEADER = "Date Narration Chq./Ref.No. Value Dt Withdrawal Amt. Deposit Amt. Closing Balance"
+
+
+def _statement(*rows):
+    return "\n".join(["--- Page 1 ---", HEADER, "Opening Balance 5,00,000.00", *rows])
+
+
+def test_cheque_rows_are_parsed():
+    result = parse_bank_statement(_statement(
+        "02/04/24 CHQ PAID-CLG-SHARMA TRADERS 100231 02/04/24 15,000.00 4,85,000.00",
+        "03/04/24 CHQ PAID-CLG-GUPTA AND SONS 100232 03/04/24 2,450.00 4,82,550.00",
+    ))
+
+    assert result.unparsed_pages == []
+    assert [cheque.cheque_number for cheque in result.cheques] == ["100231", "100232"]
+
+
+def test_numbered_debits_without_cheque_marker_are_not_cheques():
+    result = parse_bank_statement(_statement(
+        "02/04/24 CHQ PAID-CLG-SHARMA TRADERS 100231 02/04/24 15,000.00 4,85,000.00",
+        "04/04/24 LOAN EMI A/C 55443322 04/04/24 20,000.00 4,65,000.00",
+        "05/04/24 ELECTRICITY BILL 98765 05/04/24 3,000.00 4,62,000.00",
+    ))
+
+    assert result.cheques == []
+    assert [page_number for page_number, _ in result.unparsed_pages] == [1]
+
+
+def test_electronic_transfers_do_not_block_the_page():
+    result = parse_bank_statement(_statement(
+        "02/04/24 CHQ PAID-CLG-SHARMA TRADERS 100231 02/04/24 15,000.00 4,85,000.00",
+        "04/04/24 NEFT-HDFC-RENT 88112233 04/04/24 20,000.00 4,65,000.00",
+    ))
+
+    assert [cheque.cheque_number for cheque in result.cheques] == ["100231"]
@@ -0,0 +1,78 @@
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+from app.models.job import TallyJobModel
+from app.services import job_service
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    collection = mongomock_motor.AsyncMongoMockClient()["test"]["tally_jobs"]
+    monkeypatch.setattr(job_service, "jobs_collection", collection)
+    return collection
+
+
+def test_stopping_the_pool_returns_running_jobs_to_the_queue(jobs, monkeypatch):
+    started = asyncio.Event()
+
+    async def run_tally(session_id, user_id, progress):
+        started.set()
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(job_service, "run_tally", run_tally)
+
+    async def scenario():
+        job = TallyJobModel(user_id="u1", session_id="s1")
+        await jobs.insert_one(job.model_dump())
+
+        pool = job_service.TallyWorkerPool(1)
+        await pool.start(requeue=False)
+        await pool.submit(job.job_id)
+        await started.wait()
+        await pool.stop()
+
+        return await jobs.find_one({"job_id": job.job_id})
+
+    job = asyncio.run(scenario())
+
+    assert job["status"] == "queued"
+    assert job["started_at"] is None
+
+
+def test_sweep_requeues_only_jobs_that_stopped_heartbeating(jobs):
+    stale = TallyJobModel(
+        user_id="u1", session_id="s1", status="running",
+        updated_at=datetime.utcnow() - timedelta(seconds=job_service.TALLY_JOB_STALE_SECONDS + 60)
+    )
+    alive = TallyJobModel(user_id="u1", session_id="s2", status="running")
+
+    async def scenario():
+        await jobs.insert_many([stale.model_dump(), alive.model_dump()])
+        requeued = await job_service.requeue_stale_jobs()
+        statuses = {job["job_id"]: job["status"] async for job in jobs.find()}
+        return requeued, statuses
+
+    requeued, statuses = asyncio.run(scenario())
+
+    assert [job["job_id"] for job in requeued] == [stale.job_id]
+    assert statuses == {stale.job_id: "queued", alive.job_id: "running"}
+
+
+def test_resuming_a_bulk_tally_leaves_live_running_jobs_alone(jobs):
+    stale_at = datetime.utcnow() - timedelta(seconds=job_service.TALLY_JOB_STALE_SECONDS + 60)
+    live = TallyJobModel(user_id="u1", session_id="s1", bulk_id="b1", status="running")
+    stale = TallyJobModel(user_id="u1", session_id="s2", bulk_id="b1", status="running", updated_at=stale_at)
+    queued = TallyJobModel(user_id="u1", session_id="s3", bulk_id="b1")
+
+    async def scenario():
+        await jobs.insert_many([live.model_dump(), stale.model_dump(), queued.model_dump()])
+        requeued = await job_service.requeue_bulk_tally("b1")
+        live_job = await jobs.find_one({"job_id": live.job_id})
+        return requeued, live_job
+
+    requeued, live_job = asyncio.run(scenario())
+
+    assert {job["job_id"] for job in requeued} == {stale.job_id, queued.job_id}
+    assert live_job["status"] == "running"
@@ -0,0 +1,96 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.services import ledger_service
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def ledger(monkeypatch):
+    collection = mongomock_motor.AsyncMongoMockClient()["test"]["outstanding_cheques"]
+    monkeypatch.setattr(ledger_service, "outstanding_cheques_collection", collection)
+    return collection
+
+
+@pytest.fixture
+def ledger_writes(ledger, monkeypatch):
+    """Record bulk_write operations instead of applying them (mongomock cannot run them)."""
+    writes = []
+
+    async def bulk_write(operations, ordered=True):
+        writes.extend(operations)
+        return SimpleNamespace(modified_count=len(operations), upserted_count=0)
+
+    monkeypatch.setattr(ledger, "bulk_write", bulk_write)
+    return writes
+
+
+def test_forget_session_deletes_its_entries_and_reopens_what_it_cleared(ledger):
+    async def scenario():
+        await ledger.insert_many([
+            # Same cheque number and amount issued in two sessions
+            {"user_id": "u1", "session_id": "mar", "cheque_key": "500", "amount": 100.0,
+             "status": "cleared", "cleared_session_id": "apr", "cleared_amount": 100.0},
+            {"user_id": "u1", "session_id": "apr", "cheque_key": "500", "amount": 100.0,
+             "status": "outstanding"}
+        ])
+        await ledger_service.forget_session("u1", "apr")
+        return await ledger.find({}, {"_id": 0}).to_list(length=None)
+
+    entries = asyncio.run(scenario())
+
+    assert len(entries) == 1
+    assert entries[0]["session_id"] == "mar"
+    assert entries[0]["status"] == "outstanding"
+    assert "cleared_session_id" not in entries[0]
+
+
+def test_only_the_bank_row_that_cleared_an_entry_leaves_unmatched_bank(ledger, ledger_writes):
+    tally_result = {
+        "pending": [],
+        "cashed": [],
+        "unmatched_bank": [
+            {"cheque_number": "500", "amount": 100.0, "clearing_date": "05/04/2024"},
+            {"cheque_number": "500", "amount": 900.0, "clearing_date": "06/04/2024"}
+        ]
+    }
+
+    async def scenario():
+        await ledger.insert_one({
+            "user_id": "u1", "session_id": "mar", "cheque_key": "500", "amount": 900.0,
+            "cheque_number": "500", "issue_date": "20/03/2024", "status": "outstanding"
+        })
+        return await ledger_service.reconcile_with_ledger("u1", "apr", tally_result)
+
+    result = asyncio.run(scenario())
+
+    assert [row["amount"] for row in result["unmatched_bank"]] == [100.0]
+    assert [row["amount"] for row in result["cleared_from_ledger"]] == [900.0]
+
+
+def test_incremental_tally_does_not_clear_a_carried_entry_twice(ledger, ledger_writes):
+    carried = {
+        "cheque_number": "500", "amount": 900.0, "issue_date": "20/03/2024",
+        "clearing_date": "06/04/2024", "bank_amount": 900.0, "issued_session_id": "mar"
+    }
+    tally_result = {
+        "pending": [],
+        "cashed": [],
+        "cleared_from_ledger": [carried],
+        # A later statement of the same session repeats the cheque
+        "unmatched_bank": [{"cheque_number": "500", "amount": 900.0, "clearing_date": "02/05/2024"}]
+    }
+
+    async def scenario():
+        await ledger.insert_one({
+            "user_id": "u1", "session_id": "mar", "cheque_key": "500", "amount": 900.0,
+            "cheque_number": "500", "issue_date": "20/03/2024",
+            "status": "cleared", "cleared_session_id": "apr"
+        })
+        return await ledger_service.reconcile_with_ledger("u1", "apr", tally_result)
+
+    result = asyncio.run(scenario())
+
+    assert result["cleared_from_ledger"] == [carried]
+    assert [row["clearing_date"] for row in result["unmatched_bank"]] == ["02/05/2024"]
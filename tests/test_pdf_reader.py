@@ -0,0 +1,16 @@
+from app.services.pdf_reader import has_cheque_like_content
+
+
+def test_register_continuation_page_with_integer_amounts():
+    page = "\n".join([
+        "100231 01/03/2024 Sharma Traders 15,000",
+        "100232 02/03/2024 Gupta & Sons 8200",
+    ])
+
+    assert has_cheque_like_content(page)
+    assert has_cheque_like_content("100232 02/03/2024 Gupta & Sons 8200")
+
+
+def test_pages_without_cheque_rows_are_skipped():
+    assert not has_cheque_like_content("Statement period 01/03/2024 to 31/03/2024\nPage 1 of 3")
+    assert not has_cheque_like_content("Terms and conditions apply.")
@@ -0,0 +1,97 @@
+import asyncio
+import pytest
+from app.core.exceptions import SessionValidationError
+from app.models.session import SessionModel
+from app.services import session_service
+
+mongomock_motor = pytest.importorskip("mongomock_motor")
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    collection = mongomock_motor.AsyncMongoMockClient()["test"]["sessions"]
+    monkeypatch.setattr(session_service, "sessions_collection", collection)
+    return collection
+
+
+def _create_session(sessions) -> str:
+    session = SessionModel(user_id="u1", session_name="March")
+    asyncio.run(sessions.insert_one(session.model_dump()))
+    return session.session_id
+
+
+def test_concurrent_attaches_never_exceed_the_limit(sessions, monkeypatch):
+    monkeypatch.setattr(session_service, "SESSION_MAX_DOCUMENTS_PER_TYPE", 1)
+    session_id = _create_session(sessions)
+
+    async def scenario():
+        return await asyncio.gather(
+            *(
+                session_service.attach_document(session_id, "u1", f"doc-{i}", "bank")
+                for i in range(8)
+            ),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    attached = [result for result in results if isinstance(result, dict)]
+    rejected = [result for result in results if isinstance(result, SessionValidationError)]
+    assert len(attached) == 1
+    assert len(rejected) == 7
+
+    session = asyncio.run(sessions.find_one({"session_id": session_id}))
+    assert session["bank_document_ids"] == attached[0]["bank_document_ids"]
+    assert len(session["bank_document_ids"]) == 1
+    assert session["status"] == "bank_uploaded"
+
+
+def test_failed_insert_detaches_the_document(sessions, monkeypatch):
+    session_id = _create_session(sessions)
+
+    async def failing_insert(prepared):
+        raise RuntimeError("insert failed")
+
+    monkeypatch.setattr(session_service, "insert_documents", failing_insert)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(session_service.add_session_document(session_id, "u1", "company", "--- Page 1 ---\ntext"))
+
+    session = asyncio.run(sessions.find_one({"session_id": session_id}))
+    assert session["company_document_ids"] == []
+    assert session["company_document_id"] is None
+    assert session["status"] == "created"
+
+
+def test_batch_attaches_in_one_update_and_skips_what_does_not_fit(sessions, monkeypatch):
+    monkeypatch.setattr(session_service, "SESSION_MAX_DOCUMENTS_PER_TYPE", 2)
+    session_id = _create_session(sessions)
+    asyncio.run(session_service.attach_document(session_id, "u1", "bank-0", "bank"))
+
+    updates = []
+    find_one_and_update = sessions.find_one_and_update
+
+    async def counting_update(*args, **kwargs):
+        updates.append(args)
+        return await find_one_and_update(*args, **kwargs)
+
+    async def inserted(prepared):
+        inserted.documents = [item.document["document_id"] for item in prepared]
+
+    monkeypatch.setattr(sessions, "find_one_and_update", counting_update)
+    monkeypatch.setattr(session_service, "insert_documents", inserted)
+
+    prepared = [
+        session_service.prepare_document("u1", session_id, document_type, "--- Page 1 ---\ntext")
+        for document_type in ("bank", "company", "bank")
+    ]
+    session, errors = asyncio.run(session_service.add_session_documents(session_id, "u1", prepared))
+
+    ids = [item.document["document_id"] for item in prepared]
+    assert len(updates) == 1
+    assert session["bank_document_ids"] == ["bank-0", ids[0]]
+    assert session["company_document_ids"] == [ids[1]]
+    assert session["status"] == "complete"
+    assert [error is None for error in errors] == [True, True, False]
+    assert isinstance(errors[2], SessionValidationError)
+    assert inserted.documents == ids[:2]
@@ -0,0 +1,76 @@
+import numpy as np
+from app.schemas.cheque_schema import BankCheque, BankChequeList, CompanyCheque, CompanyChequeList
+from app.services.tally_engine import ChequeColumns, find_candidates, tally_cheques
+
+
+def _tally(company_rows, bank_rows):
+    company = CompanyChequeList(cheques=[
+        CompanyCheque(cheque_number=number, amount=amount, issue_date="01/03/2024")
+        for number, amount in company_rows
+    ])
+    bank = BankChequeList(cashed_cheques=[
+        BankCheque(cheque_number=number, amount=amount, clearing_date="05/03/2024")
+        for number, amount in bank_rows
+    ])
+    return tally_cheques(company, bank)
+
+
+def test_repeated_number_pairs_the_equal_amount_first():
+    result = _tally([("7", 100.0), ("7", 300.0)], [("7", 300.0)])
+
+    assert [row["amount"] for row in result["cashed"]] == [300.0]
+    assert [row["amount"] for row in result["pending"]] == [100.0]
+    assert result["mismatched_amount"] == []
+
+
+def test_exact_bank_row_wins_over_a_different_amount():
+    result = _tally([("2", 60.0)], [("2", 50.0), ("2", 60.0)])
+
+    assert [row["amount"] for row in result["cashed"]] == [60.0]
+    assert result["mismatched_amount"] == []
+    assert [row["amount"] for row in result["unmatched_bank"]] == [50.0]
+
+
+def test_leftovers_of_a_number_are_still_paired_as_mismatches():
+    result = _tally([("9", 100.0), ("9", 500.0)], [("9", 500.0), ("9", 120.0)])
+
+    assert [row["amount"] for row in result["cashed"]] == [500.0]
+    assert result["mismatched_amount"] == [
+        {"cheque_number": "9", "issued_amount": 100.0, "bank_amount": 120.0}
+    ]
+
+
+def test_exact_match_outside_date_window_is_reported():
+    company = CompanyChequeList(cheques=[
+        CompanyCheque(cheque_number="9", amount=250.0, issue_date="01/01/2023")
+    ])
+    bank = BankChequeList(cashed_cheques=[
+        BankCheque(cheque_number="9", amount=250.0, clearing_date="01/03/2024")
+    ])
+    result = tally_cheques(company, bank, date_window_days=180)
+
+    assert [row["amount"] for row in result["pending"]] == [250.0]
+    assert result["summary"]["total_outside_window"] == 1
+    [entry] = result["candidates"]
+    assert entry["candidates"][0]["cheque_number"] == "9"
+    assert entry["candidates"][0]["outside_date_window"] is True
+
+
+def test_candidate_scan_is_capped_for_repeated_amounts():
+    company = ChequeColumns(
+        cheque_numbers=np.array(["A1", "A2"]),
+        amounts=np.array([5000.0, 5000.0]),
+        days=np.array([100.0, 100.0])
+    )
+    bank = ChequeColumns(
+        cheque_numbers=np.array([f"B{i}" for i in range(500)]),
+        amounts=np.full(500, 5000.0),
+        days=np.arange(500, dtype=np.float64) + 101.0
+    )
+    candidates = find_candidates(
+        company, bank, np.arange(2), np.arange(500),
+        date_window_days=1000, max_candidates=10, scan_limit=5
+    )
+
+    # Only the five rows clearing soonest after issue are scored
+    assert sorted(row for row, _ in candidates[0]) == [0, 1, 2, 3, 4]
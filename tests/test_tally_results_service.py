@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from app.schemas.cheque_schema import BankCheque, BankChequeList, CompanyCheque, CompanyChequeList
+from app.services import tally_results_service
+from app.services.tally_engine import tally_cheques
+from app.services.tally_results_service import build_result_rows
+
+
+def test_cashed_row_keeps_the_amount_the_bank_paid():
+    company = CompanyChequeList(cheques=[
+        CompanyCheque(cheque_number="12", amount=100.0, issue_date="01/03/2024")
+    ])
+    bank = BankChequeList(cashed_cheques=[
+        BankCheque(cheque_number="12", amount=100.01, clearing_date="05/03/2024")
+    ])
+    result = tally_cheques(company, bank, amount_tolerance=0.05)
+
+    [row] = build_result_rows("u1", "s1", result)
+
+    assert row["status"] == "cashed"
+    assert row["amount"] == 100.0
+    assert row["bank_amount"] == 100.01
+
+
+def test_tally_lists_read_back_from_rows_match_the_tally(monkeypatch):
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    collection = mongomock_motor.AsyncMongoMockClient()["test"]["tally_results"]
+    monkeypatch.setattr(tally_results_service, "tally_results_collection", collection)
+
+    company = CompanyChequeList(cheques=[
+        CompanyCheque(cheque_number="1", payee_name="A", amount=100.0, issue_date="01/03/2024"),
+        CompanyCheque(cheque_number="2", payee_name="B", amount=200.0, issue_date="02/03/2024"),
+        CompanyCheque(cheque_number="3", payee_name="C", amount=300.0, issue_date="03/03/2024")
+    ])
+    bank = BankChequeList(cashed_cheques=[
+        BankCheque(cheque_number="1", amount=100.0, clearing_date="05/03/2024"),
+        BankCheque(cheque_number="2", amount=250.0, clearing_date="06/03/2024"),
+        BankCheque(cheque_number="9", amount=50.0, clearing_date="07/03/2024")
+    ])
+    result = tally_cheques(company, bank)
+
+    async def scenario():
+        await collection.insert_many(build_result_rows("u1", "s1", result))
+        return await tally_results_service.read_tally_result("u1", "s1")
+
+    stored = asyncio.run(scenario())
+
+    for field in ("cashed", "pending", "mismatched_amount", "unmatched_bank"):
+        assert stored[field] == result[field]
+    assert stored["cleared_from_ledger"] == []
@@ -0,0 +1,45 @@
+from app.services.text_prefilter import is_row_like, prefilter_text, score_line
+
+REGISTER = "\n".join([
+    "--- Page 1 ---",
+    "Cheque Register - March 2024",
+    "100231  01/03/2024  Sharma Traders  15,000",
+    "100232  02/03/2024  Gupta & Sons  2,450.00",
+    "100233  03/03/2024  Mehta Enterprises  Rs 7500/-",
+    "100234  04/03/2024  Kapoor Stores  8200",
+    "Prepared by accounts",
+])
+
+
+def test_integer_amounts_count_as_amounts():
+    assert score_line("100231  01/03/2024  Sharma Traders  15,000") >= 3
+    assert score_line("100233  03/03/2024  Mehta Enterprises  Rs 7500/-") >= 3
+
+
+def test_register_with_integer_amounts_keeps_every_row():
+    for tabular in (False, True):
+        result = prefilter_text(REGISTER, min_score=3, context_lines=0, tabular=tabular)
+
+        for cheque_number in ("100231", "100232", "100233", "100234"):
+            assert cheque_number in result.text
+        assert "Prepared by accounts" not in result.text
+
+
+def test_date_and_number_lines_are_never_dropped():
+    line = "100234  04/03/2024  Kapoor Stores  8200"
+
+    assert is_row_like(line)
+    assert "100234" in prefilter_text(f"--- Page 1 ---\n{line}", min_score=10).text
+
+
+def test_electronic_transfers_are_still_dropped():
+    text = "\n".join([
+        "--- Page 1 ---",
+        "05/04/24 NEFT-HDFC-RENT 88112233 05/04/24 45,000.00 1,20,000.00",
+        "06/04/24 CHQ PAID-CLG-SHARMA 100231 06/04/24 15,000.00 1,05,000.00",
+    ])
+
+    result = prefilter_text(text, min_score=3, context_lines=0, tabular=False)
+
+    assert "100231" in result.text
+    assert "NEFT" not in result.text